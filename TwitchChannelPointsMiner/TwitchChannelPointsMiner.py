@@ -11,7 +11,9 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
-from TwitchChannelPointsMiner.classes.Chat import ChatPresence, ThreadChat
+from TwitchChannelPointsMiner.classes.BackgroundCache import BackgroundRefreshCache
+from TwitchChannelPointsMiner.classes.Cassette import Cassette, CassetteMode
+from TwitchChannelPointsMiner.classes.Chat import ThreadChat
 from TwitchChannelPointsMiner.classes.entities.PubsubTopic import PubsubTopic
 from TwitchChannelPointsMiner.classes.entities.Streamer import (
     Streamer,
@@ -19,13 +21,22 @@ from TwitchChannelPointsMiner.classes.entities.Streamer import (
 )
 from TwitchChannelPointsMiner.classes.Exceptions import StreamerDoesNotExistException
 from TwitchChannelPointsMiner.classes.Settings import FollowersOrder, Priority, Settings
+from TwitchChannelPointsMiner.classes.StartupPipeline import (
+    PipelineStage,
+    StartupPipeline,
+)
+from TwitchChannelPointsMiner.classes.StateSnapshot import StateSnapshot
+from TwitchChannelPointsMiner.classes.Transport import Transport
 from TwitchChannelPointsMiner.classes.Twitch import Twitch
 from TwitchChannelPointsMiner.classes.WebSocketsPool import WebSocketsPool
+from TwitchChannelPointsMiner.constants import URL
 from TwitchChannelPointsMiner.logger import LoggerSettings, configure_loggers
 from TwitchChannelPointsMiner.utils import (
     _millify,
     at_least_one_value_in_settings_is,
-    check_versions,
+    create_chunks,
+    fetch_github_version,
+    get_current_version,
     get_user_agent,
     internet_connection_available,
     set_default_settings,
@@ -70,6 +81,13 @@ class TwitchChannelPointsMiner:
         "original_streamers",
         "logs_file",
         "queue_listener",
+        "use_asyncio",
+        "telemetry_file",
+        "cassette",
+        "startup_pipeline",
+        "first_minute_reported",
+        "state_snapshot",
+        "version_cache",
     ]
 
     def __init__(
@@ -80,6 +98,11 @@ class TwitchChannelPointsMiner:
         enable_analytics: bool = False,
         disable_ssl_cert_verification: bool = False,
         disable_at_in_nickname: bool = False,
+        # Run the network loops as coroutines on a single asyncio event loop (AsyncTwitch)
+        use_asyncio: bool = False,
+        # Record every HTTP / PubSub exchange to this file, or replay it without network
+        cassette: str = None,
+        cassette_mode: CassetteMode = CassetteMode.RECORD,
         # Settings for logging and selenium as you can see.
         priority: list = [Priority.STREAK, Priority.DROPS, Priority.ORDER],
         # This settings will be global shared trought Settings class
@@ -97,25 +120,16 @@ class TwitchChannelPointsMiner:
         Settings.disable_ssl_cert_verification = disable_ssl_cert_verification
 
         Settings.disable_at_in_nickname = disable_at_in_nickname
+        # Connexion IRC partagée par tous les chats, créée après le login
+        Settings.irc_chat = None
 
-        import socket
-
-        def is_connected():
-            try:
-                # resolve the IP address of the Twitch.tv domain name
-                socket.gethostbyname("twitch.tv")
-                return True
-            except OSError:
-                pass
-            return False
+        self.cassette = (
+            Cassette(cassette, mode=cassette_mode) if cassette is not None else None
+        )
+        replaying = self.cassette is not None and self.cassette.is_replaying
 
-        # check for Twitch.tv connectivity every 5 seconds
-        error_printed = False
-        while not is_connected():
-            if not error_printed:
-                logger.error("Waiting for Twitch.tv connectivity...")
-                error_printed = True
-            time.sleep(5)
+        # La connectivité Twitch.tv n'est plus testée ici : le Transport attend
+        # le réseau lors de la première vraie requête
 
         # Analytics switch
         Settings.enable_analytics = enable_analytics
@@ -127,6 +141,9 @@ class TwitchChannelPointsMiner:
             Path(Settings.analytics_path).mkdir(parents=True, exist_ok=True)
 
         self.username = username
+        self.telemetry_file = os.path.join(
+            Path().absolute(), "logs", f"{username}.telemetry.json"
+        )
 
         # Set as global config
         Settings.logger = logger_settings
@@ -138,9 +155,18 @@ class TwitchChannelPointsMiner:
 
         # user_agent = get_user_agent("FIREFOX")
         user_agent = get_user_agent("CHROME")
-        self.twitch = Twitch(self.username, user_agent, password)
+        self.twitch = Twitch(
+            self.username, user_agent, password, transport=Transport(cassette=self.cassette)
+        )
+        # Checkpoint des streamers : redémarrage à chaud après un redéploiement
+        self.state_snapshot = StateSnapshot(
+            os.path.join(
+                os.path.dirname(self.twitch.cookies_file), f".{username}_state.json"
+            )
+        )
 
         self.claim_drops_startup = claim_drops_startup
+        self.use_asyncio = use_asyncio
         self.priority = priority if isinstance(priority, list) else [priority]
 
         self.streamers: list[Streamer] = []
@@ -149,25 +175,53 @@ class TwitchChannelPointsMiner:
         self.sync_campaigns_thread = None
         self.stream_monitor_thread = None
         self.ws_pool = None
+        self.startup_pipeline = None
+        self.first_minute_reported = False
 
         self.session_id = str(uuid.uuid4())
         self.running = False
         self.start_datetime = None
-        self.original_streamers = []
+        # {username: solde de départ} pour le rapport de fin de session
+        self.original_streamers = {}
 
         self.logs_file, self.queue_listener = configure_loggers(
             self.username, logger_settings
         )
 
-        # Check for the latest version of the script
-        current_version, github_version = check_versions()
-
+        current_version = get_current_version()
         logger.info(
             f"Twitch Channel Points Miner v2-{current_version} (fork by rdavydov)"
         )
         logger.info("https://github.com/rdavydov/Twitch-Channel-Points-Miner-v2")
 
-        if github_version == "0.0.0":
+        # Check for the latest version of the script, in background: a slow
+        # GitHub can't stall the construction (cached on disk for 24h)
+        self.version_cache = BackgroundRefreshCache(
+            "GitHub version",
+            fetch_github_version,
+            ttl=24 * 3600,
+            cache_file=os.path.join(
+                os.path.dirname(self.twitch.cookies_file), ".github_version.json"
+            ),
+        )
+        if not replaying:
+            threading.Thread(
+                target=self.__check_versions,
+                args=(current_version,),
+                name="Version check",
+                daemon=True,
+            ).start()
+
+        for sign in [signal.SIGINT, signal.SIGSEGV, signal.SIGTERM]:
+            signal.signal(sign, self.end)
+
+    def __check_versions(self, current_version):
+        github_version = (
+            self.version_cache.value
+            if self.version_cache.is_fresh()
+            else self.version_cache.refresh()
+        )
+        if github_version is None:
             logger.error(
                 "Unable to detect if you have the latest version of this script"
             )
@@ -175,9 +229,6 @@ class TwitchChannelPointsMiner:
             logger.info(f"You are running version {current_version} of this script")
             logger.info(f"The latest version on GitHub is {github_version}")
 
-        for sign in [signal.SIGINT, signal.SIGSEGV, signal.SIGTERM]:
-            signal.signal(sign, self.end)
-
     def analytics(
         self,
         host: str = "127.0.0.1",
@@ -196,6 +247,7 @@ class TwitchChannelPointsMiner:
                 refresh=refresh,
                 days_ago=days_ago,
                 username=self.username,
+                telemetry=self.twitch.transport.telemetry,
             )
             http_server.daemon = True
             http_server.name = "Analytics Thread"
@@ -228,7 +280,17 @@ class TwitchChannelPointsMiner:
             self.running = True
             self.start_datetime = datetime.now()
 
+            # Le login passe par la session de TwitchLogin, pas par le transport :
+            # on attend d'abord le réseau (démarrage sans connexion)
+            self.twitch.transport.wait_until_connected(URL)
             self.twitch.login()
+            # Une seule connexion IRC, ouverte au premier chat rejoint (Streamer.toggle_chat)
+            Settings.irc_chat = ThreadChat(
+                self.username, self.twitch.twitch_login.get_auth_token()
+            )
+            # Rafraîchit le Client-Version GQL et le spade_url en tâche de fond (hors du chemin des requêtes)
+            self.twitch.client_version_cache.start()
+            self.twitch.spade_url_cache.start()
 
             if self.claim_drops_startup is True:
                 self.twitch.claim_all_drops_from_inventory()
@@ -265,127 +327,137 @@ class TwitchChannelPointsMiner:
                 f"Loading data for {len(streamers_name)} streamers. Please wait...",
                 extra={"emoji": ":nerd_face:"},
             )
-            
-            # 🚀 OPTIMISATION : Charger tous les channel IDs en batch via API Helix
-            logger.info("⚡ Chargement des channel IDs en batch via API Helix...")
-            start_time = time.time()
-            channel_ids_map = self.twitch._get_channel_ids_batch(streamers_name)
-            batch_time = time.time() - start_time
-            logger.info(f"✅ {len(channel_ids_map)} channel IDs chargés en {batch_time:.1f}s (batch)")
-            
-            loaded_count = 0
-            failed_count = 0
-            start_time = time.time()
+
+            # Les objets Streamer sont créés d'emblée (sans réseau) : chacun ne
+            # rejoint self.streamers qu'une fois toutes ses étapes de démarrage passées
+            candidates = []
             for username in streamers_name:
-                if username in streamers_name:
-                    try:
-                        streamer = (
-                            streamers_dict[username]
-                            if isinstance(streamers_dict[username], Streamer) is True
-                            else Streamer(username)
-                        )
-                        
-                        # Utiliser le channel ID récupéré en batch
-                        if username in channel_ids_map:
-                            streamer.channel_id = channel_ids_map[username]
-                        else:
-                            # Fallback sur méthode individuelle si pas trouvé en batch
-                            logger.debug(f"⚠️ {username} non trouvé en batch, fallback individuel...")
-                            streamer.channel_id = self.twitch.get_channel_id(username)
-                        
-                        streamer.settings = set_default_settings(
-                            streamer.settings, Settings.streamer_settings
-                        )
-                        streamer.settings.bet = set_default_settings(
-                            streamer.settings.bet, Settings.streamer_settings.bet
-                        )
-                        if streamer.settings.chat != ChatPresence.NEVER:
-                            streamer.irc_chat = ThreadChat(
-                                self.username,
-                                self.twitch.twitch_login.get_auth_token(),
-                                streamer.username,
-                            )
-                        self.streamers.append(streamer)
-                        loaded_count += 1
-                        if loaded_count % 50 == 0:
-                            elapsed = time.time() - start_time
-                            remaining = (elapsed / loaded_count) * (len(streamers_name) - loaded_count)
-                            logger.info(f"📊 {loaded_count}/{len(streamers_name)} streamers chargés... (~{remaining/60:.1f} min restantes)")
-                    except StreamerDoesNotExistException:
-                        failed_count += 1
-                        logger.info(
-                            f"Streamer {username} does not exist",
-                            extra={"emoji": ":cry:"},
-                        )
-                    except Exception as e:
-                        failed_count += 1
-                        logger.error(f"❌ Erreur chargement streamer {username}: {e}")
-            
-            logger.info(f"✅ {loaded_count} streamers chargés avec succès, {failed_count} échecs")
-
-            # 🚀 OPTIMISATION : Vérifier l'état en ligne en batch via API Helix
-            logger.info("⚡ Vérification de l'état en ligne en batch via API Helix...")
-            start_time = time.time()
-            online_status = self.twitch.get_followed_streams_online([s.username for s in self.streamers])
-            if online_status:
-                online_set = online_status.get('online', set())
-                offline_set = online_status.get('offline', set())
-                streams_data = online_status.get('streams_data', {})
-                
-                # Mettre à jour l'état en ligne de tous les streamers
-                for streamer in self.streamers:
-                    if streamer.username in online_set:
-                        streamer.set_online()
-                        # Mettre à jour les infos du stream si disponibles
-                        if streamer.username in streams_data:
-                            stream_data = streams_data[streamer.username]
-                            game_name = stream_data.get('game_name', '')
-                            streamer.stream.update(
-                                broadcast_id=None,  # Pas disponible via Helix
-                                title=stream_data.get('title', ''),
-                                game={'name': game_name, 'displayName': game_name} if game_name else {},
-                                tags=[],
-                                viewers_count=stream_data.get('viewer_count', 0)
-                            )
-                    elif streamer.username in offline_set:
-                        streamer.set_offline()
-                
-                batch_time = time.time() - start_time
-                logger.info(f"✅ État en ligne vérifié en {batch_time:.1f}s : {len(online_set)} en ligne, {len(offline_set)} hors ligne")
-            else:
-                logger.warning("⚠️ Impossible de vérifier l'état en ligne en batch, fallback individuel...")
-                # Fallback sur méthode individuelle
-                for streamer in self.streamers:
-                    time.sleep(random.uniform(0.1, 0.3))
-                    try:
-                        self.twitch.check_streamer_online(streamer)
-                    except StreamerDoesNotExistException:
-                        pass
+                streamer = (
+                    streamers_dict[username]
+                    if isinstance(streamers_dict[username], Streamer) is True
+                    else Streamer(username)
+                )
+                streamer.settings = set_default_settings(
+                    streamer.settings, Settings.streamer_settings
+                )
+                streamer.settings.bet = set_default_settings(
+                    streamer.settings.bet, Settings.streamer_settings.bet
+                )
+                candidates.append(streamer)
 
-            # Populate the streamers with default values.
-            # 1. Load channel points and auto-claim bonus (nécessite GraphQL, pas d'optimisation possible)
-            # Note: Les channel points sont des données privées, nécessitent GraphQL avec auth
-            logger.info("⚡ Chargement des channel points (GraphQL, peut prendre du temps)...")
-            start_time = time.time()
-            points_loaded = 0
-            for streamer in self.streamers:
-                time.sleep(random.uniform(0.1, 0.2))  # Réduire le délai
-                try:
-                    self.twitch.load_channel_points_context(streamer)
-                    points_loaded += 1
-                    if points_loaded % 50 == 0:
-                        elapsed = time.time() - start_time
-                        remaining = (elapsed / points_loaded) * (len(self.streamers) - points_loaded)
-                        logger.info(f"📊 {points_loaded}/{len(self.streamers)} channel points chargés... (~{remaining/60:.1f} min restantes)")
-                except StreamerDoesNotExistException:
-                    logger.info(
-                        f"Streamer {streamer.username} does not exist",
-                        extra={"emoji": ":cry:"},
+            # ♨️ Redémarrage à chaud : état du dernier checkpoint, seuls les écarts
+            # seront réconciliés (état en ligne), le reste est revalidé à la demande
+            restored = self.state_snapshot.restore(candidates)
+            if restored:
+                logger.info(
+                    f"♨️ {len(restored)}/{len(candidates)} streamers restaurés depuis le checkpoint",
+                    extra={"emoji": ":hotsprings:"},
+                )
+
+            # If we have at least one streamer with settings = make_predictions True
+            make_predictions = at_least_one_value_in_settings_is(
+                candidates, "make_predictions", True
+            )
+
+            # If we have at least one streamer with settings = claim_drops True
+            claim_drops = at_least_one_value_in_settings_is(
+                candidates, "claim_drops", True
+            )
+
+            self.ws_pool = WebSocketsPool(
+                twitch=self.twitch,
+                streamers=self.streamers,
+                events_predictions=self.events_predictions,
+            )
+
+            # Subscribe to community-points-user. Get update for points spent or gains
+            user_id = self.twitch.twitch_login.get_user_id()
+            # print(f"!!!!!!!!!!!!!! USER_ID: {user_id}")
+
+            # Fixes 'ERR_BADAUTH'
+            if not user_id:
+                logger.error("No user_id, exiting...")
+                self.end(0, 0)
+
+            self.ws_pool.submit(
+                PubsubTopic(
+                    "community-points-user-v1",
+                    user_id=user_id,
+                )
+            )
+
+            # Going to subscribe to predictions-user-v1. Get update when we place a new prediction (confirm)
+            if make_predictions is True:
+                self.ws_pool.submit(
+                    PubsubTopic(
+                        "predictions-user-v1",
+                        user_id=user_id,
+                    )
+                )
+
+            # 🚀 Démarrage en pipeline : channel IDs -> état en ligne -> channel points
+            # -> topics PubSub -> éligible au minute watcher, streamer par streamer
+            deferred_points = []
+            self.startup_pipeline = self.__build_startup_pipeline(
+                candidates, set(restored), deferred_points
+            )
+            self.startup_pipeline.start(create_chunks(candidates, 100))
+
+            if self.use_asyncio is True:
+                # Un seul thread : minute watcher, sync campaigns et monitor
+                # tournent comme coroutines sur la même boucle asyncio
+                self.minute_watcher_thread = threading.Thread(
+                    target=self.__run_async_loops,
+                    args=(claim_drops,),
+                )
+                self.minute_watcher_thread.name = "Asyncio loops"
+                self.minute_watcher_thread.start()
+            else:
+                # Spawn a thread for sync inventory and dashboard
+                if claim_drops is True:
+                    self.sync_campaigns_thread = threading.Thread(
+                        target=self.twitch.sync_campaigns,
+                        args=(self.streamers,),
                     )
-            
-            points_time = time.time() - start_time
-            logger.info(f"✅ {points_loaded} channel points chargés en {points_time:.1f}s")
-            
+                    self.sync_campaigns_thread.name = "Sync campaigns/inventory"
+                    self.sync_campaigns_thread.start()
+                    time.sleep(30)
+
+                self.minute_watcher_thread = threading.Thread(
+                    target=self.twitch.send_minute_watched_events,
+                    args=(self.priority,),
+                )
+                self.minute_watcher_thread.name = "Minute watcher"
+                self.minute_watcher_thread.start()
+
+                # 🚀 Présence des streamers : PubSub (stream-up/down) en signal principal,
+                # réconciliation Helix /streams basse fréquence sur les IDs en cache.
+                # Lancé dans tous les modes (pas seulement followers) : il recharge
+                # aussi les infos périmées des streams en ligne
+                self.stream_monitor_thread = threading.Thread(
+                    target=self.twitch.presence.run,
+                    args=(self.streamers,),
+                )
+                self.stream_monitor_thread.name = "Presence engine"
+                self.stream_monitor_thread.start()
+                logger.info(
+                    f"🔄 Moteur de présence activé (PubSub, réconciliation Helix toutes les "
+                    f"{self.twitch.presence.reconcile_interval // 60:.0f} min)",
+                    extra={"emoji": ":satellite:"}
+                )
+
+            self.startup_pipeline.join()
+            self.__report_startup()
+
+            if deferred_points:
+                # Soldes restaurés affichés tout de suite, rafraîchis en tâche de fond
+                threading.Thread(
+                    target=self.__refresh_restored_points,
+                    args=(deferred_points,),
+                    name="Refresh restored channel points",
+                    daemon=True,
+                ).start()
+
             # 🔄 Mettre à jour bot_data.json avec les points chargés pour que le bot Discord actualise les fiches
             try:
                 import json
@@ -435,128 +507,211 @@ class TwitchChannelPointsMiner:
             except Exception as e:
                 logger.warning(f"⚠️ Erreur mise à jour bot_data.json : {e}")
 
-            self.original_streamers = [
-                streamer.channel_points for streamer in self.streamers
-            ]
-
-            # If we have at least one streamer with settings = make_predictions True
-            make_predictions = at_least_one_value_in_settings_is(
-                self.streamers, "make_predictions", True
-            )
+            refresh_context = checkpoint_at = time.time()
+            while self.running:
+                time.sleep(random.uniform(20, 60))
+                # Do an external control for WebSocket. Check if the thread is running
+                # Check if is not None because maybe we have already created a new connection on array+1 and now index is None
+                for index, ws in enumerate(list(self.ws_pool.ws)):
+                    if (
+                        ws is not None
+                        and ws.is_reconnecting is False
+                        and ws.elapsed_last_ping() > 10
+                        and internet_connection_available() is True
+                    ):
+                        logger.info(
+                            f"#{index} - The last PING was sent more than 10 minutes ago. Reconnecting to the WebSocket..."
+                        )
+                        WebSocketsPool.handle_reconnection(ws)
 
-            # If we have at least one streamer with settings = claim_drops True
-            # Spawn a thread for sync inventory and dashboard
-            if (
-                at_least_one_value_in_settings_is(self.streamers, "claim_drops", True)
-                is True
-            ):
-                self.sync_campaigns_thread = threading.Thread(
-                    target=self.twitch.sync_campaigns,
-                    args=(self.streamers,),
+                if ((time.time() - refresh_context) // 60) >= 30:
+                    refresh_context = time.time()
+                    self.twitch.load_channel_points_contexts(
+                        [streamer for streamer in self.streamers if streamer.is_online]
+                    )
+                    self.__export_telemetry()
+
+                if ((time.time() - checkpoint_at) // 60) >= 5:
+                    checkpoint_at = time.time()
+                    self.state_snapshot.save(self.streamers)
+
+                if self.first_minute_reported is False:
+                    self.__report_first_minute()
+
+    def __build_startup_pipeline(self, candidates, restored, deferred_points):
+        """
+        Étapes du démarrage. Chaque étape a son pool et son débit : un streamer
+        passe à la suivante dès que ses propres données sont prêtes.
+        Les streamers restaurés depuis le checkpoint gardent leur channel ID et
+        leur solde : leur ChannelPointsContext est ajouté à deferred_points.
+        """
+        ranks = {streamer.username: rank for rank, streamer in enumerate(candidates)}
+
+        def resolve_channel_ids(chunk):
+            # Un lot Helix /users de 100 logins, fallback GQL pour les absents
+            try:
+                channel_ids = self.twitch._get_channel_ids_batch(
+                    [streamer.username for streamer in chunk if not streamer.channel_id]
                 )
-                self.sync_campaigns_thread.name = "Sync campaigns/inventory"
-                self.sync_campaigns_thread.start()
-                time.sleep(30)
-
-            self.minute_watcher_thread = threading.Thread(
-                target=self.twitch.send_minute_watched_events,
-                args=(self.streamers, self.priority),
+            except Exception as e:
+                logger.debug(f"⚠️ Résolution batch des channel IDs échouée: {e}")
+                channel_ids = {}
+            resolved = []
+            for streamer in chunk:
+                try:
+                    # Déjà connu si restauré depuis le checkpoint
+                    if not streamer.channel_id:
+                        if streamer.username in channel_ids:
+                            streamer.channel_id = channel_ids[streamer.username]
+                        else:
+                            logger.debug(
+                                f"⚠️ {streamer.username} non trouvé en batch, fallback individuel..."
+                            )
+                            streamer.channel_id = self.twitch.get_channel_id(
+                                streamer.username
+                            )
+                    resolved.append(streamer)
+                except StreamerDoesNotExistException:
+                    logger.info(
+                        f"Streamer {streamer.username} does not exist",
+                        extra={"emoji": ":cry:"},
+                    )
+                except Exception as e:
+                    # Un streamer en erreur ne doit pas faire perdre le reste du lot
+                    logger.error(f"❌ Erreur chargement streamer {streamer.username}: {e}")
+            return [resolved] if resolved else []
+
+        def check_online(chunk):
+            # Un lot Helix /streams pour les channel IDs du chunk
+            streams_data = self.twitch.get_streams_by_ids(
+                [streamer.channel_id for streamer in chunk], strict=True
             )
-            self.minute_watcher_thread.name = "Minute watcher"
-            self.minute_watcher_thread.start()
-
-            # 🚀 Surveillance automatique des streams suivis via API Helix
-            # Détecte rapidement les changements d'état (en ligne/hors ligne)
-            if followers is True:
-                self.stream_monitor_thread = threading.Thread(
-                    target=self.twitch.monitor_followed_streams,
-                    args=(self.streamers,),
-                    kwargs={"check_interval": 60}  # Vérifie toutes les 60 secondes
+            if streams_data is None:
+                # Lot en échec : ne pas passer ses streamers hors ligne, fallback individuel
+                logger.warning(
+                    "⚠️ Impossible de vérifier l'état en ligne en batch, fallback individuel..."
                 )
-                self.stream_monitor_thread.name = "Stream monitor (API Helix)"
-                self.stream_monitor_thread.start()
-                logger.info(
-                    "🔄 Surveillance automatique des streams activée (API Helix, toutes les 60s)",
-                    extra={"emoji": ":satellite:"}
+                for streamer in chunk:
+                    try:
+                        self.twitch.check_streamer_online(streamer)
+                    except StreamerDoesNotExistException:
+                        pass
+                    except Exception as e:
+                        logger.error(f"❌ Erreur vérification en ligne {streamer.username}: {e}")
+                return chunk
+            for streamer in chunk:
+                stream_data = streams_data.get(streamer.username)
+                if stream_data is None:
+                    streamer.set_offline()
+                    continue
+                if streamer.is_online is True and streamer.stream.broadcast_id is not None:
+                    # Toujours en ligne depuis le checkpoint : on garde le Stream restauré
+                    streamer.set_online()
+                    continue
+                streamer.set_online()
+                game_name = stream_data.get("game_name", "")
+                streamer.stream.update(
+                    broadcast_id=None,  # Pas disponible via Helix
+                    title=stream_data.get("title", ""),
+                    game={"name": game_name, "displayName": game_name} if game_name else {},
+                    tags=[],
+                    viewers_count=stream_data.get("viewer_count", 0),
                 )
+            return chunk
 
-            self.ws_pool = WebSocketsPool(
-                twitch=self.twitch,
-                streamers=self.streamers,
-                events_predictions=self.events_predictions,
-            )
-
-            # Subscribe to community-points-user. Get update for points spent or gains
-            user_id = self.twitch.twitch_login.get_user_id()
-            # print(f"!!!!!!!!!!!!!! USER_ID: {user_id}")
-
-            # Fixes 'ERR_BADAUTH'
-            if not user_id:
-                logger.error("No user_id, exiting...")
-                self.end(0, 0)
-
-            self.ws_pool.submit(
-                PubsubTopic(
-                    "community-points-user-v1",
-                    user_id=user_id,
+        def load_channel_points(streamer):
+            if streamer in restored:
+                deferred_points.append(streamer)
+                return [streamer]
+            try:
+                self.twitch.load_channel_points_context(streamer)
+            except StreamerDoesNotExistException:
+                logger.info(
+                    f"Streamer {streamer.username} does not exist",
+                    extra={"emoji": ":cry:"},
                 )
-            )
+                return []
+            return [streamer]
+
+        def subscribe_topics(streamer):
+            self.ws_pool.track(streamer)
+            return [streamer]
+
+        def make_watchable(streamer):
+            # Ajout en fin de liste uniquement : d'autres threads la parcourent.
+            # L'ordre d'origine (Priority.ORDER) est porté par le rang dans watch_index
+            if streamer not in restored:
+                # Solde restauré : la base est prise après son rafraîchissement
+                self.original_streamers[streamer.username] = streamer.channel_points
+            self.streamers.append(streamer)
+            self.twitch.watch_index.add(streamer, ranks[streamer.username])
+            self.twitch.schedule.track(streamer)
+            if streamer.is_online is True:
+                # set_online est passé avant track (ou était un no-op pour un
+                # streamer restauré toujours en ligne) : le modèle ne l'a pas vu
+                self.twitch.schedule.observe_online(streamer.username, streamer.online_at)
+            return []
+
+        return StartupPipeline(
+            [
+                PipelineStage("channel_ids", resolve_channel_ids, max_workers=4, rate=10),
+                PipelineStage("online", check_online, max_workers=4, rate=10),
+                PipelineStage("points", load_channel_points, max_workers=20, rate=40),
+                # Connexions PubSub remplies dans l'ordre de la liste : un seul worker
+                PipelineStage("topics", subscribe_topics, max_workers=1),
+                PipelineStage("watch", make_watchable, max_workers=1),
+            ]
+        )
 
-            # Going to subscribe to predictions-user-v1. Get update when we place a new prediction (confirm)
-            if make_predictions is True:
-                self.ws_pool.submit(
-                    PubsubTopic(
-                        "predictions-user-v1",
-                        user_id=user_id,
-                    )
-                )
+    def __refresh_restored_points(self, streamers):
+        """Soldes restaurés rafraîchis en tâche de fond, puis pris comme base du rapport."""
+        self.twitch.load_channel_points_contexts(streamers)
+        for streamer in streamers:
+            self.original_streamers[streamer.username] = streamer.channel_points
 
-            for streamer in self.streamers:
-                self.ws_pool.submit(
-                    PubsubTopic("video-playback-by-id", streamer=streamer)
-                )
+    def time_to_first_minute(self):
+        """Secondes entre le début du démarrage et le premier minute-watched accepté."""
+        if self.startup_pipeline is None or self.twitch.first_minute_watched_at is None:
+            return None
+        return self.twitch.first_minute_watched_at - self.startup_pipeline.started_at
 
-                if streamer.settings.follow_raid is True:
-                    self.ws_pool.submit(PubsubTopic("raid", streamer=streamer))
+    def __report_startup(self):
+        logger.info(
+            f"✅ {len(self.streamers)} streamers prêts en {self.startup_pipeline.duration:.1f}s",
+            extra={"emoji": ":rocket:"},
+        )
+        logger.debug(f"Startup pipeline:\n{self.startup_pipeline.summary()}")
+        if self.__report_first_minute() is False:
+            logger.info(
+                "⏱️ Premier minute-watched : en attente d'un stream éligible...",
+                extra={"emoji": ":stopwatch:"},
+            )
 
-                if streamer.settings.make_predictions is True:
-                    self.ws_pool.submit(
-                        PubsubTopic("predictions-channel-v1", streamer=streamer)
-                    )
+    def __report_first_minute(self):
+        elapsed = self.time_to_first_minute()
+        if elapsed is None:
+            return False
+        self.first_minute_reported = True
+        logger.info(
+            f"⏱️ Premier minute-watched {elapsed:.1f}s après le début du démarrage",
+            extra={"emoji": ":stopwatch:"},
+        )
+        return True
 
-                if streamer.settings.claim_moments is True:
-                    self.ws_pool.submit(
-                        PubsubTopic("community-moments-channel-v1", streamer=streamer)
-                    )
+    def __run_async_loops(self, claim_drops):
+        import asyncio
 
-                if streamer.settings.community_goals is True:
-                    self.ws_pool.submit(
-                        PubsubTopic("community-points-channel-v1", streamer=streamer)
-                    )
+        from TwitchChannelPointsMiner.classes.AsyncTwitch import AsyncTwitch
 
-            refresh_context = time.time()
-            while self.running:
-                time.sleep(random.uniform(20, 60))
-                # Do an external control for WebSocket. Check if the thread is running
-                # Check if is not None because maybe we have already created a new connection on array+1 and now index is None
-                for index in range(0, len(self.ws_pool.ws)):
-                    if (
-                        self.ws_pool.ws[index].is_reconnecting is False
-                        and self.ws_pool.ws[index].elapsed_last_ping() > 10
-                        and internet_connection_available() is True
-                    ):
-                        logger.info(
-                            f"#{index} - The last PING was sent more than 10 minutes ago. Reconnecting to the WebSocket..."
-                        )
-                        WebSocketsPool.handle_reconnection(self.ws_pool.ws[index])
+        async def main():
+            async with AsyncTwitch(self.twitch) as async_twitch:
+                loops = [async_twitch.send_minute_watched_events(self.priority)]
+                if claim_drops is True:
+                    loops.append(async_twitch.sync_campaigns(self.streamers))
+                loops.append(async_twitch.monitor_presence(self.streamers))
+                await asyncio.gather(*loops)
 
-                if ((time.time() - refresh_context) // 60) >= 30:
-                    refresh_context = time.time()
-                    for index in range(0, len(self.streamers)):
-                        if self.streamers[index].is_online:
-                            self.twitch.load_channel_points_context(
-                                self.streamers[index]
-                            )
+        asyncio.run(main())
 
     def end(self, signum, frame):
         if not self.running:
@@ -564,16 +719,14 @@ class TwitchChannelPointsMiner:
         
         logger.info("CTRL+C Detected! Please wait just a moment!")
 
-        for streamer in self.streamers:
-            if (
-                streamer.irc_chat is not None
-                and streamer.settings.chat != ChatPresence.NEVER
-            ):
-                streamer.leave_chat()
-                if streamer.irc_chat.is_alive() is True:
-                    streamer.irc_chat.join()
+        if Settings.irc_chat is not None:
+            Settings.irc_chat.stop()
+            if Settings.irc_chat.is_alive() is True:
+                Settings.irc_chat.join()
 
         self.running = self.twitch.running = False
+        self.twitch.client_version_cache.stop()
+        self.twitch.spade_url_cache.stop()
         if self.ws_pool is not None:
             self.ws_pool.end()
 
@@ -593,13 +746,31 @@ class TwitchChannelPointsMiner:
                 streamer.mutex.acquire()
                 streamer.mutex.release()
 
+        # Un arrêt pendant le démarrage conserverait un checkpoint incomplet
+        if (
+            self.startup_pipeline is not None
+            and self.startup_pipeline.finished_at is not None
+            and self.state_snapshot.save(self.streamers) is True
+        ):
+            logger.info(
+                f"Checkpoint: {self.state_snapshot.path}",
+                extra={"emoji": ":floppy_disk:"},
+            )
+
         self.__print_report()
 
+        if self.cassette is not None:
+            self.cassette.close()
+
         # Stop the queue listener to make sure all messages have been logged
         self.queue_listener.stop()
 
         sys.exit(0)
 
+    def __export_telemetry(self):
+        Path(os.path.dirname(self.telemetry_file)).mkdir(parents=True, exist_ok=True)
+        return self.twitch.transport.telemetry.export(self.telemetry_file)
+
     def __print_report(self):
         print("\n")
         logger.info(
@@ -613,6 +784,38 @@ class TwitchChannelPointsMiner:
             f"Duration {datetime.now() - self.start_datetime}",
             extra={"emoji": ":hourglass:"},
         )
+        logger.debug(f"Client-Version cache: {self.twitch.client_version_cache.stats()}")
+        logger.debug(f"Spade URL cache: {self.twitch.spade_url_cache.stats()}")
+        logger.debug(
+            f"Rate limiter: {self.twitch.transport.rate_limiter.stats()}, "
+            f"retries: {self.twitch.transport.retries}"
+        )
+        logger.debug(f"GQL response cache: {self.twitch.gql_cache.stats()}")
+        logger.debug(f"Channel ID cache: {self.twitch.channel_id_cache.stats()}")
+        logger.debug(f"Playback sessions: {self.twitch.playback_sessions.stats()}")
+        logger.debug(f"Watch priority index: {self.twitch.watch_index.stats()}")
+        logger.debug(f"Minute watched cadence: {self.twitch.watch_scheduler.stats()}")
+        logger.debug(f"Presence engine: {self.twitch.presence.stats()}")
+        logger.debug(f"Schedule model: {self.twitch.schedule.stats()}")
+        if self.ws_pool is not None:
+            logger.debug(f"PubSub topics: {self.ws_pool.stats()}")
+        if self.startup_pipeline is not None:
+            logger.debug(
+                f"Startup pipeline ({self.startup_pipeline.duration:.1f}s), "
+                f"time to first minute: {self.time_to_first_minute()}\n"
+                f"{self.startup_pipeline.summary()}"
+            )
+        if self.cassette is not None:
+            logger.info(
+                f"Cassette {self.cassette.path}: {self.cassette.stats()}",
+                extra={"emoji": ":videocassette:"},
+            )
+        logger.debug(f"Telemetry:\n{self.twitch.transport.telemetry.summary()}")
+        if self.__export_telemetry() is True:
+            logger.info(
+                f"Telemetry snapshot: {self.telemetry_file}",
+                extra={"emoji": ":bar_chart:"},
+            )
 
         if not Settings.logger.less and self.events_predictions != {}:
             print("")
@@ -639,10 +842,11 @@ class TwitchChannelPointsMiner:
         print("")
         for streamer_index in range(0, len(self.streamers)):
             if self.streamers[streamer_index].history != {}:
-                gained = (
-                    self.streamers[streamer_index].channel_points
-                    - self.original_streamers[streamer_index]
+                baseline = self.original_streamers.get(
+                    self.streamers[streamer_index].username,
+                    self.streamers[streamer_index].channel_points,
                 )
+                gained = self.streamers[streamer_index].channel_points - baseline
                 
                 from colorama import Fore
                 streamer_highlight = Fore.YELLOW
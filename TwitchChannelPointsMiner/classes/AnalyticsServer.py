@@ -231,7 +231,8 @@ class AnalyticsServer(Thread):
         port: int = 5000,
         refresh: int = 5,
         days_ago: int = 7,
-        username: str = None
+        username: str = None,
+        telemetry=None,
     ):
         super(AnalyticsServer, self).__init__()
 
@@ -242,6 +243,7 @@ class AnalyticsServer(Thread):
         self.refresh = refresh
         self.days_ago = days_ago
         self.username = username
+        self.telemetry = telemetry
 
         def generate_log():
             global last_sent_log_index  # Use the global variable
@@ -264,6 +266,15 @@ class AnalyticsServer(Thread):
             except FileNotFoundError:
                 return Response("Log file not found.", status=404, mimetype="text/plain")
 
+        def telemetry_snapshot():
+            if telemetry is None:
+                return Response("Telemetry not available.", status=404, mimetype="text/plain")
+            return Response(
+                json.dumps(telemetry.snapshot(prefix=request.args.get("prefix"))),
+                status=200,
+                mimetype="application/json",
+            )
+
         self.app = Flask(
             __name__,
             template_folder=os.path.join(Path().absolute(), "assets"),
@@ -285,6 +296,8 @@ class AnalyticsServer(Thread):
                               json_all, methods=["GET"])
         self.app.add_url_rule(
             "/log", "log", generate_log, methods=["GET"])
+        self.app.add_url_rule(
+            "/telemetry", "telemetry", telemetry_snapshot, methods=["GET"])
 
     def run(self):
         logger.info(
@@ -0,0 +1,853 @@
+"""
+AsyncTwitch - Client Twitch asyncio (aiohttp)
+Mêmes opérations que Twitch (GQL, Helix, usher/spade, drops, prédictions) :
+des milliers de requêtes en vol partagent une seule boucle d'événements au lieu
+de bloquer un thread chacune.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import re
+import time
+
+import aiohttp
+import validators
+
+from TwitchChannelPointsMiner.classes.Cassette import Cassette, full_url, request_body
+from TwitchChannelPointsMiner.classes.entities.Drop import Drop
+from TwitchChannelPointsMiner.classes.Exceptions import (
+    StreamerDoesNotExistException,
+    StreamerIsOfflineException,
+)
+from TwitchChannelPointsMiner.classes.GQLTemplate import (
+    GQLTemplates,
+    encode_gql,
+    gql_operation_name,
+)
+from TwitchChannelPointsMiner.classes.RateLimiter import backoff_delay, should_retry
+from TwitchChannelPointsMiner.classes.Settings import Events
+from TwitchChannelPointsMiner.classes.Telemetry import operation_label
+from TwitchChannelPointsMiner.classes.Twitch import (
+    SPADE_SETTINGS_PATTERN,
+    SPADE_URL_PATTERN,
+)
+from TwitchChannelPointsMiner.constants import (
+    CLIENT_ID,
+    HELIX_URL,
+    USER_AGENTS,
+    USHER_URL,
+    GQLOperations,
+)
+from TwitchChannelPointsMiner.utils import create_chunks
+
+logger = logging.getLogger(__name__)
+
+
+class _ReplayResponse(object):
+    """Réponse aiohttp minimale reconstruite depuis une cassette."""
+
+    def __init__(self, url, entry):
+        self.url = url
+        self.status = 404 if entry is None else entry["status"]
+        self.headers = {} if entry is None else entry["headers"]
+        self.content = Cassette.content(entry)
+        self.content_length = len(self.content)
+
+    async def read(self):
+        return self.content
+
+    async def text(self):
+        return self.content.decode("utf-8")
+
+    async def json(self, content_type=None):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status, message=f"Replayed {self.status}"
+            )
+
+    def release(self):
+        pass
+
+
+class AsyncTwitch(object):
+    """
+    Contrepartie asyncio de Twitch. Réutilise l'instance Twitch existante pour
+    l'authentification, l'état partagé (running, Client-Version) et le parsing
+    des réponses, et ne remplace que la couche réseau.
+    """
+
+    def __init__(
+        self,
+        twitch,
+        limit: int = 100,
+        limit_per_host: int = 32,
+        connect_timeout: float = 5,
+        read_timeout: float = 20,
+    ):
+        """
+        Args:
+            twitch: Instance Twitch déjà connectée (login effectué)
+            limit: Nombre total de connexions simultanées
+            limit_per_host: Connexions simultanées par hôte
+            connect_timeout: Timeout d'établissement de la connexion (secondes)
+            read_timeout: Timeout de lecture de la réponse (secondes)
+        """
+        self.twitch = twitch
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.session = None
+
+    @property
+    def running(self):
+        return self.twitch.running
+
+    async def start(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+                timeout=self.timeout,
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return self
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def __chuncked_sleep(self, seconds, chunk_size=3):
+        sleep_time = max(seconds, 0) / chunk_size
+        for i in range(0, chunk_size):
+            await asyncio.sleep(sleep_time)
+            if self.running is False:
+                break
+
+    # === HTTP === #
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, operation=None, idempotent=None, **kwargs):
+        """
+        Requête aiohttp soumise au RateLimiter partagé avec Twitch.transport,
+        réessayée sur 429/5xx avec backoff exponentiel + jitter (5xx : GET/HEAD
+        seulement, sauf idempotent=True), et enregistrée dans la même télémétrie.
+        """
+        transport = self.twitch.transport
+        operation = operation_label(url) if operation is None else operation
+        start = time.perf_counter()
+        cassette = transport.cassette
+        if cassette is not None and cassette.is_replaying:
+            entry = cassette.lookup(
+                method,
+                full_url(url, kwargs.get("params")),
+                request_body(kwargs),
+                operation,
+                wait=False,
+            )
+            if entry is not None and cassette.simulate_latency is True:
+                await asyncio.sleep(entry["ms"] / 1000)
+            response = _ReplayResponse(url, entry)
+            transport.telemetry.record(
+                operation,
+                response.status,
+                time.perf_counter() - start,
+                bytes_out=len(request_body(kwargs)),
+                bytes_in=response.content_length,
+            )
+            yield response
+            return
+
+        attempt = 0
+        try:
+            while True:
+                delay = transport.rate_limiter.reserve(url)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                response = await self.session.request(method, url, **kwargs)
+                retry_after = transport.rate_limiter.on_response(
+                    url, response.status, response.headers
+                )
+                if (
+                    not should_retry(method, response.status, idempotent)
+                    or attempt >= transport.max_retries
+                ):
+                    break
+
+                response.release()
+                transport.retries += 1
+                await asyncio.sleep(max(backoff_delay(attempt), retry_after or 0))
+                attempt += 1
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            transport.telemetry.record(
+                operation,
+                None,
+                time.perf_counter() - start,
+                retries=attempt,
+                error=type(e).__name__,
+            )
+            raise
+
+        data = kwargs.get("data")
+        transport.telemetry.record(
+            operation,
+            response.status,
+            time.perf_counter() - start,
+            bytes_out=len(data) if isinstance(data, (bytes, str)) else 0,
+            bytes_in=response.content_length or 0,
+            retries=attempt,
+        )
+        if cassette is not None and cassette.is_recording:
+            # Le corps reste en cache dans la réponse pour json() / text()
+            content = await response.read()
+            cassette.record_http(
+                method,
+                full_url(url, kwargs.get("params")),
+                request_body(kwargs),
+                operation,
+                response.status,
+                response.headers,
+                content,
+                time.perf_counter() - start,
+            )
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def post_gql_request(self, json_data):
+        try:
+            async with self.request(
+                "POST",
+                GQLOperations.url,
+                operation=f"gql:{gql_operation_name(json_data)}",
+                data=encode_gql(json_data),
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"OAuth {self.twitch.twitch_login.get_auth_token()}",
+                    "Client-Id": CLIENT_ID,
+                    "Client-Session-Id": self.twitch.client_session,
+                    "Client-Version": self.twitch.client_version_cache.get(),
+                    "User-Agent": self.twitch.user_agent,
+                    "X-Device-Id": self.twitch.device_id,
+                },
+            ) as response:
+                content = await response.json(content_type=None)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Data: {json_data}, Status code: {response.status}, Content: {content}"
+                    )
+                return content
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(
+                f"Error with GQLOperations ({gql_operation_name(json_data)}): {e}"
+            )
+            return {}
+
+    async def cached_gql_request(self, json_data):
+        """post_gql_request derrière le cache de réponses partagé avec Twitch."""
+        response = self.twitch.gql_cache.get(json_data)
+        if response is None:
+            response = await self.post_gql_request(json_data)
+            self.twitch.gql_cache.put(json_data, response)
+        return response
+
+    def __helix_headers(self):
+        user_token = self.twitch.twitch_login.get_auth_token()
+        if not user_token:
+            return None
+        return {"Client-ID": CLIENT_ID, "Authorization": f"Bearer {user_token}"}
+
+    async def helix_get(self, url):
+        """GET Helix authentifié. Retourne le JSON, ou None si pas de token / erreur."""
+        headers = self.__helix_headers()
+        if headers is None:
+            return None
+        try:
+            async with self.request("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug(f"⚠️ Erreur API Helix ({url.split('?')[0]}): {e}")
+            return None
+
+    # === STREAMER / STREAM / INFO === #
+    async def get_spade_url(self, streamer):
+        # Valeur globale partagée avec Twitch : la découverte par chaîne n'est qu'un secours
+        spade_url = self.twitch.spade_url_cache.get()
+        if spade_url is not None:
+            streamer.stream.spade_url = spade_url
+            return
+        headers = {"User-Agent": USER_AGENTS["Linux"]["FIREFOX"]}
+        try:
+            async with self.request(
+                "GET", streamer.streamer_url, headers=headers
+            ) as response:
+                text = await response.text()
+            settings_url = re.search(SPADE_SETTINGS_PATTERN, text).group(1)
+
+            async with self.request("GET", settings_url, headers=headers) as response:
+                text = await response.text()
+            streamer.stream.spade_url = re.search(SPADE_URL_PATTERN, text).group(1)
+            self.twitch.spade_url_cache.set(streamer.stream.spade_url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, AttributeError) as e:
+            logger.error(f"Something went wrong during extraction of 'spade_url': {e}")
+
+    async def get_stream_info(self, streamer):
+        json_data = GQLTemplates.VideoPlayerStreamInfoOverlayChannel.build(
+            {"channel": streamer.username}
+        )
+        response = await self.cached_gql_request(json_data)
+
+        try:
+            user = response["data"]["user"]
+        except (KeyError, TypeError):
+            raise StreamerIsOfflineException
+        if user is None or user["stream"] is None:
+            raise StreamerIsOfflineException
+        return user
+
+    async def update_stream(self, streamer):
+        if streamer.stream.update_required() is True:
+            stream_info = await self.get_stream_info(streamer)
+            if self.twitch._apply_stream_info(streamer, stream_info) is True:
+                streamer.stream.campaigns_ids = (
+                    await self.get_campaign_ids_from_streamer(streamer)
+                )
+                streamer.update_watch_priority()
+
+    async def check_streamer_online(self, streamer):
+        if time.time() < streamer.offline_at + 60:
+            return
+
+        if streamer.is_online is False:
+            try:
+                await self.get_spade_url(streamer)
+                await self.update_stream(streamer)
+            except StreamerIsOfflineException:
+                streamer.set_offline()
+            else:
+                streamer.set_online()
+        else:
+            try:
+                await self.update_stream(streamer)
+            except StreamerIsOfflineException:
+                streamer.set_offline()
+
+    async def get_channel_id(self, streamer_username):
+        channel_id = self.twitch.channel_id_cache.get(streamer_username)
+        if channel_id is not None:
+            return channel_id
+
+        json_data = GQLTemplates.GetIDFromLogin.build({"login": streamer_username})
+        response = await self.cached_gql_request(json_data)
+        try:
+            user = response["data"]["user"]
+        except (KeyError, TypeError):
+            raise StreamerDoesNotExistException
+        if user is None:
+            raise StreamerDoesNotExistException
+        self.twitch.channel_id_cache.update({streamer_username: user["id"]})
+        return user["id"]
+
+    async def get_streams_by_ids(self, user_ids: list):
+        """Même format que Twitch.get_streams_by_ids(strict=True) : None si un lot échoue."""
+
+        async def fetch(chunk):
+            user_ids_param = "&".join([f"user_id={uid}" for uid in chunk])
+            return await self.helix_get(
+                f"{HELIX_URL}/streams?{user_ids_param}&first=100"
+            )
+
+        results = await asyncio.gather(
+            *[fetch(chunk) for chunk in create_chunks(user_ids, 100)]
+        )
+        if any(streams_data is None for streams_data in results):
+            return None
+        online_streams = {}
+        for streams_data in results:
+            for stream in streams_data.get("data", []):
+                user_id = stream.get("user_id")
+                username = stream.get("user_login", "").lower()
+                if user_id and username:
+                    online_streams[username] = {
+                        "user_id": user_id,
+                        "game_name": stream.get("game_name", ""),
+                        "title": stream.get("title", ""),
+                        "viewer_count": stream.get("viewer_count", 0),
+                        "started_at": stream.get("started_at", ""),
+                    }
+        return online_streams
+
+    async def monitor_presence(self, streamers, tick=60):
+        """Version coroutine de PresenceEngine.run."""
+        presence = self.twitch.presence
+        while self.running:
+            try:
+                stale = presence.stale()
+                presence.refreshes += len(stale)
+                await asyncio.gather(
+                    *[self.check_streamer_online(streamer) for streamer in stale],
+                    return_exceptions=True,
+                )
+
+                targets = (
+                    presence.targets(list(streamers))
+                    if presence.reconcile_due()
+                    else []
+                )
+                if targets:
+                    online_streams = await self.get_streams_by_ids(
+                        [streamer.channel_id for streamer in targets]
+                    )
+                    if online_streams is None:
+                        logger.debug(
+                            "⚠️ Réconciliation Helix échouée, nouvel essai au prochain cycle"
+                        )
+                        presence.reschedule(targets)
+                    else:
+                        went_online, went_offline = presence.diff(
+                            targets, online_streams
+                        )
+                        for streamer in went_offline:
+                            streamer.set_offline()
+
+                        async def bring_online(streamer):
+                            try:
+                                await self.get_spade_url(streamer)
+                                await self.update_stream(streamer)
+                                streamer.set_online()
+                            except Exception as e:
+                                logger.warning(
+                                    f"⚠️ Erreur mise à jour stream {streamer.username}: {e}"
+                                )
+                                presence.retry(streamer)
+
+                        await asyncio.gather(
+                            *[bring_online(streamer) for streamer in went_online]
+                        )
+            except Exception as e:
+                logger.error(f"❌ Erreur dans le moteur de présence: {e}", exc_info=True)
+
+            await self.__chuncked_sleep(tick)
+
+    async def viewer_is_mod(self, streamer):
+        json_data = GQLTemplates.ModViewChannelQuery.build(
+            {"channelLogin": streamer.username}
+        )
+        response = await self.cached_gql_request(json_data)
+        try:
+            streamer.viewer_is_mod = response["data"]["user"]["self"]["isModerator"]
+        except (ValueError, KeyError, TypeError):
+            streamer.viewer_is_mod = False
+
+    async def update_raid(self, streamer, raid):
+        if streamer.raid != raid:
+            streamer.raid = raid
+            json_data = GQLTemplates.JoinRaid.build({"input": {"raidID": raid.raid_id}})
+            await self.post_gql_request(json_data)
+
+            logger.info(
+                f"Joining raid from {streamer} to {raid.target_login}!",
+                extra={"emoji": ":performing_arts:", "event": Events.JOIN_RAID},
+            )
+
+    # === MINUTE WATCHED === #
+    async def send_minute_watched(self, streamer):
+        """Chaîne PlaybackAccessToken -> usher -> playlist -> HEAD segment -> spade."""
+        headers = {"User-Agent": self.twitch.user_agent}
+        sessions = self.twitch.playback_sessions
+        # Jeton + playlist master en cache : reconstruits à l'expiration ou sur erreur
+        session = sessions.get(streamer.username)
+        if session is None:
+            session = await self.__open_playback_session(streamer, headers)
+            if session is None:
+                return False
+
+        async with self.request(
+            "GET", session.media_playlist_url, headers=headers
+        ) as response:
+            if response.status != 200:
+                sessions.invalidate(streamer.username)
+                return False
+            segment_url = (await response.text()).split("\n")[-2]
+        if not validators.url(segment_url):
+            sessions.invalidate(streamer.username)
+            return False
+
+        async with self.request(
+            "HEAD", segment_url, headers=headers, allow_redirects=False
+        ) as response:
+            if response.status != 200:
+                sessions.invalidate(streamer.username)
+                return False
+
+        if not streamer.stream.spade_url:
+            await self.get_spade_url(streamer)
+            if not streamer.stream.spade_url:
+                return False
+
+        async with self.request(
+            "POST",
+            streamer.stream.spade_url,
+            data=streamer.stream.encode_payload(),
+            headers=self.twitch.spade_headers,
+        ) as response:
+            logger.debug(
+                f"Send minute watched request for {streamer} - Status code: {response.status}"
+            )
+            if response.status == 204:
+                self.twitch._on_minute_watched(streamer)
+                return True
+        return False
+
+    async def __open_playback_session(self, streamer, headers):
+        json_data = GQLTemplates.PlaybackAccessToken.build(
+            {
+                "login": streamer.username,
+                "isLive": True,
+                "isVod": False,
+                "vodID": "",
+                "playerType": "site",
+            }
+        )
+        response = await self.post_gql_request(json_data)
+        token = (response.get("data") or {}).get("streamPlaybackAccessToken") or {}
+        signature, value = token.get("signature"), token.get("value")
+        if not signature or not value:
+            logger.error(f"Missing signature or value in Twitch response: {response}")
+            return None
+
+        async with self.request(
+            "GET",
+            f"{USHER_URL}/api/channel/hls/{streamer.username}.m3u8",
+            params={"sig": signature, "token": value},
+            headers=headers,
+        ) as response:
+            if response.status != 200:
+                return None
+            lowest_quality_url = (await response.text()).split("\n")[-1]
+        if not validators.url(lowest_quality_url):
+            return None
+        return self.twitch.playback_sessions.put(
+            streamer.username, lowest_quality_url, value
+        )
+
+    async def send_minute_watched_events(self, priority):
+        """Version coroutine de Twitch.send_minute_watched_events, même WatchScheduler."""
+        watch_index = self.twitch.watch_index
+        scheduler = self.twitch.watch_scheduler
+        # Une tâche par échéance : un usher/spade lent ne retarde plus l'autre stream
+        tasks = set()
+        # Réveillé par chaque envoi terminé : sa prochaine échéance est alors connue
+        wake = asyncio.Event()
+        last_check = 0
+        while self.running:
+            try:
+                if time.time() - last_check >= scheduler.interval:
+                    last_check = time.time()
+                    # Réindexation complète de sécurité (rattrape une mise à jour manquée)
+                    # Les infos périmées sont rechargées par monitor_presence
+                    watch_index.reconcile()
+
+                streamers_watching = {
+                    streamer.username: streamer
+                    for streamer in watch_index.select(priority)
+                }
+                scheduler.sync(streamers_watching)
+                for username, deadline in scheduler.pop_due():
+                    task = asyncio.ensure_future(
+                        self.__send_scheduled_minute_watched(
+                            streamers_watching[username], deadline, wake
+                        )
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                # Réveil à la prochaine échéance, au plus tard dans 1s pour suivre les priorités
+                next_deadline = scheduler.next_deadline()
+                delay = 1 if next_deadline is None else next_deadline - time.time()
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), min(max(delay, 0.05), 1))
+                except asyncio.TimeoutError:
+                    pass
+            except Exception:
+                logger.error("Exception raised in send minute watched", exc_info=True)
+                await asyncio.sleep(1)
+
+        # La session HTTP est fermée à la sortie : pas d'envoi en vol au-delà
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __send_scheduled_minute_watched(self, streamer, deadline, wake):
+        started_at = time.time()
+        try:
+            await self.send_minute_watched(streamer)
+        except Exception as e:
+            logger.error(f"Error while trying to send minute watched: {e}")
+        finally:
+            self.twitch.watch_scheduler.done(streamer.username, deadline, started_at)
+            wake.set()
+
+    # === CHANNEL POINTS / PREDICTION / MOMENTS === #
+    async def load_channel_points_context(self, streamer):
+        json_data = GQLTemplates.ChannelPointsContext.build(
+            {"channelLogin": streamer.username}
+        )
+        response = await self.post_gql_request(json_data)
+
+        loaded, claim_id = self.twitch._apply_channel_points_context(streamer, response)
+        if loaded is False:
+            return
+
+        if claim_id is not None:
+            await self.claim_bonus(streamer, claim_id)
+
+        if streamer.settings.community_goals is True:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.twitch.contribute_to_community_goals, streamer
+            )
+
+    async def load_channel_points_contexts(self, streamers, concurrency=50):
+        """Charge les contextes en parallèle. Retourne les streamers inexistants."""
+        semaphore = asyncio.Semaphore(concurrency)
+        not_found = []
+
+        async def load(streamer):
+            async with semaphore:
+                try:
+                    await self.load_channel_points_context(streamer)
+                except StreamerDoesNotExistException:
+                    not_found.append(streamer)
+
+        await asyncio.gather(*[load(streamer) for streamer in streamers])
+        return not_found
+
+    async def claim_bonus(self, streamer, claim_id):
+        logger.info(
+            f"Claiming the bonus for {streamer}!",
+            extra={"emoji": ":gift:", "event": Events.BONUS_CLAIM},
+        )
+        json_data = GQLTemplates.ClaimCommunityPoints.build(
+            {"input": {"channelID": streamer.channel_id, "claimID": claim_id}}
+        )
+        await self.post_gql_request(json_data)
+
+    async def claim_moment(self, streamer, moment_id):
+        logger.info(
+            f"Claiming the moment for {streamer}!",
+            extra={"emoji": ":video_camera:", "event": Events.MOMENT_CLAIM},
+        )
+        json_data = GQLTemplates.CommunityMomentCallout_Claim.build(
+            {"input": {"momentID": moment_id}}
+        )
+        await self.post_gql_request(json_data)
+
+    async def check_predictions_available(self, streamer):
+        """Même sémantique que Twitch.check_predictions_available (True / False / None)."""
+        headers = self.__helix_headers()
+        if headers is None:
+            return None
+        try:
+            async with self.request(
+                "GET",
+                f"{HELIX_URL}/predictions?broadcaster_id={streamer.channel_id}&first=1",
+                headers=headers,
+            ) as response:
+                if response.status == 200:
+                    return True
+                if response.status == 403:
+                    error_data = await response.json(content_type=None)
+                    error_message = error_data.get("message", "").lower()
+                    if any(
+                        keyword in error_message
+                        for keyword in [
+                            "not available in your region",
+                            "not available in this region",
+                            "geographic restriction",
+                            "region locked",
+                            "blocked in your region",
+                            "unavailable in your geographic",
+                        ]
+                    ):
+                        return False
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug(
+                f"⚠️ Erreur vérification prédictions pour {streamer.username}: {e}"
+            )
+            return None
+
+    async def make_predictions(self, event):
+        decision = self.twitch._prediction_decision(event)
+        if decision is None:
+            return
+
+        if await self.check_predictions_available(event.streamer) is False:
+            logger.warning(
+                f"⚠️ Prédictions non disponibles (blocage régional probable) pour {event.streamer.username}",
+                extra={"emoji": ":no_entry_sign:", "event": Events.BET_FAILED},
+            )
+            return
+
+        json_data = self.twitch._prediction_request(event, decision)
+        if json_data is not None:
+            response = await self.post_gql_request(json_data)
+            self.twitch._on_prediction_response(response)
+
+    # === CAMPAIGNS / DROPS / INVENTORY === #
+    async def get_campaign_ids_from_streamer(self, streamer):
+        json_data = GQLTemplates.DropsHighlightService_AvailableDrops.build(
+            {"channelID": streamer.channel_id}
+        )
+        response = await self.cached_gql_request(json_data)
+        try:
+            return [
+                item["id"]
+                for item in response["data"]["channel"]["viewerDropCampaigns"] or []
+            ]
+        except (ValueError, KeyError, TypeError):
+            return []
+
+    async def get_inventory(self):
+        response = await self.post_gql_request(GQLTemplates.Inventory.build())
+        try:
+            return (
+                response["data"]["currentUser"]["inventory"] if response != {} else {}
+            )
+        except (ValueError, KeyError, TypeError):
+            return {}
+
+    async def get_drops_dashboard(self, status=None):
+        response = await self.post_gql_request(
+            GQLTemplates.ViewerDropsDashboard.build()
+        )
+        campaigns = (response.get("data") or {}).get("currentUser", {}).get(
+            "dropCampaigns", []
+        ) or []
+        if status is not None:
+            campaigns = [x for x in campaigns if x["status"] == status.upper()]
+        return campaigns
+
+    async def get_campaigns_details(self, campaigns):
+        async def fetch(chunk):
+            json_data = []
+            for campaign in chunk:
+                json_data.append(
+                    GQLTemplates.DropCampaignDetails.build(
+                        {
+                            "dropID": campaign["id"],
+                            "channelLogin": f"{self.twitch.twitch_login.get_user_id()}",
+                        }
+                    )
+                )
+            return await self.post_gql_request(json_data)
+
+        result = []
+        for response in await asyncio.gather(
+            *[fetch(chunk) for chunk in create_chunks(campaigns, 20)]
+        ):
+            if not isinstance(response, list):
+                continue
+            for r in response:
+                drop_campaign = (
+                    (r.get("data") or {}).get("user", {}).get("dropCampaign")
+                )
+                if drop_campaign is not None:
+                    result.append(drop_campaign)
+        return result
+
+    async def claim_drop(self, drop):
+        logger.info(
+            f"Claim {drop}", extra={"emoji": ":package:", "event": Events.DROP_CLAIM}
+        )
+
+        json_data = GQLTemplates.DropsPage_ClaimDropRewards.build(
+            {"input": {"dropInstanceID": drop.drop_instance_id}}
+        )
+        response = await self.post_gql_request(json_data)
+        try:
+            claim = response["data"].get("claimDropRewards")
+            return claim is not None and claim["status"] in [
+                "ELIGIBLE_FOR_ALL",
+                "DROP_INSTANCE_ALREADY_CLAIMED",
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False
+
+    async def claim_all_drops_from_inventory(self):
+        inventory = await self.get_inventory()
+        for campaign in (inventory or {}).get("dropCampaignsInProgress") or []:
+            for drop_dict in campaign["timeBasedDrops"]:
+                drop = Drop(drop_dict)
+                drop.update(drop_dict["self"])
+                if drop.is_claimable is True:
+                    drop.is_claimed = await self.claim_drop(drop)
+
+    async def __sync_campaigns(self, campaigns):
+        inventory = await self.get_inventory()
+        in_progress = (inventory or {}).get("dropCampaignsInProgress") or []
+        for campaign in campaigns:
+            campaign.clear_drops()
+            for progress in in_progress:
+                if progress["id"] != campaign.id:
+                    continue
+                campaign.in_inventory = True
+                # Équivalent de Campaign.sync_drops avec un callback asynchrone
+                for drop_dict in progress["timeBasedDrops"]:
+                    for drop in campaign.drops:
+                        if drop.id == drop_dict["id"]:
+                            drop.update(drop_dict["self"])
+                            if drop.is_claimable is True:
+                                drop.is_claimed = await self.claim_drop(drop)
+                            break
+                campaign.clear_drops()
+                break
+        return campaigns
+
+    async def sync_campaigns(self, streamers, chunk_size=3):
+        """Version coroutine de Twitch.sync_campaigns."""
+        campaigns_update = 0
+        campaigns = []
+        while self.running:
+            try:
+                if (
+                    campaigns_update == 0
+                    or ((time.time() - campaigns_update) / 30) > 30
+                ):
+                    campaigns_update = time.time()
+                    await self.claim_all_drops_from_inventory()
+                    campaigns = self.twitch._build_campaigns(
+                        await self.get_campaigns_details(
+                            await self.get_drops_dashboard(status="ACTIVE")
+                        )
+                    )
+
+                campaigns = await self.__sync_campaigns(campaigns)
+                self.twitch._assign_campaigns(streamers, campaigns)
+            except (
+                ValueError,
+                KeyError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as e:
+                logger.error(f"Error while syncing inventory: {e}")
+                campaigns = []
+
+            await self.__chuncked_sleep(60, chunk_size=chunk_size)
@@ -0,0 +1,169 @@
+"""
+BackgroundRefreshCache - Valeur globale avec TTL, rafraîchie en tâche de fond
+Le chemin critique lit toujours la valeur en mémoire, sans jamais attendre le réseau
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefreshCache(object):
+    """Cache d'une valeur unique, persistée sur disque et rafraîchie par un thread."""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Optional[Any]],
+        ttl: float,
+        default: Any = None,
+        cache_file: Optional[str] = None,
+    ):
+        """
+        Args:
+            name: Nom utilisé dans les logs et les stats
+            loader: Fonction (bloquante) qui récupère la valeur, None si échec
+            ttl: Durée de validité de la valeur en secondes
+            default: Valeur retournée tant qu'aucun chargement n'a réussi
+            cache_file: Fichier JSON de persistance entre redémarrages (optionnel)
+        """
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.cache_file = cache_file
+
+        self.value = default
+        self.updated_at = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.last_refresh_latency = 0.0
+        self.total_refresh_latency = 0.0
+
+        self.__lock = threading.Lock()
+        self.__refreshing = False
+        self.__stop = threading.Event()
+        self.__thread = None
+
+        self.__load()
+
+    def is_fresh(self) -> bool:
+        return self.updated_at != 0 and (time.time() - self.updated_at) < self.ttl
+
+    def get(self) -> Any:
+        """Retourne la valeur courante (jamais bloquant), lance un refresh si expirée."""
+        if self.is_fresh():
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.refresh_async()
+        return self.value
+
+    def set(self, value: Any) -> None:
+        """Enregistre une valeur obtenue hors du loader (ex. découverte de secours)."""
+        if value is None:
+            return
+        self.value = value
+        self.updated_at = time.time()
+        self.__save()
+
+    def refresh(self) -> Any:
+        """Recharge la valeur de manière synchrone."""
+        start = time.time()
+        try:
+            value = self.loader()
+        except Exception as e:
+            logger.debug(f"{self.name}: erreur de chargement ({type(e).__name__}: {e})")
+            value = None
+
+        elapsed = time.time() - start
+        self.refreshes += 1
+        self.last_refresh_latency = elapsed
+        self.total_refresh_latency += elapsed
+
+        if value is None:
+            self.refresh_failures += 1
+        else:
+            self.value = value
+            self.updated_at = time.time()
+            self.__save()
+            logger.debug(f"{self.name} mis à jour en {elapsed:.2f}s: {value}")
+        return self.value
+
+    def refresh_async(self):
+        with self.__lock:
+            if self.__refreshing is True:
+                return
+            self.__refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self.__refreshing = False
+
+        thread = threading.Thread(target=run, daemon=True, name=f"Refresh {self.name}")
+        thread.start()
+
+    def start(self, interval: Optional[float] = None):
+        """Démarre un rafraîchissement périodique en tâche de fond."""
+        if self.__thread is not None:
+            return
+        interval = self.ttl / 2 if interval is None else interval
+
+        def run():
+            while not self.__stop.is_set():
+                if not self.is_fresh() or (time.time() - self.updated_at) >= interval:
+                    self.refresh()
+                self.__stop.wait(interval)
+
+        self.__thread = threading.Thread(target=run, daemon=True, name=f"Refresh {self.name}")
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "value": self.value,
+            "age": None if self.updated_at == 0 else round(time.time() - self.updated_at, 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "last_refresh_latency": round(self.last_refresh_latency, 4),
+            "avg_refresh_latency": round(
+                self.total_refresh_latency / self.refreshes, 4
+            ) if self.refreshes > 0 else 0.0,
+        }
+
+    def __load(self):
+        if self.cache_file is None or not os.path.isfile(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("value") is not None:
+                self.value = data["value"]
+                self.updated_at = data.get("updated_at", 0)
+        except Exception as e:
+            logger.debug(f"{self.name}: cache illisible ({e}), ignoré")
+
+    def __save(self):
+        if self.cache_file is None:
+            return
+        temp_file = self.cache_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"value": self.value, "updated_at": self.updated_at}, f)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            logger.debug(f"{self.name}: impossible de sauvegarder le cache ({e})")
@@ -0,0 +1,339 @@
+"""
+Cassette - Enregistrement / rejeu du trafic Twitch (GQL, Helix, usher, spade, PubSub)
+Un fichier JSON Lines compressé (gzip) : une ligne par échange HTTP ou par
+message PubSub reçu. En rejeu, aucune requête ne sort sur le réseau.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from enum import Enum, auto
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# En-têtes de réponse conservés (les autres ne servent pas au miner)
+RECORDED_HEADERS = (
+    "Content-Type",
+    "Ratelimit-Limit",
+    "Ratelimit-Remaining",
+    "Ratelimit-Reset",
+    "Retry-After",
+)
+
+
+class CassetteMode(Enum):
+    RECORD = auto()
+    REPLAY = auto()
+
+    def __str__(self):
+        return self.name
+
+
+def request_body(kwargs: dict) -> bytes:
+    """Corps envoyé pour des kwargs requests/aiohttp (data= ou json=)."""
+    data = kwargs.get("data")
+    if data is None and kwargs.get("json") is not None:
+        data = json.dumps(kwargs["json"])
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return data if isinstance(data, bytes) else b""
+
+
+def body_digest(body) -> str:
+    """Empreinte du corps ; les corps JSON sont normalisés (ordre des clés, espaces)."""
+    if not isinstance(body, (bytes, str)):
+        body = json.dumps(body, separators=(",", ":"), sort_keys=True)
+    else:
+        try:
+            body = json.dumps(json.loads(body), separators=(",", ":"), sort_keys=True)
+        except ValueError:
+            pass
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha1(body).hexdigest()
+
+
+def _json_list(data) -> Optional[list]:
+    try:
+        data = json.loads(data)
+    except (TypeError, ValueError):
+        return None
+    return data if isinstance(data, list) else None
+
+
+def full_url(url: str, params=None) -> str:
+    if not params:
+        return url
+    prepared = PreparedRequest()
+    prepared.prepare_url(url, params)
+    return prepared.url
+
+
+class Cassette(object):
+    """
+    Enregistre ou rejoue les échanges. En rejeu, une requête est associée à
+    l'enregistrement de même méthode + URL + corps ; à défaut (corps avec un
+    transactionID aléatoire...) à la même route + opération. Quand une route est
+    épuisée, sa dernière réponse est resservie pour que les boucles continuent.
+    Les lots GQL sont enregistrés opération par opération : le rejeu ne dépend
+    pas de la façon dont GQLBatcher a regroupé les requêtes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: CassetteMode = CassetteMode.RECORD,
+        simulate_latency: bool = False,
+        speed: float = 1.0,
+    ):
+        """
+        Args:
+            path: Fichier de la cassette (.jsonl.gz)
+            mode: CassetteMode.RECORD ou CassetteMode.REPLAY
+            simulate_latency: En rejeu, attendre la latence enregistrée de chaque requête
+            speed: En rejeu, accélération des messages PubSub (0 = sans attente)
+        """
+        self.path = path
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.speed = speed
+        self.started_at = time.time()
+
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+        self.__lock = threading.Lock()
+        self.__file = None
+        self.__exact = defaultdict(deque)
+        self.__routes = defaultdict(deque)
+        self.__last = {}
+        self.__pubsub = []
+
+        if mode == CassetteMode.RECORD:
+            self.__file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            self.__load()
+
+    @property
+    def is_recording(self) -> bool:
+        return self.mode == CassetteMode.RECORD
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == CassetteMode.REPLAY
+
+    @staticmethod
+    def __route_key(method: str, url: str, operation: Optional[str]) -> tuple:
+        parts = urlsplit(url)
+        return (method.upper(), f"{parts.hostname}{parts.path}", operation)
+
+    # === RECORD === #
+    def __write(self, entry: dict):
+        entry["t"] = round(time.time() - self.started_at, 3)
+        line = json.dumps(entry, separators=(",", ":"))
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.write(line + "\n")
+                self.recorded += 1
+
+    def record_http(
+        self,
+        method: str,
+        url: str,
+        body: bytes,
+        operation: Optional[str],
+        status: int,
+        headers,
+        content: bytes,
+        elapsed: float,
+    ):
+        entry = {
+            "kind": "http",
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {
+                name: headers[name] for name in RECORDED_HEADERS if name in headers
+            },
+            "ms": round(elapsed * 1000, 1),
+        }
+
+        operations, responses = _json_list(body), _json_list(content)
+        if (
+            operations is not None
+            and responses is not None
+            and len(operations) == len(responses)
+        ):
+            for operation_data, response_data in zip(operations, responses):
+                self.__write(
+                    dict(
+                        entry,
+                        op=f"gql:{operation_data.get('operationName')}",
+                        sha1=body_digest(operation_data),
+                        text=json.dumps(response_data, separators=(",", ":")),
+                    )
+                )
+            return
+
+        entry["op"] = operation
+        entry["sha1"] = body_digest(body)
+        try:
+            entry["text"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["b64"] = base64.b64encode(content).decode("ascii")
+        self.__write(entry)
+
+    def record_pubsub(self, index: int, message: str):
+        self.__write({"kind": "pubsub", "ws": index, "message": message})
+
+    # === REPLAY === #
+    def __load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["kind"] == "pubsub":
+                    self.__pubsub.append(entry)
+                    continue
+                entry["used"] = False
+                self.__exact[(entry["method"], entry["url"], entry["sha1"])].append(
+                    entry
+                )
+                self.__routes[
+                    self.__route_key(entry["method"], entry["url"], entry["op"])
+                ].append(entry)
+        logger.info(
+            f"Cassette {self.path} : {sum(len(q) for q in self.__exact.values())} "
+            f"échanges HTTP, {len(self.__pubsub)} messages PubSub"
+        )
+
+    @staticmethod
+    def __pop(entries: deque) -> Optional[dict]:
+        while entries:
+            entry = entries.popleft()
+            if entry["used"] is False:
+                entry["used"] = True
+                return entry
+        return None
+
+    def __lookup_one(
+        self, method: str, url: str, digest: str, operation: Optional[str]
+    ):
+        route = self.__route_key(method, url, operation)
+        with self.__lock:
+            entry = self.__pop(self.__exact[(method.upper(), url, digest)])
+            if entry is None:
+                entry = self.__pop(self.__routes[route])
+            if entry is None:
+                entry = self.__last.get(route)
+            if entry is None:
+                self.misses += 1
+                logger.debug(
+                    f"Cassette : aucun enregistrement pour {method} {url} ({operation})"
+                )
+                return None
+            self.__last[route] = entry
+            self.replayed += 1
+        return entry
+
+    def lookup(
+        self,
+        method: str,
+        url: str,
+        body: bytes,
+        operation: Optional[str],
+        wait: bool = True,
+    ) -> Optional[dict]:
+        """
+        Enregistrement correspondant à la requête (None si introuvable).
+
+        Args:
+            wait: Respecter simulate_latency ici (False pour les appelants asyncio)
+        """
+        operations = _json_list(body)
+        if operations is None:
+            entry = self.__lookup_one(method, url, body_digest(body), operation)
+        else:
+            # Lot GQL : une réponse par opération, {} si elle n'a pas été enregistrée
+            entries = [
+                self.__lookup_one(
+                    method,
+                    url,
+                    body_digest(operation_data),
+                    f"gql:{operation_data.get('operationName')}",
+                )
+                for operation_data in operations
+            ]
+            found = [entry for entry in entries if entry is not None]
+            entry = (
+                None
+                if found == []
+                else {
+                    "status": 200,
+                    "headers": {"Content-Type": "application/json"},
+                    "ms": max(entry["ms"] for entry in found),
+                    "text": json.dumps(
+                        [
+                            {} if entry is None else json.loads(self.content(entry))
+                            for entry in entries
+                        ],
+                        separators=(",", ":"),
+                    ),
+                }
+            )
+
+        if entry is not None and wait is True and self.simulate_latency is True:
+            time.sleep(entry["ms"] / 1000)
+        return entry
+
+    @staticmethod
+    def content(entry: Optional[dict]) -> bytes:
+        if entry is None:
+            return b""
+        if "b64" in entry:
+            return base64.b64decode(entry["b64"])
+        return entry["text"].encode("utf-8")
+
+    def replay(
+        self, method: str, url: str, body: bytes, operation: Optional[str]
+    ) -> requests.Response:
+        """Réponse requests reconstruite depuis la cassette (404 vide si introuvable)."""
+        entry = self.lookup(method, url, body, operation)
+        response = requests.Response()
+        response.status_code = 404 if entry is None else entry["status"]
+        response.headers = CaseInsensitiveDict(
+            {} if entry is None else entry["headers"]
+        )
+        response._content = self.content(entry)
+        response.encoding = "utf-8"
+        response.url = url
+        response.request = requests.Request(method, url, data=body).prepare()
+        return response
+
+    def pubsub_messages(self) -> List[Dict]:
+        return self.__pubsub
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "mode": str(self.mode),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
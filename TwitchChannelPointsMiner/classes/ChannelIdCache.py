@@ -0,0 +1,169 @@
+"""
+ChannelIdCache - Correspondance username -> channel ID persistée sur disque
+Les channel IDs ne changent pas : seuls les noms inconnus sont résolus via
+Helix, les entrées anciennes sont revalidées en tâche de fond.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelIdCache(object):
+    """Cache username -> channel ID, thread-safe, persisté dans un fichier JSON compact."""
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        ttl: float = 90 * 24 * 3600,
+        revalidate_after: float = 7 * 24 * 3600,
+    ):
+        """
+        Args:
+            cache_file: Fichier JSON de persistance entre redémarrages (optionnel)
+            ttl: Au-delà, une entrée est ignorée et le nom résolu à nouveau
+            revalidate_after: Au-delà, une entrée reste servie mais est revalidée
+                en tâche de fond (changement de login, compte supprimé...)
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.revalidate_after = revalidate_after
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        # username -> (channel_id, resolved_at)
+        self.__entries: Dict[str, Tuple[str, float]] = {}
+        self.__stale = set()
+        self.__lock = threading.Lock()
+        self.__save_lock = threading.Lock()
+        self.__revalidating = False
+
+        self.__load()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, username: str) -> Optional[str]:
+        known, _ = self.lookup([username])
+        return known.get(username.lower())
+
+    def lookup(self, usernames: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Returns:
+            tuple: ({username: channel_id} connus, [usernames à résoudre])
+        """
+        known, unknown = {}, []
+        now = time.time()
+        with self.__lock:
+            for username in usernames:
+                username = username.lower()
+                entry = self.__entries.get(username)
+                if entry is None or now - entry[1] > self.ttl:
+                    unknown.append(username)
+                    continue
+                known[username] = entry[0]
+                if now - entry[1] > self.revalidate_after:
+                    self.__stale.add(username)
+            self.hits += len(known)
+            self.misses += len(unknown)
+        return known, unknown
+
+    def update(self, mapping: Dict[str, str]) -> None:
+        if not mapping:
+            return
+        now = time.time()
+        with self.__lock:
+            for username, channel_id in mapping.items():
+                self.__entries[username.lower()] = (str(channel_id), now)
+        self.__save()
+
+    def forget(self, usernames: List[str]) -> None:
+        with self.__lock:
+            for username in usernames:
+                if self.__entries.pop(username.lower(), None) is not None:
+                    self.evictions += 1
+        self.__save()
+
+    def revalidate_async(self, resolver: Callable[[List[str]], Dict[str, str]]) -> None:
+        """
+        Résout à nouveau les entrées anciennes dans un thread. Un nom qui ne se
+        résout plus (login changé, compte supprimé) est retiré du cache.
+        """
+        with self.__lock:
+            if self.__revalidating is True or not self.__stale:
+                return
+            self.__revalidating = True
+            stale, self.__stale = sorted(self.__stale), set()
+
+        def run():
+            try:
+                resolved = resolver(stale)
+                if resolved is None:
+                    return
+                self.revalidations += len(stale)
+                self.update(resolved)
+                gone = [username for username in stale if username not in resolved]
+                if gone:
+                    logger.debug(
+                        f"Channel IDs: {len(gone)} login(s) introuvable(s), retirés du cache"
+                    )
+                    self.forget(gone)
+            except Exception as e:
+                logger.debug(
+                    f"Channel IDs: revalidation échouée ({type(e).__name__}: {e})"
+                )
+            finally:
+                self.__revalidating = False
+
+        thread = threading.Thread(
+            target=run, daemon=True, name="Revalidate channel IDs"
+        )
+        thread.start()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.__entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+
+    def __load(self):
+        if self.cache_file is None or not os.path.isfile(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Format compact : {"username": ["channel_id", resolved_at]}
+            self.__entries = {
+                username: (str(entry[0]), float(entry[1]))
+                for username, entry in data.items()
+            }
+        except Exception as e:
+            logger.debug(f"Channel IDs: cache illisible ({e}), ignoré")
+
+    def __save(self):
+        if self.cache_file is None:
+            return
+        temp_file = self.cache_file + ".tmp"
+        try:
+            with self.__lock:
+                data = {
+                    username: [channel_id, int(resolved_at)]
+                    for username, (channel_id, resolved_at) in self.__entries.items()
+                }
+            with self.__save_lock:
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            logger.debug(f"Channel IDs: impossible de sauvegarder le cache ({e})")
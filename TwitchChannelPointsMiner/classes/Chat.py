@@ -1,12 +1,6 @@
 import logging
-import time
 from enum import Enum, auto
-from threading import Thread
-
-from irc.bot import SingleServerIRCBot
-
-from TwitchChannelPointsMiner.constants import IRC, IRC_PORT
-from TwitchChannelPointsMiner.classes.Settings import Events, Settings
+from threading import Lock, Thread
 
 logger = logging.getLogger(__name__)
 
@@ -21,85 +15,50 @@ class ChatPresence(Enum):
         return self.name
 
 
-class ClientIRC(SingleServerIRCBot):
-    def __init__(self, username, token, channel):
-        self.token = token
-        self.channel = "#" + channel
-        self.__active = False
-
-        super(ClientIRC, self).__init__(
-            [(IRC, IRC_PORT, f"oauth:{token}")], username, username
-        )
-
-    def on_welcome(self, client, event):
-        client.join(self.channel)
-
-    def start(self):
-        self.__active = True
-        self._connect()
-        while self.__active:
-            try:
-                self.reactor.process_once(timeout=0.2)
-                time.sleep(0.01)
-            except Exception as e:
-                logger.error(
-                    f"Exception raised: {e}. Thread is active: {self.__active}"
-                )
-
-    def die(self, msg="Bye, cruel world!"):
-        self.connection.disconnect(msg)
-        self.__active = False
-
+class ThreadChat(Thread):
     """
-    def on_join(self, connection, event):
-        logger.info(f"Event: {event}", extra={"emoji": ":speech_balloon:"})
+    Présence dans les chats IRC, tous canaux confondus, sur une seule connexion.
+    Le client IRC (et le thread) n'est créé qu'au premier join().
     """
 
-    # """
-    def on_pubmsg(self, connection, event):
-        msg = event.arguments[0]
-        mention = None
-
-        if Settings.disable_at_in_nickname is True:
-            mention = f"{self._nickname.lower()}"
-        else:
-            mention = f"@{self._nickname.lower()}"
-
-        # also self._realname
-        # if msg.startswith(f"@{self._nickname}"):
-        if mention != None and mention in msg.lower():
-            # nickname!username@nickname.tmi.twitch.tv
-            nick = event.source.split("!", 1)[0]
-            # chan = event.target
-
-            logger.info(f"{nick} at {self.channel} wrote: {msg}", extra={
-                        "emoji": ":speech_balloon:", "event": Events.CHAT_MENTION})
-    # """
-
-
-class ThreadChat(Thread):
     def __deepcopy__(self, memo):
         return None
 
-    def __init__(self, username, token, channel):
+    def __init__(self, username, token):
         super(ThreadChat, self).__init__()
 
         self.username = username
         self.token = token
-        self.channel = channel
 
         self.chat_irc = None
+        self.stopped = False
+        self.__lock = Lock()
 
     def run(self):
-        self.chat_irc = ClientIRC(self.username, self.token, self.channel)
-        logger.info(
-            f"Join IRC Chat: {self.channel}", extra={"emoji": ":speech_balloon:"}
-        )
         self.chat_irc.start()
 
-    def stop(self):
+    def join_chat(self, channel):
+        with self.__lock:
+            if self.stopped is True:
+                return
+            if self.chat_irc is None:
+                # irc n'est importé qu'au premier chat rejoint
+                from TwitchChannelPointsMiner.classes.ClientIRC import ClientIRC
+
+                self.chat_irc = ClientIRC(self.username, self.token)
+                self.start()
+        logger.info(f"Join IRC Chat: {channel}", extra={"emoji": ":speech_balloon:"})
+        self.chat_irc.join(channel)
+
+    def leave_chat(self, channel):
         if self.chat_irc is not None:
             logger.info(
-                f"Leave IRC Chat: {self.channel}", extra={"emoji": ":speech_balloon:"}
+                f"Leave IRC Chat: {channel}", extra={"emoji": ":speech_balloon:"}
             )
+            self.chat_irc.part(channel)
+
+    def stop(self):
+        with self.__lock:
+            self.stopped = True
+        if self.chat_irc is not None:
             self.chat_irc.die()
@@ -0,0 +1,149 @@
+import logging
+import threading
+
+from irc.bot import SingleServerIRCBot
+
+from TwitchChannelPointsMiner.classes.RateLimiter import TokenBucket
+from TwitchChannelPointsMiner.classes.Settings import Events, Settings
+from TwitchChannelPointsMiner.constants import IRC, IRC_PORT
+
+logger = logging.getLogger(__name__)
+
+# Twitch : 20 JOIN par fenêtre de 10 secondes pour un compte standard
+IRC_JOIN_RATE = 2
+IRC_JOIN_BURST = 20
+# Une ligne IRC fait au plus 512 octets (CRLF compris)
+IRC_MAX_LINE = 500
+
+
+class ClientIRC(SingleServerIRCBot):
+    """
+    Une seule connexion IRC pour tous les chats : join()/part() ne font que
+    mettre à jour la liste des canaux voulus, la boucle envoie les JOIN/PART
+    par lots au rythme autorisé par Twitch.
+    """
+
+    def __init__(self, username, token):
+        self.token = token
+        # die() peut précéder start() : le client ne se connecte alors pas
+        self.__active = True
+        self.__welcomed = False
+
+        self.__lock = threading.Lock()
+        self.__wanted = set()
+        self.__pending_join = []
+        self.__pending_part = []
+        self.__join_bucket = TokenBucket("IRC JOIN", IRC_JOIN_RATE, IRC_JOIN_BURST)
+
+        super(ClientIRC, self).__init__(
+            [(IRC, IRC_PORT, f"oauth:{token}")], username, username
+        )
+
+    def join(self, channel):
+        channel = "#" + channel
+        with self.__lock:
+            if channel in self.__wanted:
+                return
+            self.__wanted.add(channel)
+            if channel in self.__pending_part:
+                self.__pending_part.remove(channel)
+            else:
+                self.__pending_join.append(channel)
+
+    def part(self, channel):
+        channel = "#" + channel
+        with self.__lock:
+            if channel not in self.__wanted:
+                return
+            self.__wanted.discard(channel)
+            if channel in self.__pending_join:
+                self.__pending_join.remove(channel)
+            else:
+                self.__pending_part.append(channel)
+
+    @property
+    def channels_count(self):
+        return len(self.__wanted)
+
+    def on_welcome(self, client, event):
+        # (Re)connexion : tous les canaux voulus sont à rejoindre
+        with self.__lock:
+            self.__pending_join = sorted(self.__wanted)
+            self.__pending_part = []
+        self.__welcomed = True
+
+    def on_disconnect(self, client, event):
+        self.__welcomed = False
+
+    def start(self):
+        if self.__active is False:
+            return
+        self._connect()
+        while self.__active:
+            try:
+                # select() bloquant : réveil sur trafic IRC ou au plus une fois par seconde
+                self.reactor.process_once(timeout=1)
+                self.__flush()
+            except Exception as e:
+                logger.error(
+                    f"Exception raised: {e}. Thread is active: {self.__active}"
+                )
+
+    def die(self, msg="Bye, cruel world!"):
+        self.__active = False
+        self.connection.disconnect(msg)
+
+    def __flush(self):
+        if self.__welcomed is False or not self.connection.is_connected():
+            return
+        with self.__lock:
+            parts, self.__pending_part = self.__pending_part, []
+            joins = []
+            while self.__pending_join and self.__join_bucket.try_acquire():
+                joins.append(self.__pending_join.pop(0))
+
+        for batch in self.__batches(parts):
+            self.connection.part(batch)
+        for batch in self.__batches(joins):
+            self.connection.join(",".join(batch))
+
+    @staticmethod
+    def __batches(channels):
+        batch, length = [], 0
+        for channel in channels:
+            if batch and length + len(channel) + 1 > IRC_MAX_LINE:
+                yield batch
+                batch, length = [], 0
+            batch.append(channel)
+            length += len(channel) + 1
+        if batch:
+            yield batch
+
+    """
+    def on_join(self, connection, event):
+        logger.info(f"Event: {event}", extra={"emoji": ":speech_balloon:"})
+    """
+
+    # """
+    def on_pubmsg(self, connection, event):
+        msg = event.arguments[0]
+        mention = None
+
+        if Settings.disable_at_in_nickname is True:
+            mention = f"{self._nickname.lower()}"
+        else:
+            mention = f"@{self._nickname.lower()}"
+
+        # also self._realname
+        # if msg.startswith(f"@{self._nickname}"):
+        if mention is not None and mention in msg.lower():
+            # nickname!username@nickname.tmi.twitch.tv
+            nick = event.source.split("!", 1)[0]
+            chan = event.target
+
+            logger.info(
+                f"{nick} at {chan} wrote: {msg}",
+                extra={"emoji": ":speech_balloon:", "event": Events.CHAT_MENTION},
+            )
+
+    # """
@@ -0,0 +1,104 @@
+"""
+GQLBatcher - Regroupe automatiquement les opérations GQL en une seule requête
+gql.twitch.tv accepte un tableau d'opérations par POST (cf. __get_campaigns_details)
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class GQLBatcher(object):
+    """
+    Collecte les opérations soumises pendant une courte fenêtre (ou jusqu'à N
+    opérations), les envoie dans un seul POST et rend à chaque appelant sa
+    part de la réponse via un Future.
+    """
+
+    def __init__(
+        self,
+        post: Callable,
+        max_batch_size: int = 20,
+        window: float = 0.05,
+        max_in_flight: int = 4,
+    ):
+        """
+        Args:
+            post: Fonction qui envoie un dict (opération seule) ou une liste d'opérations
+            max_batch_size: Nombre maximum d'opérations par POST
+            window: Temps d'attente maximum (secondes) pour compléter un lot
+            max_in_flight: Nombre de lots envoyés en parallèle
+        """
+        self.post = post
+        self.max_batch_size = max_batch_size
+        self.window = window
+
+        self.batches_sent = 0
+        self.operations_sent = 0
+
+        self.__queue = queue.Queue()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="GQL batch"
+        )
+        self.__lock = threading.Lock()
+        self.__thread = None
+
+    def submit(self, json_data: dict) -> Future:
+        future = Future()
+        self.__ensure_started()
+        self.__queue.put((json_data, future))
+        return future
+
+    def request(self, json_data: dict) -> dict:
+        """Soumet une opération et attend sa réponse (même format que post_gql_request)."""
+        return self.submit(json_data).result()
+
+    def __ensure_started(self):
+        if self.__thread is not None:
+            return
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__collect, daemon=True, name="GQL batcher"
+                )
+                self.__thread.start()
+
+    def __collect(self):
+        while True:
+            batch = [self.__queue.get()]
+            deadline = time.time() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.__queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.__executor.submit(self.__dispatch, batch)
+
+    def __dispatch(self, batch: List[tuple]):
+        try:
+            if len(batch) == 1:
+                responses = [self.post(batch[0][0])]
+            else:
+                responses = self.post([json_data for json_data, _ in batch])
+                if not isinstance(responses, list) or len(responses) != len(batch):
+                    logger.debug(
+                        f"Unexpected batched GQL response format for {len(batch)} operations"
+                    )
+                    responses = [{}] * len(batch)
+
+            self.batches_sent += 1
+            self.operations_sent += len(batch)
+            for (_, future), response in zip(batch, responses):
+                future.set_result(response if response is not None else {})
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
@@ -0,0 +1,111 @@
+"""
+GQLTemplate - Opérations GQL persistées pré-encodées
+operationName + extensions sont sérialisés une seule fois en bytes : par appel,
+seules les variables passent par json.dumps (plus de copy.deepcopy).
+"""
+
+import json
+from typing import Optional
+
+from TwitchChannelPointsMiner.constants import GQLOperations
+
+_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=True).encode
+_dumps_sorted = json.JSONEncoder(separators=(",", ":"), sort_keys=True).encode
+
+
+class GQLRequest(object):
+    """Une opération prête à envoyer : le template partagé + ses variables."""
+
+    __slots__ = ["template", "variables"]
+
+    def __init__(self, template, variables: Optional[dict]):
+        self.template = template
+        self.variables = variables
+
+    @property
+    def operation_name(self) -> str:
+        return self.template.operation_name
+
+    @property
+    def cache_key(self) -> tuple:
+        """Clé stable (operationName, variables triées) pour ResponseCache."""
+        return (self.template.operation_name, _dumps_sorted(self.variables))
+
+    def encode(self) -> bytes:
+        if self.variables is None:
+            return self.template.encoded
+        return self.template.prefix + _dumps(self.variables).encode() + b"}"
+
+    def to_dict(self) -> dict:
+        data = {
+            "operationName": self.template.operation_name,
+            "extensions": self.template.extensions,
+        }
+        if self.variables is not None:
+            data["variables"] = self.variables
+        return data
+
+    def __repr__(self):
+        return f"GQLRequest(operationName={self.operation_name}, variables={self.variables})"
+
+
+class GQLTemplate(object):
+    """Une opération persistée de GQLOperations, encodée une seule fois."""
+
+    __slots__ = [
+        "operation_name",
+        "extensions",
+        "default_variables",
+        "prefix",
+        "encoded",
+    ]
+
+    def __init__(self, operation: dict):
+        self.operation_name = operation["operationName"]
+        self.extensions = operation["extensions"]
+        self.default_variables = operation.get("variables")
+
+        head = _dumps(
+            {"operationName": self.operation_name, "extensions": self.extensions}
+        )
+        # '{"operationName":...,"extensions":{...},"variables":' + variables + '}'
+        self.prefix = (head[:-1] + ',"variables":').encode()
+        self.encoded = (
+            head.encode()
+            if self.default_variables is None
+            else self.prefix + _dumps(self.default_variables).encode() + b"}"
+        )
+
+    def build(self, variables: Optional[dict] = None) -> GQLRequest:
+        return GQLRequest(
+            self, self.default_variables if variables is None else variables
+        )
+
+    def __repr__(self):
+        return f"GQLTemplate(operationName={self.operation_name})"
+
+
+class GQLTemplates:
+    """Même noms que GQLOperations, mais en templates pré-encodés."""
+
+
+for _name, _operation in vars(GQLOperations).items():
+    if isinstance(_operation, dict) and "operationName" in _operation:
+        setattr(GQLTemplates, _name, GQLTemplate(_operation))
+
+
+def encode_gql(json_data) -> bytes:
+    """Corps du POST GQL pour une opération ou une liste (dict ou GQLRequest)."""
+    if isinstance(json_data, GQLRequest):
+        return json_data.encode()
+    if isinstance(json_data, list):
+        return b"[" + b",".join(encode_gql(item) for item in json_data) + b"]"
+    return _dumps(json_data).encode()
+
+
+def gql_operation_name(json_data) -> str:
+    if isinstance(json_data, GQLRequest):
+        return json_data.operation_name
+    if isinstance(json_data, list):
+        return ", ".join(sorted({gql_operation_name(item) for item in json_data}))
+    return json_data["operationName"]
@@ -0,0 +1,89 @@
+"""
+PlaybackSession - Chaîne PlaybackAccessToken -> usher -> playlist media en cache
+Le jeton et l'URL de la playlist media restent valides plusieurs minutes : à
+chaque minute regardée, seuls la playlist media (qui avance avec le direct), le
+HEAD du segment et le POST spade sont refaits. La chaîne est reconstruite à
+l'expiration du jeton ou sur erreur.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def token_expires_at(value: str, default_ttl: float = 300) -> float:
+    """Lit "expires" (epoch) dans la valeur JSON du PlaybackAccessToken."""
+    try:
+        expires = json.loads(value).get("expires")
+        if expires:
+            return float(expires)
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return time.time() + default_ttl
+
+
+class PlaybackSession(object):
+    __slots__ = ["media_playlist_url", "expires_at", "uses"]
+
+    def __init__(self, media_playlist_url: str, expires_at: float):
+        self.media_playlist_url = media_playlist_url
+        self.expires_at = expires_at
+        self.uses = 0
+
+    def is_valid(self, margin: float = 60) -> bool:
+        return time.time() < self.expires_at - margin
+
+
+class PlaybackSessionCache(object):
+    """username -> PlaybackSession, thread-safe."""
+
+    def __init__(self, margin: float = 60):
+        """
+        Args:
+            margin: Le jeton est renouvelé ce nombre de secondes avant son expiration
+        """
+        self.margin = margin
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self.__sessions: Dict[str, PlaybackSession] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[PlaybackSession]:
+        with self.__lock:
+            session = self.__sessions.get(username)
+            if session is None or not session.is_valid(self.margin):
+                self.__sessions.pop(username, None)
+                self.misses += 1
+                return None
+            session.uses += 1
+            self.hits += 1
+            return session
+
+    def put(
+        self, username: str, media_playlist_url: str, token_value: str
+    ) -> PlaybackSession:
+        session = PlaybackSession(media_playlist_url, token_expires_at(token_value))
+        with self.__lock:
+            self.__sessions[username] = session
+        return session
+
+    def invalidate(self, username: str) -> None:
+        with self.__lock:
+            if self.__sessions.pop(username, None) is not None:
+                self.invalidations += 1
+                logger.debug(f"Playback session invalidated for {username}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self.__sessions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
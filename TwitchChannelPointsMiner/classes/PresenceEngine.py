@@ -0,0 +1,236 @@
+"""
+PresenceEngine - État en ligne / hors ligne des streamers, piloté par événements
+PubSub (stream-up / stream-down / viewcount) est le signal principal. Helix
+/streams n'est plus qu'une réconciliation basse fréquence sur les channel IDs
+déjà connus, qui n'agit que sur les streamers dont l'état diffère.
+"""
+
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from TwitchChannelPointsMiner.classes.Settings import Events
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceEngine(object):
+    """Point d'entrée unique des transitions online/offline (PubSub, Helix, infos périmées)."""
+
+    def __init__(
+        self,
+        twitch,
+        reconcile_interval: float = 300,
+        stale_after: float = 600,
+        off_schedule_every: int = 3,
+        dormant_every: int = 12,
+    ):
+        """
+        Args:
+            twitch: Instance Twitch (requêtes Helix / GQL)
+            reconcile_interval: Intervalle de la réconciliation Helix /streams
+            stale_after: Âge des infos d'un stream en ligne au-delà duquel on les recharge
+            off_schedule_every: Un streamer hors de ses créneaux habituels n'est
+                réconcilié qu'une passe sur `off_schedule_every`
+            dormant_every: Idem pour un streamer sans live depuis des semaines
+        """
+        self.twitch = twitch
+        self.reconcile_interval = reconcile_interval
+        self.stale_after = stale_after
+        self.off_schedule_every = off_schedule_every
+        self.dormant_every = dormant_every
+        # username -> prochaine réconciliation Helix
+        self.__next_check: Dict[str, float] = {}
+        # Un passage en ligne a échoué : réconciliation dès le prochain tick
+        self.__retry_pending = False
+        # Le démarrage vient de vérifier l'état de tous les streamers
+        self.reconciled_at = time.time()
+
+        self.events = 0
+        self.reconciliations = 0
+        self.went_online = 0
+        self.went_offline = 0
+        self.refreshes = 0
+        self.checked = 0
+        self.skipped = 0
+        self.retries = 0
+
+    # === SIGNAUX PUBSUB === #
+    def on_stream_up(self, streamer):
+        # stream-up arrive avant la mise à jour des API : confirmé au premier viewcount
+        self.events += 1
+        streamer.stream_up = time.time()
+        self.twitch.gql_cache.invalidate_streamer(streamer)
+
+    def on_stream_down(self, streamer):
+        self.events += 1
+        self.twitch.gql_cache.invalidate_streamer(streamer)
+        if streamer.is_online is True:
+            streamer.set_offline()
+
+    def on_viewcount(self, streamer):
+        if streamer.stream_up_elapsed():
+            self.twitch.check_streamer_online(streamer)
+
+    # === RÉCONCILIATION HELIX === #
+    def diff(
+        self, streamers: List, online_streams: Dict[str, dict]
+    ) -> Tuple[List, List]:
+        """
+        Returns:
+            tuple: (streamers passés en ligne, streamers passés hors ligne) selon Helix
+        """
+        went_online, went_offline = [], []
+        for streamer in streamers:
+            if not streamer.channel_id:
+                continue
+            online = streamer.username in online_streams
+            if online is True and streamer.is_online is False:
+                went_online.append(streamer)
+            elif online is False and streamer.is_online is True:
+                went_offline.append(streamer)
+
+        self.reconciliations += 1
+        self.reconciled_at = time.time()
+        self.went_online += len(went_online)
+        self.went_offline += len(went_offline)
+        for streamer in went_online:
+            logger.info(
+                f"🟢 {streamer.username} vient de passer EN LIGNE (détecté via API Helix)",
+                extra={"emoji": ":green_circle:", "event": Events.STREAMER_ONLINE},
+            )
+        for streamer in went_offline:
+            logger.info(
+                f"🔴 {streamer.username} vient de passer HORS LIGNE (détecté via API Helix)",
+                extra={"emoji": ":red_circle:", "event": Events.STREAMER_OFFLINE},
+            )
+        return went_online, went_offline
+
+    def reconcile_due(self) -> bool:
+        return (
+            self.__retry_pending is True
+            or time.time() - self.reconciled_at >= self.reconcile_interval
+        )
+
+    def retry(self, streamer) -> None:
+        """
+        En ligne selon Helix mais la mise à jour du stream a échoué : le streamer
+        est revérifié au prochain tick au lieu d'attendre son échéance apprise.
+        """
+        self.reschedule([streamer])
+        self.__retry_pending = True
+        self.retries += 1
+
+    def reschedule(self, streamers: List) -> None:
+        """Annule l'échéance apprise : revérifiés à la prochaine réconciliation."""
+        for streamer in streamers:
+            self.__next_check.pop(streamer.username, None)
+
+    def targets(self, streamers: List) -> List:
+        """
+        Streamers à réconcilier à cette passe : ceux en ligne (détecter la fin
+        du live) et ceux dont l'échéance, fixée d'après leurs horaires appris,
+        est atteinte. Les autres restent couverts par PubSub.
+        """
+        now = time.time()
+        schedule = self.twitch.schedule
+        self.__retry_pending = False
+        targets = []
+        for streamer in streamers:
+            if not streamer.channel_id:
+                continue
+            if (
+                streamer.is_online is False
+                and self.__next_check.get(streamer.username, 0) > now
+            ):
+                self.skipped += 1
+                continue
+            if schedule.dormant(streamer.username, now):
+                every = self.dormant_every
+            elif schedule.likely_live(
+                streamer.username, now, horizon=self.reconcile_interval
+            ):
+                every = 1
+            else:
+                every = self.off_schedule_every
+            # Marge d'une seconde : l'échéance tombe sur la passe visée, pas la suivante
+            self.__next_check[streamer.username] = (
+                now + every * self.reconcile_interval - 1
+            )
+            targets.append(streamer)
+        self.checked += len(targets)
+        if not targets:
+            self.reconciled_at = now
+        return targets
+
+    def reconcile(self, streamers: List) -> None:
+        streamers = self.targets(list(streamers))
+        channel_ids = [streamer.channel_id for streamer in streamers]
+        if not channel_ids:
+            return
+        # strict : un lot en échec ne doit pas faire passer ses streamers hors ligne
+        online_streams = self.twitch.get_streams_by_ids(channel_ids, strict=True)
+        if online_streams is None:
+            logger.debug(
+                "⚠️ Réconciliation Helix échouée, nouvel essai au prochain cycle"
+            )
+            self.reschedule(streamers)
+            return
+
+        went_online, went_offline = self.diff(streamers, online_streams)
+        for streamer in went_offline:
+            streamer.set_offline()
+        for streamer in went_online:
+            try:
+                self.twitch.get_spade_url(streamer)
+                self.twitch.update_stream(streamer)
+                streamer.set_online()
+            except Exception as e:
+                logger.warning(f"⚠️ Erreur mise à jour stream {streamer.username}: {e}")
+                self.retry(streamer)
+
+    def stale(self) -> List:
+        """
+        Streamers en ligne dont les infos n'ont pas été rechargées depuis
+        stale_after. Hors de ses créneaux habituels, un live risque de se
+        terminer : ses infos sont rechargées deux fois plus souvent, en premier.
+        """
+        now = time.time()
+        schedule = self.twitch.schedule
+        stale = []
+        for streamer in self.twitch.watch_index.watchable():
+            on_schedule = schedule.likely_live(streamer.username, now)
+            stale_after = self.stale_after if on_schedule else self.stale_after / 2
+            if streamer.stream.update_elapsed() > stale_after:
+                stale.append((on_schedule, streamer))
+        return [streamer for _, streamer in sorted(stale, key=lambda item: item[0])]
+
+    def run(self, streamers, tick: float = 60, chunk_size: int = 3):
+        while self.twitch.running:
+            try:
+                for streamer in self.stale():
+                    # Why this user It's currently online but the last updated was more than 10minutes ago?
+                    # Please perform a manually update and check if the user it's online
+                    self.refreshes += 1
+                    self.twitch.check_streamer_online(streamer)
+                if self.reconcile_due():
+                    self.reconcile(streamers)
+            except Exception as e:
+                logger.error(f"❌ Erreur dans le moteur de présence: {e}", exc_info=True)
+
+            for _ in range(chunk_size):
+                time.sleep(tick / chunk_size)
+                if self.twitch.running is False:
+                    break
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "events": self.events,
+            "reconciliations": self.reconciliations,
+            "went_online": self.went_online,
+            "went_offline": self.went_offline,
+            "refreshes": self.refreshes,
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "retries": self.retries,
+        }
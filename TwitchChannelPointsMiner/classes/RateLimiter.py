@@ -0,0 +1,226 @@
+"""
+RateLimiter - Token bucket par famille d'endpoints (Helix, GQL, ...)
+Piloté par les en-têtes Ratelimit-* de Helix et par les 429, avec backoff
+exponentiel + jitter pour les 429/5xx.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from TwitchChannelPointsMiner.constants import HELIX_URL, GQLOperations
+
+logger = logging.getLogger(__name__)
+
+# Statuts pour lesquels on réessaie après un backoff
+RETRY_STATUS = frozenset([429, 500, 502, 503, 504])
+# Méthodes rejouables sur 5xx. Un POST (mutation GQL, spade) peut avoir été
+# appliqué avant l'erreur : le rejouer doublerait un pari ou un minute-watched
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+def should_retry(method: str, status: int, idempotent: Optional[bool] = None) -> bool:
+    """429 : toujours rejouable (requête refusée). 5xx : seulement si idempotent."""
+    if status not in RETRY_STATUS:
+        return False
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    return status == 429 or idempotent is True
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Backoff exponentiel avec "full jitter" : uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class TokenBucket(object):
+    """
+    Token bucket thread-safe. reserve() ne dort jamais : il réserve un jeton et
+    retourne le temps d'attente, pour servir aussi bien time.sleep qu'asyncio.sleep.
+    """
+
+    __slots__ = [
+        "name",
+        "rate",
+        "capacity",
+        "max_rate",
+        "tokens",
+        "updated_at",
+        "blocked_until",
+        "throttled",
+        "waited",
+        "__lock",
+    ]
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        """
+        Args:
+            name: Famille d'endpoints (logs et stats)
+            rate: Jetons rechargés par seconde
+            capacity: Taille maximale de la rafale
+        """
+        self.name = name
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+        self.throttled = 0
+        self.waited = 0.0
+        self.__lock = threading.Lock()
+
+    def __refill(self, now: float):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Consomme un jeton (éventuellement à crédit) et retourne l'attente nécessaire."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__refill(now)
+            self.tokens -= 1
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            delay = max(delay, self.blocked_until - now)
+            if delay > 0:
+                self.waited += delay
+            return delay
+
+    def try_acquire(self) -> bool:
+        """Consomme un jeton seulement s'il est disponible (jamais à crédit)."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__refill(now)
+            if self.tokens < 1 or now < self.blocked_until:
+                return False
+            self.tokens -= 1
+            return True
+
+    def update_from_headers(self, headers) -> None:
+        """Aligne le bucket sur Ratelimit-Limit / Remaining / Reset (Helix)."""
+        remaining = headers.get("Ratelimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = int(remaining)
+            limit = headers.get("Ratelimit-Limit")
+            reset = headers.get("Ratelimit-Reset")
+            with self.__lock:
+                now = time.monotonic()
+                self.__refill(now)
+                if limit is not None:
+                    # Helix : "limit" points par minute
+                    self.capacity = max(int(limit), 1)
+                    self.rate = self.max_rate = self.capacity / 60
+                self.tokens = min(self.tokens, remaining)
+                if remaining <= 0 and reset is not None:
+                    self.blocked_until = max(
+                        self.blocked_until, now + max(0.0, float(reset) - time.time())
+                    )
+        except (TypeError, ValueError):
+            pass
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """429 reçu : on vide le bucket, on divise le débit et on respecte Retry-After."""
+        with self.__lock:
+            now = time.monotonic()
+            self.throttled += 1
+            self.tokens = min(self.tokens, 0)
+            self.rate = max(self.max_rate / 32, self.rate / 2)
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def recover(self) -> None:
+        """Succès : le débit remonte progressivement vers son maximum (AIMD)."""
+        if self.rate < self.max_rate:
+            with self.__lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": round(self.rate, 2),
+            "max_rate": round(self.max_rate, 2),
+            "tokens": round(self.tokens, 1),
+            "throttled": self.throttled,
+            "waited": round(self.waited, 2),
+        }
+
+
+class RateLimiter(object):
+    """Un TokenBucket par famille d'endpoints, choisie d'après le préfixe de l'URL."""
+
+    # (débit par seconde, rafale) - Helix est ensuite recalé sur ses en-têtes
+    FAMILIES = {
+        "helix": (800 / 60, 800),
+        "gql": (20, 40),
+        "default": (10, 20),
+    }
+
+    # Préfixes d'URL -> famille (suit les endpoints surchargés dans constants)
+    PREFIXES = (
+        (HELIX_URL, "helix"),
+        (GQLOperations.url, "gql"),
+    )
+
+    def __init__(self, families: Optional[Dict[str, tuple]] = None):
+        families = dict(self.FAMILIES, **(families or {}))
+        self.buckets = {
+            name: TokenBucket(name, rate, capacity)
+            for name, (rate, capacity) in families.items()
+        }
+
+    def family(self, url: str) -> str:
+        for prefix, family in self.PREFIXES:
+            if url.startswith(prefix):
+                return family
+        return "default"
+
+    def bucket(self, url: str) -> TokenBucket:
+        return self.buckets[self.family(url)]
+
+    def reserve(self, url: str) -> float:
+        return self.bucket(url).reserve()
+
+    def on_response(self, url: str, status: int, headers) -> Optional[float]:
+        """
+        Met à jour le bucket avec la réponse.
+
+        Returns:
+            Le Retry-After (secondes) si la réponse est un 429, sinon None
+        """
+        bucket = self.bucket(url)
+        bucket.update_from_headers(headers)
+        if status == 429:
+            retry_after = self.retry_after(headers)
+            bucket.penalize(retry_after)
+            logger.debug(
+                f"⏳ 429 sur {bucket.name} : débit réduit à {bucket.rate:.2f} req/s"
+            )
+            return retry_after
+        if status < 500:
+            bucket.recover()
+        return None
+
+    @staticmethod
+    def retry_after(headers) -> Optional[float]:
+        value = headers.get("Retry-After")
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None
+        reset = headers.get("Ratelimit-Reset")
+        if reset is not None:
+            try:
+                return max(0.0, float(reset) - time.time())
+            except ValueError:
+                return None
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
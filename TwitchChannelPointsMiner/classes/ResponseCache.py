@@ -0,0 +1,164 @@
+"""
+ResponseCache - Cache LRU + TTL des réponses GQL en lecture seule
+Clé : operationName + variables. TTL propre à chaque opération, invalidation
+explicite (ex: stream-up / stream-down d'un streamer).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from TwitchChannelPointsMiner.classes.GQLTemplate import GQLRequest
+
+logger = logging.getLogger(__name__)
+
+# TTL (secondes) des opérations idempotentes ; les autres ne sont jamais mises en cache
+DEFAULT_TTLS = {
+    "VideoPlayerStreamInfoOverlayChannel": 60,
+    "WithIsStreamLiveQuery": 30,
+    "DropsHighlightService_AvailableDrops": 300,
+    "ModViewChannelQuery": 3600,
+    "GetIDFromLogin": 24 * 3600,
+}
+
+# Opérations dont le résultat change quand le stream démarre ou s'arrête
+STREAM_OPERATIONS = frozenset(
+    [
+        "VideoPlayerStreamInfoOverlayChannel",
+        "WithIsStreamLiveQuery",
+        "DropsHighlightService_AvailableDrops",
+    ]
+)
+
+
+class GQLResponseCache(object):
+    """Cache borné (LRU) des réponses GQL, thread-safe."""
+
+    def __init__(
+        self, max_entries: int = 2048, ttls: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            max_entries: Nombre maximum de réponses conservées
+            ttls: TTL par operationName (fusionnés avec DEFAULT_TTLS, 0 pour désactiver)
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # key -> (expire_at, request, response)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def is_cacheable(self, request) -> bool:
+        return (
+            isinstance(request, GQLRequest)
+            and self.ttls.get(request.operation_name, 0) > 0
+        )
+
+    def get(self, request: GQLRequest) -> Optional[dict]:
+        if not self.is_cacheable(request):
+            return None
+        key = request.cache_key
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.__entries[key]
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, request: GQLRequest, response) -> None:
+        """Ne conserve que les réponses complètes (champ data, sans erreurs)."""
+        if (
+            not self.is_cacheable(request)
+            or not isinstance(response, dict)
+            or response.get("data") is None
+            or response.get("errors")
+        ):
+            return
+        expire_at = time.monotonic() + self.ttls[request.operation_name]
+        with self.__lock:
+            self.__entries[request.cache_key] = (expire_at, request, response)
+            self.__entries.move_to_end(request.cache_key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def fetch(self, request: GQLRequest, send: Callable[[GQLRequest], dict]) -> dict:
+        """Réponse en cache si valide, sinon envoie la requête via send() et la met en cache."""
+        response = self.get(request)
+        if response is None:
+            response = send(request)
+            self.put(request, response)
+        return response
+
+    def invalidate(self, operations=None, values=None) -> int:
+        """
+        Supprime les entrées des opérations données (toutes si None) dont une
+        variable vaut l'une des valeurs données (toutes si None).
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        values = None if values is None else {str(value) for value in values}
+        with self.__lock:
+            keys = [
+                key
+                for key, (_, request, _) in self.__entries.items()
+                if (operations is None or request.operation_name in operations)
+                and (values is None or values & _scalar_values(request.variables))
+            ]
+            for key in keys:
+                del self.__entries[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_streamer(self, streamer) -> int:
+        """Oublie les réponses liées à l'état du stream (stream-up / stream-down)."""
+        count = self.invalidate(
+            STREAM_OPERATIONS,
+            [value for value in (streamer.username, streamer.channel_id) if value],
+        )
+        if count > 0:
+            logger.debug(f"{count} réponse(s) GQL invalidée(s) pour {streamer}")
+        return count
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.__entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups > 0 else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def _scalar_values(variables) -> set:
+    """Valeurs scalaires (en str) des variables, y compris dans les dicts imbriqués."""
+    values = set()
+    stack = [variables]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is not None:
+            values.add(str(item))
+    return values
@@ -0,0 +1,208 @@
+"""
+ScheduleModel - Créneaux de live appris pour chaque streamer suivi
+Histogramme jour de la semaine × heure construit à partir des transitions
+set_online / set_offline observées, persisté sur disque. La réconciliation
+Helix et le rafraîchissement des infos de stream se concentrent sur les
+streamers probablement en live, et espacent ceux qui ne streament plus.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HOURS_PER_WEEK = 7 * 24
+# Au-delà, une session est tronquée (stream oublié, miner arrêté pendant le live...)
+MAX_SESSION = 24 * 3600
+# Poids des sessions passées à chaque nouvelle session : les horaires récents priment
+DECAY = 0.95
+# Sessions observées avant de faire confiance à l'histogramme
+MIN_SESSIONS = 3
+# Part de l'heure la plus active au-delà de laquelle un créneau est « habituel »
+ACTIVE_RATIO = 0.2
+# Sans live observé depuis, le streamer est considéré inactif
+DORMANT_AFTER = 21 * 24 * 3600
+
+
+def hour_of_week(timestamp: float) -> int:
+    """0 = lundi 0h ... 167 = dimanche 23h, en heure locale."""
+    local = time.localtime(timestamp)
+    return local.tm_wday * 24 + local.tm_hour
+
+
+class StreamerSchedule(object):
+    __slots__ = ["tracked_at", "last_online", "sessions", "hours"]
+
+    def __init__(
+        self, tracked_at: float, last_online: float = 0, sessions: float = 0, hours=None
+    ):
+        self.tracked_at = tracked_at
+        self.last_online = last_online
+        # Poids cumulé (avec DECAY) des sessions observées
+        self.sessions = sessions
+        self.hours: List[float] = hours if hours is not None else [0.0] * HOURS_PER_WEEK
+
+
+class ScheduleModel(object):
+    """Horaires appris {username: StreamerSchedule}, thread-safe, persistés dans un fichier JSON compact."""
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Args:
+            cache_file: Fichier JSON de persistance entre redémarrages (optionnel)
+        """
+        self.cache_file = cache_file
+
+        self.observed = 0
+
+        self.__schedules: Dict[str, StreamerSchedule] = {}
+        self.__lock = threading.Lock()
+        self.__save_lock = threading.Lock()
+
+        self.__load()
+
+    def __len__(self) -> int:
+        return len(self.__schedules)
+
+    def track(self, streamer) -> None:
+        """Rattache le streamer au modèle : ses transitions online/offline l'alimentent."""
+        with self.__lock:
+            if streamer.username not in self.__schedules:
+                self.__schedules[streamer.username] = StreamerSchedule(time.time())
+        streamer.schedule = self
+
+    def observe_online(self, username: str, at: float = None) -> None:
+        at = at or time.time()
+        with self.__lock:
+            schedule = self.__schedules.get(username)
+            if schedule is not None:
+                schedule.last_online = at
+
+    def observe_session(
+        self, username: str, online_at: float, offline_at: float = None
+    ) -> None:
+        """Ajoute une session [online_at, offline_at] à l'histogramme du streamer."""
+        offline_at = offline_at or time.time()
+        if not online_at or offline_at <= online_at:
+            return
+        online_at = max(online_at, offline_at - MAX_SESSION)
+        with self.__lock:
+            schedule = self.__schedules.get(username)
+            if schedule is None:
+                return
+            hours = schedule.hours
+            for bucket in range(HOURS_PER_WEEK):
+                hours[bucket] *= DECAY
+            # Une fois par heure couverte, même si la session la chevauche à peine
+            buckets = set()
+            at = online_at - (online_at % 3600)
+            while at < offline_at:
+                buckets.add(hour_of_week(max(at, online_at)))
+                at += 3600
+            for bucket in buckets:
+                hours[bucket] += 1
+            schedule.sessions = schedule.sessions * DECAY + 1
+            schedule.last_online = offline_at
+            self.observed += 1
+        self.__save()
+
+    def likely_live(
+        self, username: str, at: float = None, horizon: float = 3600
+    ) -> bool:
+        """
+        True si le streamer streame habituellement entre `at` et `at + horizon`.
+        Un streamer encore mal connu est toujours considéré comme probable.
+        """
+        at = at or time.time()
+        with self.__lock:
+            schedule = self.__schedules.get(username)
+            if schedule is None or schedule.sessions < MIN_SESSIONS:
+                return True
+            scores = self.__scores(schedule.hours)
+            peak = max(scores)
+            if peak <= 0:
+                return True
+            end = at + horizon
+            while at <= end:
+                if scores[hour_of_week(at)] >= peak * ACTIVE_RATIO:
+                    return True
+                at += 3600
+            return False
+
+    def dormant(self, username: str, at: float = None) -> bool:
+        """True si aucun live n'a été observé depuis DORMANT_AFTER (suivi depuis au moins aussi longtemps)."""
+        at = at or time.time()
+        with self.__lock:
+            schedule = self.__schedules.get(username)
+            if schedule is None:
+                return False
+            return at - max(schedule.last_online, schedule.tracked_at) > DORMANT_AFTER
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        usernames = list(self.__schedules)
+        return {
+            "streamers": len(usernames),
+            "observed": self.observed,
+            "likely_live": sum(
+                1 for username in usernames if self.likely_live(username, now)
+            ),
+            "dormant": sum(1 for username in usernames if self.dormant(username, now)),
+        }
+
+    @staticmethod
+    def __scores(hours: List[float]) -> List[float]:
+        """
+        Poids du créneau + moyenne de la même heure sur la semaine : un streamer
+        quotidien observé 5 jours reste attendu les 2 jours pas encore vus.
+        """
+        daily = [
+            sum(hours[day * 24 + hour] for day in range(7)) / 7 for hour in range(24)
+        ]
+        return [hours[bucket] + daily[bucket % 24] for bucket in range(HOURS_PER_WEEK)]
+
+    def __load(self):
+        if self.cache_file is None or not os.path.isfile(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Format compact : {"username": [tracked_at, last_online, sessions, [168 poids]]}
+            self.__schedules = {
+                username: StreamerSchedule(
+                    float(entry[0]),
+                    float(entry[1]),
+                    float(entry[2]),
+                    [float(weight) for weight in entry[3]][:HOURS_PER_WEEK]
+                    + [0.0] * max(HOURS_PER_WEEK - len(entry[3]), 0),
+                )
+                for username, entry in data.items()
+            }
+        except Exception as e:
+            logger.debug(f"Schedule model: cache illisible ({e}), ignoré")
+
+    def __save(self):
+        if self.cache_file is None:
+            return
+        temp_file = self.cache_file + ".tmp"
+        try:
+            with self.__lock:
+                data = {
+                    username: [
+                        int(schedule.tracked_at),
+                        int(schedule.last_online),
+                        round(schedule.sessions, 3),
+                        [round(weight, 3) for weight in schedule.hours],
+                    ]
+                    for username, schedule in self.__schedules.items()
+                }
+            with self.__save_lock:
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            logger.debug(f"Schedule model: impossible de sauvegarder le cache ({e})")
@@ -21,7 +21,8 @@ class FollowersOrder(Enum):
 # Empty object shared between class
 class Settings(object):
     __slots__ = ["logger", "streamer_settings",
-                 "enable_analytics", "disable_ssl_cert_verification", "disable_at_in_nickname"]
+                 "enable_analytics", "disable_ssl_cert_verification", "disable_at_in_nickname",
+                 "irc_chat"]
 
 
 class Events(Enum):
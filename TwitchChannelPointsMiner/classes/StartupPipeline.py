@@ -0,0 +1,186 @@
+"""
+StartupPipeline - Démarrage en étapes concurrentes (pipeline)
+Chaque étape a son propre pool de workers borné et son débit maximum : un
+élément passe à l'étape suivante dès que SES données sont prêtes, sans
+attendre que toute la liste ait terminé l'étape en cours.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from TwitchChannelPointsMiner.classes.RateLimiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStage(object):
+    """Une étape : handler(item) -> liste des éléments transmis à l'étape suivante."""
+
+    __slots__ = [
+        "name",
+        "handler",
+        "max_workers",
+        "bucket",
+        "executor",
+        "processed",
+        "failed",
+        "emitted",
+        "busy",
+        "first_done_at",
+        "last_done_at",
+    ]
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable,
+        max_workers: int = 4,
+        rate: Optional[float] = None,
+    ):
+        """
+        Args:
+            name: Nom de l'étape (logs et stats)
+            handler: Fonction appelée pour chaque élément. Retourne un itérable
+                d'éléments pour l'étape suivante (vide = l'élément s'arrête là)
+            max_workers: Nombre d'éléments traités en parallèle
+            rate: Nombre maximum d'éléments démarrés par seconde (None = illimité)
+        """
+        self.name = name
+        self.handler = handler
+        self.max_workers = max_workers
+        self.bucket = (
+            TokenBucket(name, rate, max(max_workers, 1)) if rate is not None else None
+        )
+        self.executor = None
+
+        self.processed = 0
+        self.failed = 0
+        self.emitted = 0
+        self.busy = 0.0
+        self.first_done_at = None
+        self.last_done_at = None
+
+    def stats(self, started_at: float) -> Dict[str, float]:
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "emitted": self.emitted,
+            "busy": round(self.busy, 2),
+            "first": (
+                round(self.first_done_at - started_at, 2)
+                if self.first_done_at is not None
+                else None
+            ),
+            "last": (
+                round(self.last_done_at - started_at, 2)
+                if self.last_done_at is not None
+                else None
+            ),
+        }
+
+
+class StartupPipeline(object):
+    """
+    Enchaîne des PipelineStage : start() amorce la première étape et rend la
+    main immédiatement, join() attend que plus aucun élément ne soit en vol.
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        self.started_at = None
+        self.finished_at = None
+
+        self.__in_flight = 0
+        self.__done = threading.Condition()
+
+    def start(self, items: Iterable) -> None:
+        self.started_at = time.time()
+        for stage in self.stages:
+            stage.executor = ThreadPoolExecutor(
+                max_workers=stage.max_workers,
+                thread_name_prefix=f"Startup {stage.name}",
+            )
+        # Jeton d'amorçage : le pipeline ne peut pas se terminer pendant qu'on le remplit
+        with self.__done:
+            self.__in_flight += 1
+        try:
+            for item in items:
+                self.__submit(0, item)
+        finally:
+            self.__release()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin du pipeline. Retourne False si le timeout est atteint."""
+        with self.__done:
+            finished = self.__done.wait_for(
+                lambda: self.finished_at is not None, timeout=timeout
+            )
+        if finished:
+            for stage in self.stages:
+                stage.executor.shutdown(wait=False)
+        return finished
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def __submit(self, index: int, item) -> None:
+        with self.__done:
+            self.__in_flight += 1
+        self.stages[index].executor.submit(self.__run, index, item)
+
+    def __run(self, index: int, item) -> None:
+        stage = self.stages[index]
+        try:
+            if stage.bucket is not None:
+                delay = stage.bucket.reserve()
+                if delay > 0:
+                    time.sleep(delay)
+            started = time.time()
+            try:
+                outputs = list(stage.handler(item) or [])
+            except Exception as e:
+                with self.__done:
+                    stage.failed += 1
+                outputs = []
+                logger.error(f"❌ Étape '{stage.name}' en échec : {e}", exc_info=True)
+            now = time.time()
+            with self.__done:
+                stage.busy += now - started
+                stage.processed += 1
+                stage.emitted += len(outputs)
+                if stage.first_done_at is None:
+                    stage.first_done_at = now
+                stage.last_done_at = now
+
+            if index + 1 < len(self.stages):
+                for output in outputs:
+                    self.__submit(index + 1, output)
+        finally:
+            self.__release()
+
+    def __release(self) -> None:
+        with self.__done:
+            self.__in_flight -= 1
+            if self.__in_flight == 0:
+                self.finished_at = time.time()
+                self.__done.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        started_at = self.started_at or 0.0
+        return {stage.name: stage.stats(started_at) for stage in self.stages}
+
+    def summary(self) -> str:
+        lines = []
+        for name, stats in self.stats().items():
+            lines.append(
+                f"{name:<14} {stats['processed']:>5} traités, {stats['failed']:>3} échecs, "
+                f"premier à {stats['first']}s, dernier à {stats['last']}s, "
+                f"occupé {stats['busy']}s"
+            )
+        return "\n".join(lines)
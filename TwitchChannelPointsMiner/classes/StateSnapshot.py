@@ -0,0 +1,96 @@
+"""
+StateSnapshot - Checkpoint de l'état des streamers pour un redémarrage à chaud
+Écrit périodiquement et à l'arrêt (SIGTERM), relu au démarrage suivant : seuls
+les écarts sont ensuite réconciliés, les entrées périmées revalidées à la demande.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class StateSnapshot(object):
+    """Fichier JSON {username: Streamer.snapshot()} écrit de manière atomique."""
+
+    def __init__(self, path: str, max_age: float = 24 * 3600):
+        """
+        Args:
+            path: Fichier du checkpoint
+            max_age: Au-delà, le checkpoint est ignoré (démarrage à froid)
+        """
+        self.path = path
+        self.max_age = max_age
+
+        self.saved_at = 0
+        self.saves = 0
+        self.restored = 0
+
+        self.__lock = threading.Lock()
+
+    def save(self, streamers: List) -> bool:
+        temp_file = self.path + ".tmp"
+        try:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "saved_at": time.time(),
+                "streamers": {
+                    streamer.username: streamer.snapshot()
+                    for streamer in list(streamers)
+                },
+            }
+            with self.__lock:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(temp_file, self.path)
+            self.saved_at = data["saved_at"]
+            self.saves += 1
+            return True
+        except (OSError, RuntimeError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Impossible d'écrire le checkpoint {self.path} : {e}")
+            return False
+
+    def load(self) -> Dict[str, dict]:
+        """Retourne {username: état}, vide si absent, illisible ou trop ancien."""
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Checkpoint illisible ({e}), démarrage à froid")
+            return {}
+
+        if data.get("version") != SNAPSHOT_VERSION:
+            return {}
+        age = time.time() - data.get("saved_at", 0)
+        if age > self.max_age:
+            logger.info(
+                f"Checkpoint trop ancien ({age / 3600:.1f}h), démarrage à froid",
+                extra={"emoji": ":snowflake:"},
+            )
+            return {}
+        return data.get("streamers", {})
+
+    def restore(self, streamers: List) -> List:
+        """Réhydrate les streamers présents dans le checkpoint. Retourne ceux restaurés."""
+        states = self.load()
+        restored = []
+        for streamer in streamers:
+            state = states.get(streamer.username)
+            if state is None or not state.get("channel_id"):
+                continue
+            try:
+                streamer.restore(state)
+                restored.append(streamer)
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.debug(f"Checkpoint ignoré pour {streamer.username} : {e}")
+        self.restored = len(restored)
+        return restored
@@ -0,0 +1,217 @@
+"""
+Telemetry - Statistiques par opération pour tous les appels HTTP du client Twitch
+Latences (histogramme), codes de statut, octets envoyés/reçus et nouvelles
+tentatives, par opération GQL (operationName), route Helix, usher, spade...
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from TwitchChannelPointsMiner.constants import HELIX_URL, USHER_URL, GQLOperations
+
+logger = logging.getLogger(__name__)
+
+# Bornes supérieures des buckets de latence, en millisecondes (+ un bucket "inf")
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def operation_label(url: str) -> str:
+    """Nom d'opération par défaut d'après l'URL (sans paramètres ni identifiants)."""
+    if url.startswith(HELIX_URL):
+        return "helix:" + url.replace(HELIX_URL, "", 1).split("?")[0]
+    if url.startswith(GQLOperations.url):
+        return "gql"
+    if url.startswith(USHER_URL):
+        return "usher"
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if parts.path.endswith(".m3u8"):
+        return "hls:playlist"
+    if parts.path.endswith(".ts"):
+        return "hls:segment"
+    if "spade" in host or "video-edge" in host:
+        return "spade"
+    return host or url
+
+
+class Histogram(object):
+    """Histogramme de latences à buckets fixes."""
+
+    __slots__ = ["buckets", "count", "total", "min", "max"]
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value_ms: float):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Borne supérieure du bucket contenant le p-ième percentile."""
+        if self.count == 0:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return (
+                    LATENCY_BUCKETS_MS[index]
+                    if index < len(LATENCY_BUCKETS_MS)
+                    else self.max
+                )
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 1),
+            "avg_ms": round(self.total / self.count, 1) if self.count else 0.0,
+            "min_ms": None if self.min is None else round(self.min, 1),
+            "max_ms": None if self.max is None else round(self.max, 1),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                },
+                "inf": self.buckets[-1],
+            },
+        }
+
+
+class OperationStats(object):
+    __slots__ = ["latency", "statuses", "errors", "bytes_out", "bytes_in", "retries"]
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.latency.count,
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "errors": dict(self.errors),
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "retries": self.retries,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class Telemetry(object):
+    """Registre en mémoire, thread-safe, des statistiques par opération."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.operations: Dict[str, OperationStats] = {}
+        self.__lock = threading.Lock()
+
+    def record(
+        self,
+        operation: str,
+        status: Optional[int],
+        elapsed: float,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+        retries: int = 0,
+        error: Optional[str] = None,
+    ):
+        """
+        Enregistre une requête terminée.
+
+        Args:
+            operation: Nom de l'opération (ex: "gql:ChannelPointsContext", "helix:/users")
+            status: Code HTTP final, None si la requête a échoué sans réponse
+            elapsed: Durée totale en secondes, nouvelles tentatives comprises
+            bytes_out: Taille du corps envoyé
+            bytes_in: Taille du corps reçu
+            retries: Nombre de nouvelles tentatives effectuées
+            error: Nom de l'exception si la requête a échoué
+        """
+        with self.__lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats()
+            stats.latency.add(elapsed * 1000)
+            if status is not None:
+                stats.statuses[status] += 1
+            if error is not None:
+                stats.errors[error] += 1
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            stats.retries += retries
+
+    def get(self, operation: str) -> Optional[Dict[str, Any]]:
+        with self.__lock:
+            stats = self.operations.get(operation)
+            return None if stats is None else stats.to_dict()
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, Any]:
+        """Toutes les opérations (filtrées par préfixe), triées par temps total décroissant."""
+        with self.__lock:
+            operations = {
+                name: stats.to_dict()
+                for name, stats in self.operations.items()
+                if prefix is None or name.startswith(prefix)
+            }
+        return {
+            "started_at": self.started_at,
+            "uptime": round(time.time() - self.started_at, 1),
+            "operations": dict(
+                sorted(
+                    operations.items(),
+                    key=lambda item: item[1]["latency"]["total_ms"],
+                    reverse=True,
+                )
+            ),
+        }
+
+    def summary(self, limit: int = 5) -> str:
+        """Résumé lisible des opérations les plus coûteuses en temps."""
+        lines = []
+        for name, stats in list(self.snapshot()["operations"].items())[:limit]:
+            latency = stats["latency"]
+            lines.append(
+                f"{name}: {stats['requests']} req, {latency['total_ms'] / 1000:.1f}s, "
+                f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms, "
+                f"{stats['retries']} retries"
+            )
+        return "\n".join(lines)
+
+    def export(self, path: str) -> bool:
+        """Écrit un snapshot JSON (écriture atomique)."""
+        temp_file = path + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(temp_file, path)
+            return True
+        except Exception as e:
+            logger.debug(f"Impossible d'exporter la télémétrie ({e})")
+            return False
+
+    def reset(self):
+        with self.__lock:
+            self.operations = {}
+            self.started_at = time.time()
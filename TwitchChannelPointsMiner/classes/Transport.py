@@ -0,0 +1,239 @@
+"""
+Transport HTTP partagé pour tous les appels Twitch (GQL, Helix, usher, spade)
+Une seule session requests avec un pool de connexions keep-alive par hôte,
+limitée en débit par famille d'endpoints (RateLimiter), instrumentée (Telemetry)
+et enregistrable / rejouable (Cassette)
+"""
+
+import logging
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from TwitchChannelPointsMiner.classes.Cassette import Cassette, full_url, request_body
+from TwitchChannelPointsMiner.classes.RateLimiter import (
+    RateLimiter,
+    backoff_delay,
+    should_retry,
+)
+from TwitchChannelPointsMiner.classes.Telemetry import Telemetry, operation_label
+
+logger = logging.getLogger(__name__)
+
+
+class Transport(object):
+    """Session HTTP partagée : réutilise les connexions TCP/TLS entre les requêtes."""
+
+    __slots__ = [
+        "session",
+        "timeout",
+        "pool_connections",
+        "pool_maxsize",
+        "rate_limiter",
+        "max_retries",
+        "retries",
+        "telemetry",
+        "cassette",
+        "connected",
+        "connectivity_warned",
+        "connectivity_timeout",
+    ]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        connect_timeout: float = 5,
+        read_timeout: float = 20,
+        rate_limiter: RateLimiter = None,
+        max_retries: int = 3,
+        telemetry: Telemetry = None,
+        cassette: Cassette = None,
+        connectivity_timeout: float = None,
+    ):
+        """
+        Args:
+            pool_connections: Nombre d'hôtes gardés en cache (un pool par hôte)
+            pool_maxsize: Connexions keep-alive conservées par hôte
+            connect_timeout: Timeout d'établissement de la connexion (secondes)
+            read_timeout: Timeout de lecture de la réponse (secondes)
+            rate_limiter: Limiteur partagé (un nouveau par défaut)
+            max_retries: Nouvelles tentatives sur 429/5xx (backoff exponentiel + jitter)
+            telemetry: Registre des statistiques par opération (un nouveau par défaut)
+            cassette: Enregistre les échanges, ou les rejoue sans réseau
+            connectivity_timeout: Attente maximale du réseau avant la première
+                réponse (None = attendre indéfiniment, comme au démarrage hors ligne)
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.max_retries = max_retries
+        self.retries = 0
+        self.telemetry = Telemetry() if telemetry is None else telemetry
+        self.cassette = cassette
+        # Connectivité détectée par la première vraie requête (plus de boucle DNS au démarrage)
+        self.connected = threading.Event()
+        self.connectivity_warned = False
+        self.connectivity_timeout = connectivity_timeout
+
+        self.session = requests.Session()
+        # Les appels étaient sans état avec requests.get/post : on ne garde aucun cookie
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout=None,
+        operation: str = None,
+        idempotent: bool = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Args:
+            operation: Nom utilisé par la télémétrie (déduit de l'URL par défaut)
+            idempotent: Autorise la nouvelle tentative sur 5xx (par défaut :
+                GET/HEAD/OPTIONS oui, POST non ; le 429 est toujours réessayé)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        operation = operation_label(url) if operation is None else operation
+        start = time.perf_counter()
+        if self.cassette is not None and self.cassette.is_replaying:
+            body = request_body(kwargs)
+            response = self.cassette.replay(
+                method, full_url(url, kwargs.get("params")), body, operation
+            )
+            self.telemetry.record(
+                operation,
+                response.status_code,
+                time.perf_counter() - start,
+                bytes_out=len(body),
+                bytes_in=len(response.content),
+            )
+            return response
+
+        attempt = 0
+        waiting_since = None
+        try:
+            while True:
+                delay = self.rate_limiter.reserve(url)
+                if delay > 0:
+                    time.sleep(delay)
+
+                try:
+                    response = self.session.request(
+                        method, url, timeout=timeout, **kwargs
+                    )
+                except requests.exceptions.ConnectionError:
+                    # Tant qu'aucune requête n'a abouti, on attend le réseau au lieu
+                    # d'échouer (indépendant du budget de tentatives 429/5xx)
+                    if self.connected.is_set():
+                        raise
+                    waiting_since = waiting_since or time.monotonic()
+                    if (
+                        self.connectivity_timeout is not None
+                        and time.monotonic() - waiting_since
+                        >= self.connectivity_timeout
+                    ):
+                        raise
+                    self.__wait_for_connectivity()
+                    continue
+                self.connected.set()
+
+                retry_after = self.rate_limiter.on_response(
+                    url, response.status_code, response.headers
+                )
+                if (
+                    not should_retry(method, response.status_code, idempotent)
+                    or attempt >= self.max_retries
+                ):
+                    break
+
+                delay = max(backoff_delay(attempt), retry_after or 0)
+                logger.debug(
+                    f"🔁 {response.status_code} sur {url.split('?')[0]}, "
+                    f"nouvelle tentative {attempt + 1}/{self.max_retries} dans {delay:.1f}s"
+                )
+                response.close()
+                self.retries += 1
+                attempt += 1
+                time.sleep(delay)
+        except requests.exceptions.RequestException as e:
+            self.telemetry.record(
+                operation,
+                None,
+                time.perf_counter() - start,
+                retries=attempt,
+                error=type(e).__name__,
+            )
+            raise
+
+        body = response.request.body
+        self.telemetry.record(
+            operation,
+            response.status_code,
+            time.perf_counter() - start,
+            bytes_out=len(body) if body is not None else 0,
+            bytes_in=len(response.content) if kwargs.get("stream") is not True else 0,
+            retries=attempt,
+        )
+        if self.cassette is not None and self.cassette.is_recording:
+            self.cassette.record_http(
+                method,
+                full_url(url, kwargs.get("params")),
+                request_body(kwargs),
+                operation,
+                response.status_code,
+                response.headers,
+                response.content,
+                time.perf_counter() - start,
+            )
+        return response
+
+    def wait_until_connected(self, url: str) -> None:
+        """
+        Bloque jusqu'à la première réponse de `url`. À appeler avant les
+        requêtes qui ne passent pas par le transport (login).
+        """
+        if self.connected.is_set() or (
+            self.cassette is not None and self.cassette.is_replaying
+        ):
+            return
+        while True:
+            try:
+                self.head(url, operation="connectivity").close()
+                return
+            except requests.exceptions.RequestException:
+                # Timeout de lecture, ou connectivity_timeout atteint
+                self.__wait_for_connectivity()
+
+    def __wait_for_connectivity(self, interval: float = 5):
+        if self.connectivity_warned is False:
+            self.connectivity_warned = True
+            logger.error("Waiting for Twitch.tv connectivity...")
+        time.sleep(interval)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -4,7 +4,6 @@
 # Full list of available methods: https://azr.ivr.fi/schema/query.doc.html (a bit outdated)
 
 
-import copy
 import logging
 import os
 import random
@@ -12,8 +11,8 @@ import re
 import string
 import time
 import requests
-import validators
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from secrets import choice, token_hex
 from typing import Dict, Any
@@ -21,6 +20,8 @@ from typing import Dict, Any
 # from base64 import urlsafe_b64decode
 # from datetime import datetime
 
+from TwitchChannelPointsMiner.classes.BackgroundCache import BackgroundRefreshCache
+from TwitchChannelPointsMiner.classes.ChannelIdCache import ChannelIdCache
 from TwitchChannelPointsMiner.classes.entities.Campaign import Campaign
 from TwitchChannelPointsMiner.classes.entities.CommunityGoal import CommunityGoal
 from TwitchChannelPointsMiner.classes.entities.Drop import Drop
@@ -31,14 +32,31 @@ from TwitchChannelPointsMiner.classes.Exceptions import (
 from TwitchChannelPointsMiner.classes.Settings import (
     Events,
     FollowersOrder,
-    Priority,
     Settings,
 )
+from TwitchChannelPointsMiner.classes.GQLBatcher import GQLBatcher
+from TwitchChannelPointsMiner.classes.GQLTemplate import (
+    GQLTemplates,
+    encode_gql,
+    gql_operation_name,
+)
+from TwitchChannelPointsMiner.classes.PlaybackSession import PlaybackSessionCache
+from TwitchChannelPointsMiner.classes.PresenceEngine import PresenceEngine
+from TwitchChannelPointsMiner.classes.ResponseCache import GQLResponseCache
+from TwitchChannelPointsMiner.classes.ScheduleModel import ScheduleModel
+from TwitchChannelPointsMiner.classes.Transport import Transport
 from TwitchChannelPointsMiner.classes.TwitchLogin import TwitchLogin
+from TwitchChannelPointsMiner.classes.WatchPriorityIndex import (
+    MAX_WATCHING,
+    WatchPriorityIndex,
+)
+from TwitchChannelPointsMiner.classes.WatchScheduler import WatchScheduler
 from TwitchChannelPointsMiner.constants import (
     CLIENT_ID,
     CLIENT_VERSION,
+    HELIX_URL,
     URL,
+    USHER_URL,
     GQLOperations,
 )
 from TwitchChannelPointsMiner.utils import (
@@ -50,22 +68,41 @@ from TwitchChannelPointsMiner.utils import (
 logger = logging.getLogger(__name__)
 JsonType = Dict[str, Any]
 
+SPADE_SETTINGS_PATTERN = (
+    "(https://static.twitchcdn.net/config/settings.*?js|https://assets.twitch.tv/config/settings.*?.js|"
+    + re.escape(URL)
+    + "/config/settings.*?js)"
+)
+SPADE_URL_PATTERN = '"spade_url":"(.*?)"'
+
 
 class Twitch(object):
     __slots__ = [
         "cookies_file",
         "user_agent",
+        "spade_headers",
         "twitch_login",
         "running",
         "device_id",
         # "integrity",
         # "integrity_expire",
         "client_session",
-        "client_version",
+        "client_version_cache",
+        "spade_url_cache",
         "twilight_build_id_pattern",
+        "transport",
+        "gql_batcher",
+        "gql_cache",
+        "first_minute_watched_at",
+        "channel_id_cache",
+        "playback_sessions",
+        "watch_index",
+        "watch_scheduler",
+        "presence",
+        "schedule",
     ]
 
-    def __init__(self, username, user_agent, password=None):
+    def __init__(self, username, user_agent, password=None, transport=None):
         # Sur Fly.io, sauvegarder dans le dossier du projet (persiste entre déploiements)
         # Sinon utiliser ./cookies comme avant
         if os.getenv("FLY_APP_NAME"):
@@ -77,6 +114,11 @@ class Twitch(object):
             Path(cookies_path).mkdir(parents=True, exist_ok=True)
             self.cookies_file = os.path.join(cookies_path, f"{username}.pkl")
         self.user_agent = user_agent
+        # Corps du POST spade déjà urlencodé (Stream.encode_payload) : en-têtes partagés
+        self.spade_headers = {
+            "User-Agent": user_agent,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
         self.device_id = "".join(
             choice(string.ascii_letters + string.digits) for _ in range(32)
         )
@@ -87,10 +129,62 @@ class Twitch(object):
         # self.integrity = None
         # self.integrity_expire = 0
         self.client_session = token_hex(16)
-        self.client_version = CLIENT_VERSION
         self.twilight_build_id_pattern = re.compile(
             r'window\.__twilightBuildID\s*=\s*"([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})"'
         )
+        # Pool de connexions keep-alive partagé par tous les appels HTTP
+        self.transport = transport if transport is not None else Transport()
+        # Client-Version mis en cache (TTL 1h) : la page d'accueil n'est plus
+        # téléchargée à chaque requête GQL, seulement par le refresh en tâche de fond
+        self.client_version_cache = BackgroundRefreshCache(
+            "Client-Version",
+            self.__fetch_client_version,
+            ttl=3600,
+            default=CLIENT_VERSION,
+            cache_file=os.path.join(
+                os.path.dirname(self.cookies_file), f".{username}_client_version.json"
+            ),
+        )
+        # spade_url est le même pour toutes les chaînes : découvert une fois,
+        # persisté et rafraîchi en tâche de fond (TTL 6h)
+        self.spade_url_cache = BackgroundRefreshCache(
+            "Spade URL",
+            self.__fetch_spade_url,
+            ttl=6 * 3600,
+            cache_file=os.path.join(
+                os.path.dirname(self.cookies_file), f".{username}_spade_url.json"
+            ),
+        )
+        # Regroupe les opérations GQL concurrentes dans un seul POST
+        self.gql_batcher = GQLBatcher(self.post_gql_request)
+        # Réponses des lectures GQL idempotentes (LRU + TTL par opération)
+        self.gql_cache = GQLResponseCache()
+        # username -> channel ID persisté : seuls les noms inconnus passent par Helix
+        self.channel_id_cache = ChannelIdCache(
+            cache_file=os.path.join(
+                os.path.dirname(self.cookies_file), f".{username}_channel_ids.json"
+            ),
+        )
+        # Jeton de lecture + playlist media par streamer, réutilisés jusqu'à expiration
+        self.playback_sessions = PlaybackSessionCache()
+        # Streamers regardables triés par priorité, mis à jour à chaque changement d'état
+        self.watch_index = WatchPriorityIndex()
+        # Échéance propre à chaque stream regardé (cadence et drift des minute-watched)
+        self.watch_scheduler = WatchScheduler()
+        # Créneaux de live appris par streamer (fréquence de réconciliation Helix)
+        self.schedule = ScheduleModel(
+            cache_file=os.path.join(
+                os.path.dirname(self.cookies_file), f".{username}_schedule.json"
+            ),
+        )
+        # Transitions online/offline : PubSub d'abord, Helix en réconciliation
+        self.presence = PresenceEngine(self)
+        # Premier minute-watched accepté (mesure du temps de démarrage)
+        self.first_minute_watched_at = None
+
+    @property
+    def client_version(self):
+        return self.client_version_cache.value
 
     def login(self):
         # Si un token OAuth est fourni directement (password est un token OAuth)
@@ -159,67 +253,97 @@ class Twitch(object):
         if streamer.stream.update_required() is True:
             stream_info = self.get_stream_info(streamer)
             if stream_info is not None:
-                streamer.stream.update(
-                    broadcast_id=stream_info["stream"]["id"],
-                    title=stream_info["broadcastSettings"]["title"],
-                    game=stream_info["broadcastSettings"]["game"],
-                    tags=stream_info["stream"]["tags"],
-                    viewers_count=stream_info["stream"]["viewersCount"],
-                )
-
-                event_properties = {
-                    "channel_id": streamer.channel_id,
-                    "broadcast_id": streamer.stream.broadcast_id,
-                    "player": "site",
-                    "user_id": self.twitch_login.get_user_id(),
-                    "live": True,
-                    "channel": streamer.username,
-                }
-
-                if (
-                    streamer.stream.game_name() is not None
-                    and streamer.stream.game_id() is not None
-                    and streamer.settings.claim_drops is True
-                ):
-                    event_properties["game"] = streamer.stream.game_name()
-                    event_properties["game_id"] = streamer.stream.game_id()
+                if self._apply_stream_info(streamer, stream_info) is True:
                     # Update also the campaigns_ids so we are sure to tracking the correct campaign
                     streamer.stream.campaigns_ids = (
                         self.__get_campaign_ids_from_streamer(streamer)
                     )
+                    streamer.update_watch_priority()
+
+    def _apply_stream_info(self, streamer, stream_info):
+        """
+        Met à jour le Stream et le payload minute-watched depuis la réponse
+        VideoPlayerStreamInfoOverlayChannel (partagé avec AsyncTwitch).
 
-                streamer.stream.payload = [
-                    {"event": "minute-watched", "properties": event_properties}
-                ]
+        Returns:
+            bool: True si les campaigns_ids du streamer doivent être rechargés
+        """
+        streamer.stream.update(
+            broadcast_id=stream_info["stream"]["id"],
+            title=stream_info["broadcastSettings"]["title"],
+            game=stream_info["broadcastSettings"]["game"],
+            tags=stream_info["stream"]["tags"],
+            viewers_count=stream_info["stream"]["viewersCount"],
+        )
+
+        event_properties = {
+            "channel_id": streamer.channel_id,
+            "broadcast_id": streamer.stream.broadcast_id,
+            "player": "site",
+            "user_id": self.twitch_login.get_user_id(),
+            "live": True,
+            "channel": streamer.username,
+        }
+
+        drops_enabled = (
+            streamer.stream.game_name() is not None
+            and streamer.stream.game_id() is not None
+            and streamer.settings.claim_drops is True
+        )
+        if drops_enabled:
+            event_properties["game"] = streamer.stream.game_name()
+            event_properties["game_id"] = streamer.stream.game_id()
+
+        streamer.stream.payload = [
+            {"event": "minute-watched", "properties": event_properties}
+        ]
+        return drops_enabled
 
     def get_spade_url(self, streamer):
+        # Valeur globale en cache, sans aller-retour réseau
+        spade_url = self.spade_url_cache.get()
+        if spade_url is not None:
+            streamer.stream.spade_url = spade_url
+            return
+        # Secours : découverte depuis la page de la chaîne
         try:
-            # fixes AttributeError: 'NoneType' object has no attribute 'group'
-            # headers = {"User-Agent": self.user_agent}
-            from TwitchChannelPointsMiner.constants import USER_AGENTS
-
-            headers = {"User-Agent": USER_AGENTS["Linux"]["FIREFOX"]}
-
-            main_page_request = requests.get(
-                streamer.streamer_url, headers=headers)
-            response = main_page_request.text
-            # logger.info(response)
-            regex_settings = "(https://static.twitchcdn.net/config/settings.*?js|https://assets.twitch.tv/config/settings.*?.js)"
-            settings_url = re.search(regex_settings, response).group(1)
-
-            settings_request = requests.get(settings_url, headers=headers)
-            response = settings_request.text
-            regex_spade = '"spade_url":"(.*?)"'
-            streamer.stream.spade_url = re.search(
-                regex_spade, response).group(1)
-        except requests.exceptions.RequestException as e:
+            spade_url = self.discover_spade_url(streamer.streamer_url)
+            streamer.stream.spade_url = spade_url
+            self.spade_url_cache.set(spade_url)
+        except (requests.exceptions.RequestException, AttributeError) as e:
             logger.error(
                 f"Something went wrong during extraction of 'spade_url': {e}")
 
+    def discover_spade_url(self, page_url):
+        """Page Twitch -> script de settings -> spade_url."""
+        # fixes AttributeError: 'NoneType' object has no attribute 'group'
+        # headers = {"User-Agent": self.user_agent}
+        from TwitchChannelPointsMiner.constants import USER_AGENTS
+
+        headers = {"User-Agent": USER_AGENTS["Linux"]["FIREFOX"]}
+
+        main_page_request = self.transport.get(page_url, headers=headers)
+        response = main_page_request.text
+        # logger.info(response)
+        settings_url = re.search(SPADE_SETTINGS_PATTERN, response).group(1)
+
+        settings_request = self.transport.get(settings_url, headers=headers)
+        response = settings_request.text
+        return re.search(SPADE_URL_PATTERN, response).group(1)
+
+    def __fetch_spade_url(self):
+        """Loader du cache : découverte depuis la page d'accueil, None en cas d'échec."""
+        try:
+            return self.discover_spade_url(URL)
+        except (requests.exceptions.RequestException, AttributeError) as e:
+            logger.debug(f"Spade URL: découverte depuis {URL} impossible ({e})")
+            return None
+
     def get_broadcast_id(self, streamer):
-        json_data = copy.deepcopy(GQLOperations.WithIsStreamLiveQuery)
-        json_data["variables"] = {"id": streamer.channel_id}
-        response = self.post_gql_request(json_data)
+        json_data = GQLTemplates.WithIsStreamLiveQuery.build(
+            {"id": streamer.channel_id}
+        )
+        response = self.gql_cache.fetch(json_data, self.post_gql_request)
         if response != {}:
             stream = response["data"]["user"]["stream"]
             if stream is not None:
@@ -228,10 +352,10 @@ class Twitch(object):
                 raise StreamerIsOfflineException
 
     def get_stream_info(self, streamer):
-        json_data = copy.deepcopy(
-            GQLOperations.VideoPlayerStreamInfoOverlayChannel)
-        json_data["variables"] = {"channel": streamer.username}
-        response = self.post_gql_request(json_data)
+        json_data = GQLTemplates.VideoPlayerStreamInfoOverlayChannel.build(
+            {"channel": streamer.username}
+        )
+        response = self.gql_cache.fetch(json_data, self.gql_batcher.request)
 
         # Protection contre les réponses None ou malformées
         if response is None or response == {}:
@@ -268,9 +392,12 @@ class Twitch(object):
                 streamer.set_offline()
 
     def get_channel_id(self, streamer_username):
-        json_data = copy.deepcopy(GQLOperations.GetIDFromLogin)
-        json_data["variables"]["login"] = streamer_username
-        json_response = self.post_gql_request(json_data)
+        channel_id = self.channel_id_cache.get(streamer_username)
+        if channel_id is not None:
+            return channel_id
+
+        json_data = GQLTemplates.GetIDFromLogin.build({"login": streamer_username})
+        json_response = self.gql_cache.fetch(json_data, self.post_gql_request)
         if (
             "data" not in json_response
             or "user" not in json_response["data"]
@@ -278,24 +405,49 @@ class Twitch(object):
         ):
             raise StreamerDoesNotExistException
         else:
-            return json_response["data"]["user"]["id"]
-    
+            channel_id = json_response["data"]["user"]["id"]
+            self.channel_id_cache.update({streamer_username: channel_id})
+            return channel_id
+
     def _get_channel_ids_batch(self, streamer_usernames: list) -> dict:
         """
-        🚀 Récupère les channel IDs en batch via l'API Helix (beaucoup plus rapide)
-        
+        🚀 Récupère les channel IDs : cache disque d'abord, API Helix en batch
+        uniquement pour les noms inconnus
+
         Args:
             streamer_usernames: Liste des usernames à convertir en IDs
-        
+
         Returns:
             dict: {username: channel_id} pour tous les streamers trouvés
         """
+        username_to_id, unknown = self.channel_id_cache.lookup(streamer_usernames)
+        if unknown:
+            resolved = self._fetch_channel_ids(unknown) or {}
+            self.channel_id_cache.update(resolved)
+            username_to_id.update(resolved)
+        # Les entrées anciennes restent servies, et sont revérifiées en tâche de fond
+        self.channel_id_cache.revalidate_async(
+            lambda usernames: self._fetch_channel_ids(usernames, strict=True)
+        )
+        return username_to_id
+
+    def _fetch_channel_ids(self, streamer_usernames: list, strict: bool = False):
+        """
+        Résout les channel IDs via l'API Helix /users (chunks de 100)
+
+        Args:
+            streamer_usernames: Liste des usernames à convertir en IDs
+            strict: Retourne None si un seul chunk échoue (résultat incomplet)
+
+        Returns:
+            dict: {username: channel_id}, ou None si aucun token / résultat incomplet en mode strict
+        """
         try:
             # Utiliser le token OAuth User déjà authentifié
             user_token = self.twitch_login.get_auth_token()
             if not user_token:
                 logger.warning("⚠️ Pas de token OAuth pour récupérer les channel IDs en batch")
-                return {}
+                return None
             
             headers = {
                 "Client-ID": CLIENT_ID,
@@ -310,10 +462,10 @@ class Twitch(object):
             for chunk in chunks:
                 # Construire la requête avec plusieurs usernames
                 usernames_param = "&".join([f"login={username}" for username in chunk])
-                users_url = f"https://api.twitch.tv/helix/users?{usernames_param}"
+                users_url = f"{HELIX_URL}/users?{usernames_param}"
                 
                 try:
-                    users_response = requests.get(users_url, headers=headers, timeout=10)
+                    users_response = self.transport.get(users_url, headers=headers, timeout=10)
                     users_response.raise_for_status()
                     users_data = users_response.json()
                     
@@ -324,13 +476,15 @@ class Twitch(object):
                             username_to_id[username] = user_id
                 except Exception as e:
                     logger.debug(f"⚠️ Erreur récupération IDs pour chunk: {e}")
+                    if strict is True:
+                        return None
                     continue
             
             return username_to_id
             
         except Exception as e:
             logger.warning(f"⚠️ Erreur récupération channel IDs en batch : {e}")
-            return {}
+            return None
 
     def _get_followers_via_helix_api(self):
         """
@@ -375,11 +529,11 @@ class Twitch(object):
 
             while True:
                 # API Helix: Get Followed Channels
-                follows_url = f"https://api.twitch.tv/helix/channels/followed?user_id={user_id}&first=100"
+                follows_url = f"{HELIX_URL}/channels/followed?user_id={user_id}&first=100"
                 if cursor:
                     follows_url += f"&after={cursor}"
 
-                follows_response = requests.get(follows_url, headers=headers, timeout=10)
+                follows_response = self.transport.get(follows_url, headers=headers, timeout=10)
                 follows_response.raise_for_status()
 
                 data = follows_response.json()
@@ -420,214 +574,50 @@ class Twitch(object):
             logger.warning("⚠️ Fallback sur méthode GraphQL (plus lente)")
             return None
 
-    def get_followed_streams_online(self, streamer_usernames: list = None):
+    def get_streams_by_ids(self, user_ids: list, headers: dict = None, strict: bool = False) -> dict:
         """
-        🚀 Récupère les streams en ligne des follows via l'API Twitch Helix
-        
-        Cette méthode est beaucoup plus efficace que de vérifier chaque streamer individuellement.
-        Elle récupère tous les streams en ligne d'un coup via l'API Helix.
-        
+        Récupère les streams en ligne pour des channel IDs déjà connus (API Helix /streams)
+
         Args:
-            streamer_usernames: Liste optionnelle des usernames à vérifier.
-                              Si None, récupère tous les streams en ligne des follows.
-        
+            strict: Retourne None si un lot échoue (ses streamers ne sont pas hors ligne)
+
         Returns:
-            dict: {
-                'online': set of usernames en ligne,
-                'offline': set of usernames hors ligne,
-                'streams_data': dict avec infos détaillées des streams
-            }
+            dict: {username: infos du stream} pour les streamers en ligne
         """
-        try:
-            # 1. Utiliser le token OAuth User déjà authentifié
-            user_token = self.twitch_login.get_auth_token()
-            if not user_token:
-                logger.warning("⚠️ Pas de token OAuth pour récupérer les streams en ligne")
-                return None
-
-            # 2. Headers pour les requêtes API Helix
+        if headers is None:
             headers = {
                 "Client-ID": CLIENT_ID,
-                "Authorization": f"Bearer {user_token}"
+                "Authorization": f"Bearer {self.twitch_login.get_auth_token()}"
             }
 
-            # 3. Si aucune liste fournie, récupérer tous les follows d'abord
-            if streamer_usernames is None:
-                # Récupérer tous les follows
-                all_follows = self._get_followers_via_helix_api()
-                if not all_follows:
-                    logger.warning("⚠️ Impossible de récupérer la liste des follows")
-                    return None
-                streamer_usernames = all_follows
+        online_streams = {}
+        # Diviser en chunks de 100 (limite API Helix)
+        for chunk in create_chunks(user_ids, 100):
+            user_ids_param = "&".join([f"user_id={uid}" for uid in chunk])
+            streams_url = f"{HELIX_URL}/streams?{user_ids_param}&first=100"
 
-            # 4. Récupérer les IDs des streamers (nécessaire pour l'API /streams)
-            # L'API /streams nécessite des user_id, pas des usernames
-            # On va utiliser l'API /users pour convertir usernames -> user_ids
-            user_ids = []
-            username_to_id = {}
-            
-            # Diviser en chunks de 100 (limite API Helix)
-            chunks = create_chunks(streamer_usernames, 100)
-            
-            for chunk in chunks:
-                # Construire la requête avec plusieurs usernames
-                usernames_param = "&".join([f"login={username}" for username in chunk])
-                users_url = f"https://api.twitch.tv/helix/users?{usernames_param}"
-                
-                try:
-                    users_response = requests.get(users_url, headers=headers, timeout=10)
-                    users_response.raise_for_status()
-                    users_data = users_response.json()
-                    
-                    for user in users_data.get("data", []):
-                        user_id = user.get("id")
-                        username = user.get("login", "").lower()
-                        if user_id and username:
-                            user_ids.append(user_id)
-                            username_to_id[username] = user_id
-                except Exception as e:
-                    logger.debug(f"⚠️ Erreur récupération IDs pour chunk: {e}")
-                    continue
-
-            if not user_ids:
-                logger.warning("⚠️ Aucun ID utilisateur récupéré")
-                return None
-
-            # 5. Récupérer les streams en ligne (API /streams)
-            # Diviser en chunks de 100 (limite API Helix)
-            online_streams = {}
-            all_checked_usernames = set()
-            
-            user_id_chunks = create_chunks(user_ids, 100)
-            for chunk in user_id_chunks:
-                user_ids_param = "&".join([f"user_id={uid}" for uid in chunk])
-                streams_url = f"https://api.twitch.tv/helix/streams?{user_ids_param}&first=100"
-                
-                try:
-                    streams_response = requests.get(streams_url, headers=headers, timeout=10)
-                    streams_response.raise_for_status()
-                    streams_data = streams_response.json()
-                    
-                    for stream in streams_data.get("data", []):
-                        user_id = stream.get("user_id")
-                        username = stream.get("user_login", "").lower()
-                        if user_id and username:
-                            online_streams[username] = {
-                                "user_id": user_id,
-                                "game_name": stream.get("game_name", ""),
-                                "title": stream.get("title", ""),
-                                "viewer_count": stream.get("viewer_count", 0),
-                                "started_at": stream.get("started_at", ""),
-                            }
-                            all_checked_usernames.add(username)
-                except Exception as e:
-                    logger.debug(f"⚠️ Erreur récupération streams pour chunk: {e}")
-                    continue
-
-            # 6. Construire le résultat
-            online_usernames = set(online_streams.keys())
-            all_usernames_lower = {u.lower() for u in streamer_usernames}
-            offline_usernames = all_usernames_lower - online_usernames
-
-            logger.debug(
-                f"📊 Streams suivis: {len(online_usernames)} en ligne, {len(offline_usernames)} hors ligne"
-            )
-
-            return {
-                "online": online_usernames,
-                "offline": offline_usernames,
-                "streams_data": online_streams
-            }
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Erreur API Twitch Helix (streams): {e}")
-            return None
-        except Exception as e:
-            logger.error(f"❌ Erreur inattendue récupération streams: {e}")
-            return None
-
-    def monitor_followed_streams(self, streamers, check_interval=60):
-        """
-        🔄 Surveille automatiquement les streams suivis et met à jour leur statut
-        
-        Cette méthode utilise l'API Helix pour détecter rapidement les changements
-        d'état (en ligne/hors ligne) et met à jour les objets Streamer automatiquement.
-        
-        Args:
-            streamers: Liste des objets Streamer à surveiller
-            check_interval: Intervalle de vérification en secondes (défaut: 60)
-        """
-        while self.running:
             try:
-                # Récupérer tous les usernames des streamers suivis
-                streamer_usernames = [s.username for s in streamers]
-                
-                if not streamer_usernames:
-                    time.sleep(check_interval)
-                    continue
-
-                # Récupérer les streams en ligne via l'API Helix
-                streams_status = self.get_followed_streams_online(streamer_usernames)
-                
-                if not streams_status:
-                    # Si l'API échoue, utiliser la méthode individuelle classique
-                    logger.debug("⚠️ API Helix échouée, fallback sur vérification individuelle")
-                    for streamer in streamers:
-                        if time.time() >= streamer.offline_at + 60:
-                            self.check_streamer_online(streamer)
-                    time.sleep(check_interval)
-                    continue
-
-                online_usernames = streams_status["online"]
-                offline_usernames = streams_status["offline"]
-                streams_data = streams_status.get("streams_data", {})
-
-                # Mettre à jour chaque streamer selon son statut
-                for streamer in streamers:
-                    username_lower = streamer.username.lower()
-                    
-                    if username_lower in online_usernames:
-                        # Streamer est en ligne selon l'API
-                        if not streamer.is_online:
-                            # Il vient de passer en ligne !
-                            logger.info(
-                                f"🟢 {streamer.username} vient de passer EN LIGNE (détecté via API Helix)",
-                                extra={"emoji": ":green_circle:", "event": Events.STREAMER_ONLINE}
-                            )
-                            try:
-                                # Mettre à jour les infos du stream
-                                self.get_spade_url(streamer)
-                                self.update_stream(streamer)
-                                streamer.set_online()
-                            except Exception as e:
-                                logger.debug(f"⚠️ Erreur mise à jour stream {streamer.username}: {e}")
-                        else:
-                            # Déjà en ligne, juste mettre à jour les infos
-                            try:
-                                self.update_stream(streamer)
-                            except StreamerIsOfflineException:
-                                # Le stream vient de s'arrêter entre temps
-                                streamer.set_offline()
-                            except Exception as e:
-                                logger.debug(f"⚠️ Erreur update stream {streamer.username}: {e}")
-                    
-                    elif username_lower in offline_usernames:
-                        # Streamer est hors ligne selon l'API
-                        if streamer.is_online:
-                            # Il vient de passer hors ligne !
-                            logger.info(
-                                f"🔴 {streamer.username} vient de passer HORS LIGNE (détecté via API Helix)",
-                                extra={"emoji": ":red_circle:", "event": Events.STREAMER_OFFLINE}
-                            )
-                            streamer.set_offline()
-                        # Sinon, déjà hors ligne, rien à faire
-
-                # Attendre avant la prochaine vérification
-                time.sleep(check_interval)
-
+                streams_response = self.transport.get(streams_url, headers=headers, timeout=10)
+                streams_response.raise_for_status()
+                streams_data = streams_response.json()
+
+                for stream in streams_data.get("data", []):
+                    user_id = stream.get("user_id")
+                    username = stream.get("user_login", "").lower()
+                    if user_id and username:
+                        online_streams[username] = {
+                            "user_id": user_id,
+                            "game_name": stream.get("game_name", ""),
+                            "title": stream.get("title", ""),
+                            "viewer_count": stream.get("viewer_count", 0),
+                            "started_at": stream.get("started_at", ""),
+                        }
             except Exception as e:
-                logger.error(f"❌ Erreur dans monitor_followed_streams: {e}", exc_info=True)
-                time.sleep(check_interval)
+                logger.debug(f"⚠️ Erreur récupération streams pour chunk: {e}")
+                if strict is True:
+                    return None
+                continue
+        return online_streams
 
     def get_followers(
         self, limit: int = 10000, order: FollowersOrder = FollowersOrder.ASC, blacklist: list = []
@@ -691,8 +681,7 @@ class Twitch(object):
     def update_raid(self, streamer, raid):
         if streamer.raid != raid:
             streamer.raid = raid
-            json_data = copy.deepcopy(GQLOperations.JoinRaid)
-            json_data["variables"] = {"input": {"raidID": raid.raid_id}}
+            json_data = GQLTemplates.JoinRaid.build({"input": {"raidID": raid.raid_id}})
             self.post_gql_request(json_data)
 
             logger.info(
@@ -702,9 +691,10 @@ class Twitch(object):
             )
 
     def viewer_is_mod(self, streamer):
-        json_data = copy.deepcopy(GQLOperations.ModViewChannelQuery)
-        json_data["variables"] = {"channelLogin": streamer.username}
-        response = self.post_gql_request(json_data)
+        json_data = GQLTemplates.ModViewChannelQuery.build(
+            {"channelLogin": streamer.username}
+        )
+        response = self.gql_cache.fetch(json_data, self.gql_batcher.request)
         try:
             streamer.viewer_is_mod = response["data"]["user"]["self"]["isModerator"]
         except (ValueError, KeyError):
@@ -731,26 +721,29 @@ class Twitch(object):
 
     def post_gql_request(self, json_data):
         try:
-            response = requests.post(
+            response = self.transport.post(
                 GQLOperations.url,
-                json=json_data,
+                operation=f"gql:{gql_operation_name(json_data)}",
+                data=encode_gql(json_data),
                 headers={
+                    "Content-Type": "application/json",
                     "Authorization": f"OAuth {self.twitch_login.get_auth_token()}",
                     "Client-Id": CLIENT_ID,
                     # "Client-Integrity": self.post_integrity(),
                     "Client-Session-Id": self.client_session,
-                    "Client-Version": self.update_client_version(),
+                    "Client-Version": self.client_version_cache.get(),
                     "User-Agent": self.user_agent,
                     "X-Device-Id": self.device_id,
                 },
             )
-            logger.debug(
-                f"Data: {json_data}, Status code: {response.status_code}, Content: {response.text}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Data: {json_data}, Status code: {response.status_code}, Content: {response.text}"
+                )
             return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(
-                f"Error with GQLOperations ({json_data['operationName']}): {e}"
+                f"Error with GQLOperations ({gql_operation_name(json_data)}): {e}"
             )
             return {}
 
@@ -812,12 +805,19 @@ class Twitch(object):
 
     def update_client_version(self):
         """
-        Met à jour la version du client Twitch en récupérant le build ID depuis twitch.tv.
-        Gère les erreurs de connexion de manière gracieuse.
+        Force le rafraîchissement de la version du client Twitch.
+        Les requêtes GQL lisent la valeur en cache (client_version_cache.get()).
+        """
+        return self.client_version_cache.refresh()
+
+    def __fetch_client_version(self):
+        """
+        Récupère le build ID depuis twitch.tv.
+        Retourne None en cas d'erreur (la version existante est alors conservée).
         """
         try:
             # Ajouter un timeout pour éviter les attentes infinies
-            response = requests.get(
+            response = self.transport.get(
                 URL,
                 timeout=5,  # 5 secondes max
                 headers={"User-Agent": self.user_agent}
@@ -826,375 +826,349 @@ class Twitch(object):
                 logger.debug(
                     f"Error with update_client_version: HTTP {response.status_code}"
                 )
-                return self.client_version
-            
+                return None
+
             matcher = re.search(self.twilight_build_id_pattern, response.text)
             if not matcher:
                 logger.debug("Error with update_client_version: no match found in response")
-                return self.client_version
-            
-            self.client_version = matcher.group(1)
-            logger.debug(f"Client version updated: {self.client_version}")
-            return self.client_version
-            
+                return None
+
+            return matcher.group(1)
+
         except requests.exceptions.Timeout:
             # Timeout - connexion trop lente
             logger.debug("update_client_version: Timeout (connexion trop lente), utilisation version existante")
-            return self.client_version
-            
+            return None
+
         except requests.exceptions.ConnectionError as e:
             # Erreurs de connexion (IncompleteRead, Connection broken, etc.)
             logger.debug(f"update_client_version: Erreur de connexion ({type(e).__name__}), utilisation version existante")
-            return self.client_version
-            
+            return None
+
         except requests.exceptions.RequestException as e:
             # Autres erreurs requests
             logger.debug(f"update_client_version: Erreur requête ({type(e).__name__}), utilisation version existante")
-            return self.client_version
-        except Exception as e:
-            # Erreurs inattendues
-            logger.debug(f"update_client_version: Erreur inattendue ({type(e).__name__}: {e}), utilisation version existante")
-            return self.client_version
+            return None
 
-    def send_minute_watched_events(self, streamers, priority, chunk_size=3):
+    def send_minute_watched_events(self, priority, chunk_size=3):
+        # Un worker par stream regardé : un usher/spade lent ne retarde plus l'autre stream
+        executor = ThreadPoolExecutor(
+            max_workers=MAX_WATCHING, thread_name_prefix="Minute watched"
+        )
+        last_check = 0
         while self.running:
             try:
-                streamers_index = [
-                    i
-                    for i in range(0, len(streamers))
-                    if streamers[i].is_online is True
-                    and (
-                        streamers[i].online_at == 0
-                        or (time.time() - streamers[i].online_at) > 30
-                    )
-                ]
-
-                for index in streamers_index:
-                    if (streamers[index].stream.update_elapsed() / 60) > 10:
-                        # Why this user It's currently online but the last updated was more than 10minutes ago?
-                        # Please perform a manually update and check if the user it's online
-                        self.check_streamer_online(streamers[index])
-
-                streamers_watching = []
-                for prior in priority:
-                    if prior == Priority.ORDER and len(streamers_watching) < 2:
-                        # Get the first 2 items, they are already in order
-                        streamers_watching += streamers_index[:2]
-
-                    elif (
-                        prior in [Priority.POINTS_ASCENDING,
-                                  Priority.POINTS_DESCENDING]
-                        and len(streamers_watching) < 2
-                    ):
-                        items = [
-                            {"points": streamers[index].channel_points,
-                                "index": index}
-                            for index in streamers_index
-                        ]
-                        items = sorted(
-                            items,
-                            key=lambda x: x["points"],
-                            reverse=(
-                                True if prior == Priority.POINTS_DESCENDING else False
-                            ),
-                        )
-                        streamers_watching += [item["index"]
-                                               for item in items][:2]
-
-                    elif prior == Priority.STREAK and len(streamers_watching) < 2:
-                        """
-                        Check if we need need to change priority based on watch streak
-                        Viewers receive points for returning for x consecutive streams.
-                        Each stream must be at least 10 minutes long and it must have been at least 30 minutes since the last stream ended.
-                        Watch at least 6m for get the +10
-                        """
-                        for index in streamers_index:
-                            if (
-                                streamers[index].settings.watch_streak is True
-                                and streamers[index].stream.watch_streak_missing is True
-                                and (
-                                    streamers[index].offline_at == 0
-                                    or (
-                                        (time.time() -
-                                         streamers[index].offline_at)
-                                        // 60
-                                    )
-                                    > 30
-                                )
-                                # fix #425
-                                and streamers[index].stream.minute_watched < 7
-                            ):
-                                streamers_watching.append(index)
-                                if len(streamers_watching) == 2:
-                                    break
-
-                    elif prior == Priority.DROPS and len(streamers_watching) < 2:
-                        for index in streamers_index:
-                            if streamers[index].drops_condition() is True:
-                                streamers_watching.append(index)
-                                if len(streamers_watching) == 2:
-                                    break
-
-                    elif prior == Priority.SUBSCRIBED and len(streamers_watching) < 2:
-                        streamers_with_multiplier = [
-                            index
-                            for index in streamers_index
-                            if streamers[index].viewer_has_points_multiplier()
-                        ]
-                        streamers_with_multiplier = sorted(
-                            streamers_with_multiplier,
-                            key=lambda x: streamers[x].total_points_multiplier(
-                            ),
-                            reverse=True,
-                        )
-                        streamers_watching += streamers_with_multiplier[:2]
+                if time.time() - last_check >= self.watch_scheduler.interval:
+                    last_check = time.time()
+                    # Réindexation complète de sécurité (rattrape une mise à jour manquée)
+                    # Les infos périmées sont rechargées par le PresenceEngine
+                    self.watch_index.reconcile()
 
                 """
                 Twitch has a limit - you can't watch more than 2 channels at one time.
-                We take the first two streamers from the list as they have the highest priority (based on order or WatchStreak).
+                The index returns the two streamers with the highest priority (based on order, WatchStreak, drops...).
                 """
-                streamers_watching = streamers_watching[:2]
-
-                for index in streamers_watching:
-                    # next_iteration = time.time() + 60 / len(streamers_watching)
-                    next_iteration = time.time() + 20 / len(streamers_watching)
-
-                    try:
-                        ####################################
-                        # Start of fix for 2024/5 API Change
-                        # Create the JSON data for the GraphQL request
-                        json_data = copy.deepcopy(
-                            GQLOperations.PlaybackAccessToken)
-                        json_data["variables"] = {
-                            "login": streamers[index].username,
-                            "isLive": True,
-                            "isVod": False,
-                            "vodID": "",
-                            "playerType": "site"
-                            # "playerType": "picture-by-picture",
-                        }
+                streamers_watching = {
+                    streamer.username: streamer
+                    for streamer in self.watch_index.select(priority)
+                }
+                self.watch_scheduler.sync(streamers_watching)
+                for username, deadline in self.watch_scheduler.pop_due():
+                    executor.submit(
+                        self.__send_scheduled_minute_watched,
+                        streamers_watching[username],
+                        deadline,
+                        chunk_size,
+                    )
 
-                        # Get signature and value using the post_gql_request method
-                        try:
-                            responsePlaybackAccessToken = self.post_gql_request(
-                                json_data)
-                            logger.debug(
-                                f"Sent PlaybackAccessToken request for {streamers[index]}")
-
-                            if 'data' not in responsePlaybackAccessToken:
-                                logger.error(
-                                    f"Invalid response from Twitch: {responsePlaybackAccessToken}")
-                                continue
-
-                            streamPlaybackAccessToken = responsePlaybackAccessToken["data"].get(
-                                'streamPlaybackAccessToken', {})
-                            signature = streamPlaybackAccessToken.get(
-                                "signature")
-                            value = streamPlaybackAccessToken.get("value")
-
-                            if not signature or not value:
-                                logger.error(
-                                    f"Missing signature or value in Twitch response: {responsePlaybackAccessToken}")
-                                continue
-
-                        except Exception as e:
-                            logger.error(
-                                f"Error fetching PlaybackAccessToken for {streamers[index]}: {str(e)}")
-                            continue
-
-                        # encoded_value = quote(json.dumps(value))
-
-                        # Construct the URL for the broadcast qualities
-                        RequestBroadcastQualitiesURL = f"https://usher.ttvnw.net/api/channel/hls/{streamers[index].username}.m3u8?sig={signature}&token={value}"
-
-                        # Get list of video qualities
-                        responseBroadcastQualities = requests.get(
-                            RequestBroadcastQualitiesURL,
-                            headers={"User-Agent": self.user_agent},
-                            timeout=20,
-                        )  # timeout=60
-                        logger.debug(
-                            f"Send RequestBroadcastQualitiesURL request for {streamers[index]} - Status code: {responseBroadcastQualities.status_code}"
+                # Réveil à la prochaine échéance, au plus tard dans 1s pour suivre les priorités
+                next_deadline = self.watch_scheduler.next_deadline()
+                delay = 1 if next_deadline is None else next_deadline - time.time()
+                time.sleep(min(max(delay, 0.05), 1))
+            except Exception:
+                logger.error(
+                    "Exception raised in send minute watched", exc_info=True)
+                time.sleep(1)
+        executor.shutdown(wait=False)
+
+    def __send_scheduled_minute_watched(self, streamer, deadline, chunk_size):
+        started_at = time.time()
+        try:
+            self.send_minute_watched(streamer, chunk_size)
+        except Exception:
+            logger.error(
+                "Exception raised in send minute watched", exc_info=True)
+        finally:
+            self.watch_scheduler.done(streamer.username, deadline, started_at)
+
+    def send_minute_watched(self, streamer, chunk_size=3):
+        """Un minute-watched : playlist media -> HEAD segment -> spade. True si accepté (204)."""
+        import validators
+
+        try:
+            ####################################
+            # Start of fix for 2024/5 API Change
+            # Jeton + playlist master en cache : reconstruits à l'expiration ou sur erreur
+            session = self.playback_sessions.get(streamer.username)
+            if session is None:
+                session = self.__open_playback_session(streamer)
+                if session is None:
+                    return False
+
+            # Get list of video URLs
+            responseStreamURLList = self.transport.get(
+                session.media_playlist_url,
+                headers={"User-Agent": self.user_agent},
+                timeout=20,
+            )  # timeout=60
+            logger.debug(
+                f"Send BroadcastLowestQualityURL request for {streamer} - Status code: {responseStreamURLList.status_code}"
+            )
+            if responseStreamURLList.status_code != 200:
+                self.playback_sessions.invalidate(streamer.username)
+                return False
+            StreamURLList = responseStreamURLList.text
+
+            # Just takes the last line, which should be the URL for the lowest quality
+            StreamLowestQualityURL = StreamURLList.split("\n")[-2]
+            if not validators.url(StreamLowestQualityURL):
+                self.playback_sessions.invalidate(streamer.username)
+                return False
+
+            # Perform a HEAD request to simulate watching the stream
+            responseStreamLowestQualityURL = self.transport.head(
+                StreamLowestQualityURL,
+                headers={"User-Agent": self.user_agent},
+                timeout=20,
+            )  # timeout=60
+            logger.debug(
+                f"Send StreamLowestQualityURL request for {streamer} - Status code: {responseStreamLowestQualityURL.status_code}"
+            )
+            if responseStreamLowestQualityURL.status_code != 200:
+                self.playback_sessions.invalidate(streamer.username)
+                return False
+            # End of fix for 2024/5 API Change
+            ##################################
+            # Vérifier que spade_url est défini avant de faire la requête
+            if not streamer.stream.spade_url:
+                logger.debug(
+                    f"⚠️ spade_url non défini pour {streamer}, récupération..."
+                )
+                try:
+                    self.get_spade_url(streamer)
+                except Exception as e:
+                    logger.debug(
+                        f"⚠️ Impossible de récupérer spade_url pour {streamer}: {e}"
+                    )
+                    return False
+
+            # Vérifier à nouveau après tentative de récupération
+            if not streamer.stream.spade_url:
+                logger.debug(
+                    f"⚠️ spade_url toujours None pour {streamer}, skip..."
+                )
+                return False
+
+            response = self.transport.post(
+                streamer.stream.spade_url,
+                data=streamer.stream.encode_payload(),
+                headers=self.spade_headers,
+                # timeout=60,
+                timeout=20,
+            )
+            logger.debug(
+                f"Send minute watched request for {streamer} - Status code: {response.status_code}"
+            )
+            if response.status_code == 204:
+                self._on_minute_watched(streamer)
+                return True
+        except requests.exceptions.ConnectionError as e:
+            logger.error(
+                f"Error while trying to send minute watched: {e}")
+            self.__check_connection_handler(chunk_size)
+        except requests.exceptions.Timeout as e:
+            logger.error(
+                f"Error while trying to send minute watched: {e}")
+        return False
+
+    def __open_playback_session(self, streamer):
+        """PlaybackAccessToken -> playlist master usher -> URL de la playlist media."""
+        import validators
+
+        # Create the JSON data for the GraphQL request
+        json_data = GQLTemplates.PlaybackAccessToken.build({
+            "login": streamer.username,
+            "isLive": True,
+            "isVod": False,
+            "vodID": "",
+            "playerType": "site"
+            # "playerType": "picture-by-picture",
+        })
+
+        # Get signature and value using the post_gql_request method
+        try:
+            responsePlaybackAccessToken = self.post_gql_request(json_data)
+            logger.debug(f"Sent PlaybackAccessToken request for {streamer}")
+
+            if 'data' not in responsePlaybackAccessToken:
+                logger.error(
+                    f"Invalid response from Twitch: {responsePlaybackAccessToken}")
+                return None
+
+            streamPlaybackAccessToken = responsePlaybackAccessToken["data"].get(
+                'streamPlaybackAccessToken', {})
+            signature = streamPlaybackAccessToken.get("signature")
+            value = streamPlaybackAccessToken.get("value")
+
+            if not signature or not value:
+                logger.error(
+                    f"Missing signature or value in Twitch response: {responsePlaybackAccessToken}")
+                return None
+
+        except Exception as e:
+            logger.error(
+                f"Error fetching PlaybackAccessToken for {streamer}: {str(e)}")
+            return None
+
+        # encoded_value = quote(json.dumps(value))
+
+        # Construct the URL for the broadcast qualities
+        RequestBroadcastQualitiesURL = f"{USHER_URL}/api/channel/hls/{streamer.username}.m3u8?sig={signature}&token={value}"
+
+        # Get list of video qualities
+        responseBroadcastQualities = self.transport.get(
+            RequestBroadcastQualitiesURL,
+            headers={"User-Agent": self.user_agent},
+            timeout=20,
+        )  # timeout=60
+        logger.debug(
+            f"Send RequestBroadcastQualitiesURL request for {streamer} - Status code: {responseBroadcastQualities.status_code}"
+        )
+        if responseBroadcastQualities.status_code != 200:
+            return None
+        BroadcastQualities = responseBroadcastQualities.text
+
+        # Just takes the last line, which should be the URL for the lowest quality
+        BroadcastLowestQualityURL = BroadcastQualities.split("\n")[-1]
+        if not validators.url(BroadcastLowestQualityURL):
+            return None
+
+        return self.playback_sessions.put(
+            streamer.username, BroadcastLowestQualityURL, value
+        )
+
+    def _on_minute_watched(self, streamer):
+        """Un minute-watched a été accepté (204) : progression et statut des drops."""
+        if self.first_minute_watched_at is None:
+            self.first_minute_watched_at = time.time()
+        streamer.stream.update_minute_watched()
+        streamer.update_watch_priority()
+
+        """
+        Remember, you can only earn progress towards a time-based Drop on one participating channel at a time.  [ ! ! ! ]
+        You can also check your progress towards Drops within a campaign anytime by viewing the Drops Inventory.
+        For time-based Drops, if you are unable to claim the Drop in time, you will be able to claim it from the inventory page until the Drops campaign ends.
+        """
+
+        for campaign in streamer.stream.campaigns:
+            for drop in campaign.drops:
+                # We could add .has_preconditions_met condition inside is_printable
+                if (
+                    drop.has_preconditions_met is not False
+                    and drop.is_printable is True
+                ):
+                    drop_messages = [
+                        f"{streamer} is streaming {streamer.stream}",
+                        f"Campaign: {campaign}",
+                        f"Drop: {drop}",
+                        f"{drop.progress_bar()}",
+                    ]
+                    for single_line in drop_messages:
+                        logger.info(
+                            single_line,
+                            extra={
+                                "event": Events.DROP_STATUS,
+                                "skip_telegram": True,
+                                "skip_discord": True,
+                                "skip_webhook": True,
+                                "skip_matrix": True,
+                                "skip_gotify": True
+                            },
                         )
-                        if responseBroadcastQualities.status_code != 200:
-                            continue
-                        BroadcastQualities = responseBroadcastQualities.text
-
-                        # Just takes the last line, which should be the URL for the lowest quality
-                        BroadcastLowestQualityURL = BroadcastQualities.split(
-                            "\n")[-1]
-                        if not validators.url(BroadcastLowestQualityURL):
-                            continue
-
-                        # Get list of video URLs
-                        responseStreamURLList = requests.get(
-                            BroadcastLowestQualityURL,
-                            headers={"User-Agent": self.user_agent},
-                            timeout=20,
-                        )  # timeout=60
-                        logger.debug(
-                            f"Send BroadcastLowestQualityURL request for {streamers[index]} - Status code: {responseStreamURLList.status_code}"
+
+                    if Settings.logger.telegram is not None:
+                        Settings.logger.telegram.send(
+                            "\n".join(drop_messages),
+                            Events.DROP_STATUS,
                         )
-                        if responseStreamURLList.status_code != 200:
-                            continue
-                        StreamURLList = responseStreamURLList.text
-
-                        # Just takes the last line, which should be the URL for the lowest quality
-                        StreamLowestQualityURL = StreamURLList.split("\n")[-2]
-                        if not validators.url(StreamLowestQualityURL):
-                            continue
-
-                        # Perform a HEAD request to simulate watching the stream
-                        responseStreamLowestQualityURL = requests.head(
-                            StreamLowestQualityURL,
-                            headers={"User-Agent": self.user_agent},
-                            timeout=20,
-                        )  # timeout=60
-                        logger.debug(
-                            f"Send StreamLowestQualityURL request for {streamers[index]} - Status code: {responseStreamLowestQualityURL.status_code}"
+
+                    if Settings.logger.discord is not None:
+                        Settings.logger.discord.send(
+                            "\n".join(drop_messages),
+                            Events.DROP_STATUS,
                         )
-                        if responseStreamLowestQualityURL.status_code != 200:
-                            continue
-                        # End of fix for 2024/5 API Change
-                        ##################################
-                        # Vérifier que spade_url est défini avant de faire la requête
-                        if not streamers[index].stream.spade_url:
-                            logger.debug(
-                                f"⚠️ spade_url non défini pour {streamers[index]}, récupération..."
-                            )
-                            try:
-                                self.get_spade_url(streamers[index])
-                            except Exception as e:
-                                logger.debug(
-                                    f"⚠️ Impossible de récupérer spade_url pour {streamers[index]}: {e}"
-                                )
-                                continue
-                        
-                        # Vérifier à nouveau après tentative de récupération
-                        if not streamers[index].stream.spade_url:
-                            logger.debug(
-                                f"⚠️ spade_url toujours None pour {streamers[index]}, skip..."
-                            )
-                            continue
-                        
-                        response = requests.post(
-                            streamers[index].stream.spade_url,
-                            data=streamers[index].stream.encode_payload(),
-                            headers={"User-Agent": self.user_agent},
-                            # timeout=60,
-                            timeout=20,
+                    if Settings.logger.webhook is not None:
+                        Settings.logger.webhook.send(
+                            "\n".join(drop_messages),
+                            Events.DROP_STATUS,
                         )
-                        logger.debug(
-                            f"Send minute watched request for {streamers[index]} - Status code: {response.status_code}"
+                    if Settings.logger.gotify is not None:
+                        Settings.logger.gotify.send(
+                            "\n".join(drop_messages),
+                            Events.DROP_STATUS,
                         )
-                        if response.status_code == 204:
-                            streamers[index].stream.update_minute_watched()
-
-                            """
-                            Remember, you can only earn progress towards a time-based Drop on one participating channel at a time.  [ ! ! ! ]
-                            You can also check your progress towards Drops within a campaign anytime by viewing the Drops Inventory.
-                            For time-based Drops, if you are unable to claim the Drop in time, you will be able to claim it from the inventory page until the Drops campaign ends.
-                            """
-
-                            for campaign in streamers[index].stream.campaigns:
-                                for drop in campaign.drops:
-                                    # We could add .has_preconditions_met condition inside is_printable
-                                    if (
-                                        drop.has_preconditions_met is not False
-                                        and drop.is_printable is True
-                                    ):
-                                        drop_messages = [
-                                            f"{streamers[index]} is streaming {streamers[index].stream}",
-                                            f"Campaign: {campaign}",
-                                            f"Drop: {drop}",
-                                            f"{drop.progress_bar()}",
-                                        ]
-                                        for single_line in drop_messages:
-                                            logger.info(
-                                                single_line,
-                                                extra={
-                                                    "event": Events.DROP_STATUS,
-                                                    "skip_telegram": True,
-                                                    "skip_discord": True,
-                                                    "skip_webhook": True,
-                                                    "skip_matrix": True,
-                                                    "skip_gotify": True
-                                                },
-                                            )
-
-                                        if Settings.logger.telegram is not None:
-                                            Settings.logger.telegram.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-
-                                        if Settings.logger.discord is not None:
-                                            Settings.logger.discord.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-                                        if Settings.logger.webhook is not None:
-                                            Settings.logger.webhook.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-                                        if Settings.logger.gotify is not None:
-                                            Settings.logger.gotify.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-
-                    except requests.exceptions.ConnectionError as e:
-                        logger.error(
-                            f"Error while trying to send minute watched: {e}")
-                        self.__check_connection_handler(chunk_size)
-                    except requests.exceptions.Timeout as e:
-                        logger.error(
-                            f"Error while trying to send minute watched: {e}")
-
-                    self.__chuncked_sleep(
-                        next_iteration - time.time(), chunk_size=chunk_size
-                    )
-
-                if streamers_watching == []:
-                    # self.__chuncked_sleep(60, chunk_size=chunk_size)
-                    self.__chuncked_sleep(20, chunk_size=chunk_size)
-            except Exception:
-                logger.error(
-                    "Exception raised in send minute watched", exc_info=True)
 
     # === CHANNEL POINTS / PREDICTION === #
     # Load the amount of current points for a channel, check if a bonus is available
     def load_channel_points_context(self, streamer):
-        json_data = copy.deepcopy(GQLOperations.ChannelPointsContext)
-        json_data["variables"] = {"channelLogin": streamer.username}
+        json_data = GQLTemplates.ChannelPointsContext.build(
+            {"channelLogin": streamer.username}
+        )
 
-        response = self.post_gql_request(json_data)
+        response = self.gql_batcher.request(json_data)
+
+        loaded, claim_id = self._apply_channel_points_context(streamer, response)
+        if loaded is False:
+            return
+
+        if claim_id is not None:
+            self.claim_bonus(streamer, claim_id)
+
+        if streamer.settings.community_goals is True:
+            self.contribute_to_community_goals(streamer)
+
+    def _apply_channel_points_context(self, streamer, response):
+        """
+        Applique la réponse ChannelPointsContext au streamer (partagé avec AsyncTwitch).
 
+        Returns:
+            tuple: (contexte chargé, id du bonus à réclamer ou None)
+        """
         # Protection contre response None ou malformée
         if response is None or response == {}:
-            return
+            return False, None
 
         if "data" not in response or response["data"] is None:
-            return
+            return False, None
 
         if "community" not in response["data"] or response["data"]["community"] is None:
             raise StreamerDoesNotExistException
 
         channel = response["data"]["community"].get("channel")
         if channel is None:
-            return
+            return False, None
 
         # Vérifier que self et communityPoints existent
         if "self" not in channel or channel["self"] is None:
-            return
+            return False, None
 
         if "communityPoints" not in channel["self"] or channel["self"]["communityPoints"] is None:
-            return
+            return False, None
 
         community_points = channel["self"]["communityPoints"]
         streamer.channel_points = community_points.get("balance", 0)
         streamer.activeMultipliers = community_points.get("activeMultipliers", [])
+        streamer.update_watch_priority()
 
         if streamer.settings.community_goals is True:
             if "communityPointsSettings" in channel and channel["communityPointsSettings"] is not None:
@@ -1204,12 +1178,30 @@ class Twitch(object):
                         for goal in channel["communityPointsSettings"]["goals"]
                     }
 
-        if community_points.get("availableClaim") is not None:
-            self.claim_bonus(
-                streamer, community_points["availableClaim"]["id"])
+        available_claim = community_points.get("availableClaim")
+        return True, (available_claim["id"] if available_claim is not None else None)
 
-        if streamer.settings.community_goals is True:
-            self.contribute_to_community_goals(streamer)
+    def load_channel_points_contexts(self, streamers, max_workers=20):
+        """
+        Charge le contexte de plusieurs streamers en parallèle : les requêtes
+        concurrentes sont regroupées par le GQLBatcher en quelques POST.
+
+        Returns:
+            list: Les streamers qui n'existent pas (StreamerDoesNotExistException)
+        """
+        not_found = []
+
+        def load(streamer):
+            try:
+                self.load_channel_points_context(streamer)
+            except StreamerDoesNotExistException:
+                not_found.append(streamer)
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="Channel points context"
+        ) as executor:
+            list(executor.map(load, streamers))
+        return not_found
 
     def check_predictions_available(self, streamer):
         """
@@ -1231,8 +1223,8 @@ class Twitch(object):
             }
             
             # Vérifier les prédictions actives pour ce streamer
-            predictions_url = f"https://api.twitch.tv/helix/predictions?broadcaster_id={streamer.channel_id}&first=1"
-            response = requests.get(predictions_url, headers=headers, timeout=10)
+            predictions_url = f"{HELIX_URL}/predictions?broadcaster_id={streamer.channel_id}&first=1"
+            response = self.transport.get(predictions_url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1293,6 +1285,29 @@ class Twitch(object):
             return None  # En cas d'erreur, on ne peut pas déterminer (continuer)
     
     def make_predictions(self, event):
+        decision = self._prediction_decision(event)
+        if decision is None:
+            return
+
+        # Vérification préventive : vérifier si les prédictions sont disponibles
+        predictions_available = self.check_predictions_available(event.streamer)
+        if predictions_available is False:
+            logger.warning(
+                f"⚠️ Prédictions non disponibles (blocage régional probable) pour {event.streamer.username}",
+                extra={
+                    "emoji": ":no_entry_sign:",
+                    "event": Events.BET_FAILED,
+                },
+            )
+            return  # Ne pas essayer de placer le pari
+        
+        json_data = self._prediction_request(event, decision)
+        if json_data is not None:
+            response = self.post_gql_request(json_data)
+            self._on_prediction_response(response)
+
+    def _prediction_decision(self, event):
+        """Vérifie l'événement et calcule la décision (None si le bet est annulé)."""
         # Vérifier que l'événement existe toujours et est actif
         if event is None:
             logger.warning(
@@ -1302,7 +1317,7 @@ class Twitch(object):
                     "event": Events.BET_FAILED,
                 },
             )
-            return
+            return None
         
         # Vérifier le statut de l'événement
         if event.status != "ACTIVE":
@@ -1313,7 +1328,7 @@ class Twitch(object):
                     "event": Events.BET_FAILED,
                 },
             )
-            return
+            return None
 
         # Récupère le data_quality_multiplier si SmartBetTiming V2 l'a injecté
         data_quality_multiplier = getattr(event, '_data_quality_multiplier', 1.0)
@@ -1334,19 +1349,10 @@ class Twitch(object):
                 "event": Events.BET_GENERAL,
             },
         )
-        
-        # Vérification préventive : vérifier si les prédictions sont disponibles
-        predictions_available = self.check_predictions_available(event.streamer)
-        if predictions_available is False:
-            logger.warning(
-                f"⚠️ Prédictions non disponibles (blocage régional probable) pour {event.streamer.username}",
-                extra={
-                    "emoji": ":no_entry_sign:",
-                    "event": Events.BET_FAILED,
-                },
-            )
-            return  # Ne pas essayer de placer le pari
-        
+        return decision
+
+    def _prediction_request(self, event, decision):
+        """Applique les filtres et construit la requête MakePrediction (None si pas de bet)."""
         if event.status == "ACTIVE":
             skip, compared_value = event.bet.skip()
             if skip is True:
@@ -1375,131 +1381,15 @@ class Twitch(object):
                         },
                     )
 
-                    json_data = copy.deepcopy(GQLOperations.MakePrediction)
-                    json_data["variables"] = {
+                    json_data = GQLTemplates.MakePrediction.build({
                         "input": {
                             "eventID": event.event_id,
                             "outcomeID": decision["id"],
                             "points": decision["amount"],
                             "transactionID": token_hex(16),
                         }
-                    }
-                    response = self.post_gql_request(json_data)
-                    if (
-                        "data" in response
-                        and "makePrediction" in response["data"]
-                        and "error" in response["data"]["makePrediction"]
-                        and response["data"]["makePrediction"]["error"] is not None
-                    ):
-                        error_info = response["data"]["makePrediction"]["error"]
-                        error_code = str(error_info.get("code", "UNKNOWN")).upper()
-                        error_message = str(error_info.get("message", "")).strip()
-                        
-                        # Log full error for debugging if message is empty
-                        if not error_message:
-                            logger.debug(f"Full error response: {error_info}")
-                        
-                        # Normaliser le message pour la comparaison (lowercase)
-                        error_message_lower = error_message.lower() if error_message else ""
-                        
-                        # Détecter les erreurs de blocage régional (codes d'erreur Twitch connus)
-                        # Codes d'erreur possibles pour restrictions géographiques :
-                        # - GEOBLOCKED, REGION_BLOCKED, GEOGRAPHIC_RESTRICTION
-                        # - UNAVAILABLE_IN_REGION, NOT_AVAILABLE_IN_YOUR_REGION
-                        # - PREDICTION_NOT_AVAILABLE (peut être lié à la région)
-                        # - REGION_LOCKED (nouveau code détecté)
-                        # Vérifier d'abord le code d'erreur explicite
-                        explicit_region_codes = ["REGION_LOCKED", "REGION_BLOCKED", "GEOBLOCKED", 
-                                                  "GEOGRAPHIC_RESTRICTION", "UNAVAILABLE_IN_REGION"]
-                        
-                        # Vérifier des messages explicites dans le message d'erreur
-                        explicit_region_messages = [
-                            "not available in your region",
-                            "not available in this region",
-                            "geographic restriction",
-                            "region locked",
-                            "blocked in your region"
-                        ]
-                        
-                        # Détecter blocage régional seulement si code explicite OU message explicite
-                        is_code_explicit = error_code in explicit_region_codes or any(code in error_code for code in ["REGION_LOCKED", "REGION_BLOCKED", "GEOBLOCKED"])
-                        is_message_explicit = any(msg in error_message_lower for msg in explicit_region_messages)
-                        
-                        is_region_blocked = (
-                            is_code_explicit or is_message_explicit or
-                            # Fallback pour codes moins explicites mais probablement régionaux
-                            (("REGION" in error_code and "LOCKED" in error_code) or
-                             ("GEO" in error_code and "BLOCKED" in error_code))
-                        )
-                        
-                        if is_region_blocked:
-                            # Message plus informatif si le message d'erreur est vide
-                            if not error_message:
-                                error_display = f"Code: {error_code} (message non fourni par Twitch)"
-                            else:
-                                error_display = f"Code: {error_code}, Message: {error_message}"
-                            
-                            logger.error(
-                                f"❌ Blocage régional détecté pour les paris! {error_display}",
-                                extra={
-                                    "emoji": ":no_entry_sign:",
-                                    "event": Events.BET_FAILED,
-                                },
-                            )
-                            
-                            # Vérifier les scopes du token pour diagnostiquer
-                            scope_validation = self.twitch_login.validate_token_scopes()
-                            scope_info = ""
-                            if scope_validation and scope_validation.get("valid"):
-                                scopes = scope_validation.get("scopes", [])
-                                required_scopes = ["channel:read:predictions", "channel:manage:predictions"]
-                                missing_scopes = [s for s in required_scopes if s not in scopes]
-                                
-                                if missing_scopes:
-                                    scope_info = (
-                                        f"\n   ⚠️ PROBLÈME DÉTECTÉ: Votre token OAuth manque les scopes:\n"
-                                        f"      - {', '.join(missing_scopes)}\n"
-                                        f"   → Régénérez votre token sur https://twitchtokengenerator.com/\n"
-                                    )
-                                else:
-                                    scope_info = (
-                                        f"\n   ✅ Votre token OAuth a les bons scopes\n"
-                                        f"   → Le problème vient probablement de la RÉGION du serveur Railway\n"
-                                    )
-                            
-                            logger.warning(
-                                "💡 Solutions possibles:\n"
-                                "   1. Vérifiez que votre token OAuth contient les scopes:\n"
-                                "      - channel:read:predictions\n"
-                                "      - channel:manage:predictions\n"
-                                "   2. 🚨 RÉGION UE (Amsterdam) : Twitch bloque souvent les prédictions dans l'UE\n"
-                                "      → Solution Fly.io: Changez la région dans fly.toml (primary_region)\n"
-                                "      → Régions recommandées: 'iad' (US), 'sin' (Singapour), 'hnd' (Japon)\n"
-                                "      → Command: fly regions set iad\n"
-                                "   3. Si vous utilisez Railway, changez la région du service\n"
-                                "      → Régions recommandées: US (Washington, Oregon)\n"
-                                "   4. Alternative: Utilisez un VPN (mais moins stable pour un serveur)\n"
-                                "   5. Certaines régions (ex: UE) ont des restrictions sur les paris Twitch"
-                                + scope_info,
-                                extra={
-                                    "emoji": ":bulb:",
-                                    "event": Events.BET_FAILED,
-                                },
-                            )
-                        else:
-                            # Message plus informatif si le message d'erreur est vide
-                            if not error_message:
-                                error_display = f"error code: {error_code} (message non fourni par Twitch)"
-                            else:
-                                error_display = f"error code: {error_code}, message: {error_message}"
-                            
-                            logger.error(
-                                f"Failed to place bet, {error_display}",
-                                extra={
-                                    "emoji": ":four_leaf_clover:",
-                                    "event": Events.BET_FAILED,
-                                },
-                            )
+                    })
+                    return json_data
                 else:
                     logger.info(
                         f"Bet won't be placed as the amount {_millify(decision['amount'])} is less than the minimum required 10",
@@ -1516,6 +1406,124 @@ class Twitch(object):
                     "event": Events.BET_FAILED,
                 },
             )
+        return None
+
+    def _on_prediction_response(self, response):
+        if (
+            "data" in response
+            and "makePrediction" in response["data"]
+            and "error" in response["data"]["makePrediction"]
+            and response["data"]["makePrediction"]["error"] is not None
+        ):
+            error_info = response["data"]["makePrediction"]["error"]
+            error_code = str(error_info.get("code", "UNKNOWN")).upper()
+            error_message = str(error_info.get("message", "")).strip()
+            
+            # Log full error for debugging if message is empty
+            if not error_message:
+                logger.debug(f"Full error response: {error_info}")
+            
+            # Normaliser le message pour la comparaison (lowercase)
+            error_message_lower = error_message.lower() if error_message else ""
+            
+            # Détecter les erreurs de blocage régional (codes d'erreur Twitch connus)
+            # Codes d'erreur possibles pour restrictions géographiques :
+            # - GEOBLOCKED, REGION_BLOCKED, GEOGRAPHIC_RESTRICTION
+            # - UNAVAILABLE_IN_REGION, NOT_AVAILABLE_IN_YOUR_REGION
+            # - PREDICTION_NOT_AVAILABLE (peut être lié à la région)
+            # - REGION_LOCKED (nouveau code détecté)
+            # Vérifier d'abord le code d'erreur explicite
+            explicit_region_codes = ["REGION_LOCKED", "REGION_BLOCKED", "GEOBLOCKED", 
+                                      "GEOGRAPHIC_RESTRICTION", "UNAVAILABLE_IN_REGION"]
+            
+            # Vérifier des messages explicites dans le message d'erreur
+            explicit_region_messages = [
+                "not available in your region",
+                "not available in this region",
+                "geographic restriction",
+                "region locked",
+                "blocked in your region"
+            ]
+            
+            # Détecter blocage régional seulement si code explicite OU message explicite
+            is_code_explicit = error_code in explicit_region_codes or any(code in error_code for code in ["REGION_LOCKED", "REGION_BLOCKED", "GEOBLOCKED"])
+            is_message_explicit = any(msg in error_message_lower for msg in explicit_region_messages)
+            
+            is_region_blocked = (
+                is_code_explicit or is_message_explicit or
+                # Fallback pour codes moins explicites mais probablement régionaux
+                (("REGION" in error_code and "LOCKED" in error_code) or
+                 ("GEO" in error_code and "BLOCKED" in error_code))
+            )
+            
+            if is_region_blocked:
+                # Message plus informatif si le message d'erreur est vide
+                if not error_message:
+                    error_display = f"Code: {error_code} (message non fourni par Twitch)"
+                else:
+                    error_display = f"Code: {error_code}, Message: {error_message}"
+                
+                logger.error(
+                    f"❌ Blocage régional détecté pour les paris! {error_display}",
+                    extra={
+                        "emoji": ":no_entry_sign:",
+                        "event": Events.BET_FAILED,
+                    },
+                )
+                
+                # Vérifier les scopes du token pour diagnostiquer
+                scope_validation = self.twitch_login.validate_token_scopes()
+                scope_info = ""
+                if scope_validation and scope_validation.get("valid"):
+                    scopes = scope_validation.get("scopes", [])
+                    required_scopes = ["channel:read:predictions", "channel:manage:predictions"]
+                    missing_scopes = [s for s in required_scopes if s not in scopes]
+                    
+                    if missing_scopes:
+                        scope_info = (
+                            f"\n   ⚠️ PROBLÈME DÉTECTÉ: Votre token OAuth manque les scopes:\n"
+                            f"      - {', '.join(missing_scopes)}\n"
+                            f"   → Régénérez votre token sur https://twitchtokengenerator.com/\n"
+                        )
+                    else:
+                        scope_info = (
+                            f"\n   ✅ Votre token OAuth a les bons scopes\n"
+                            f"   → Le problème vient probablement de la RÉGION du serveur Railway\n"
+                        )
+                
+                logger.warning(
+                    "💡 Solutions possibles:\n"
+                    "   1. Vérifiez que votre token OAuth contient les scopes:\n"
+                    "      - channel:read:predictions\n"
+                    "      - channel:manage:predictions\n"
+                    "   2. 🚨 RÉGION UE (Amsterdam) : Twitch bloque souvent les prédictions dans l'UE\n"
+                    "      → Solution Fly.io: Changez la région dans fly.toml (primary_region)\n"
+                    "      → Régions recommandées: 'iad' (US), 'sin' (Singapour), 'hnd' (Japon)\n"
+                    "      → Command: fly regions set iad\n"
+                    "   3. Si vous utilisez Railway, changez la région du service\n"
+                    "      → Régions recommandées: US (Washington, Oregon)\n"
+                    "   4. Alternative: Utilisez un VPN (mais moins stable pour un serveur)\n"
+                    "   5. Certaines régions (ex: UE) ont des restrictions sur les paris Twitch"
+                    + scope_info,
+                    extra={
+                        "emoji": ":bulb:",
+                        "event": Events.BET_FAILED,
+                    },
+                )
+            else:
+                # Message plus informatif si le message d'erreur est vide
+                if not error_message:
+                    error_display = f"error code: {error_code} (message non fourni par Twitch)"
+                else:
+                    error_display = f"error code: {error_code}, message: {error_message}"
+                
+                logger.error(
+                    f"Failed to place bet, {error_display}",
+                    extra={
+                        "emoji": ":four_leaf_clover:",
+                        "event": Events.BET_FAILED,
+                    },
+                )
 
     def claim_bonus(self, streamer, claim_id):
         if Settings.logger.less is False:
@@ -1524,11 +1532,10 @@ class Twitch(object):
                 extra={"emoji": ":gift:", "event": Events.BONUS_CLAIM},
             )
 
-        json_data = copy.deepcopy(GQLOperations.ClaimCommunityPoints)
-        json_data["variables"] = {
+        json_data = GQLTemplates.ClaimCommunityPoints.build({
             "input": {"channelID": streamer.channel_id, "claimID": claim_id}
-        }
-        self.post_gql_request(json_data)
+        })
+        self.gql_batcher.request(json_data)
 
     # === MOMENTS === #
     def claim_moment(self, streamer, moment_id):
@@ -1539,16 +1546,17 @@ class Twitch(object):
                        "event": Events.MOMENT_CLAIM},
             )
 
-        json_data = copy.deepcopy(GQLOperations.CommunityMomentCallout_Claim)
-        json_data["variables"] = {"input": {"momentID": moment_id}}
+        json_data = GQLTemplates.CommunityMomentCallout_Claim.build(
+            {"input": {"momentID": moment_id}}
+        )
         self.post_gql_request(json_data)
 
     # === CAMPAIGNS / DROPS / INVENTORY === #
     def __get_campaign_ids_from_streamer(self, streamer):
-        json_data = copy.deepcopy(
-            GQLOperations.DropsHighlightService_AvailableDrops)
-        json_data["variables"] = {"channelID": streamer.channel_id}
-        response = self.post_gql_request(json_data)
+        json_data = GQLTemplates.DropsHighlightService_AvailableDrops.build(
+            {"channelID": streamer.channel_id}
+        )
+        response = self.gql_cache.fetch(json_data, self.gql_batcher.request)
         try:
             # Protection contre response None ou malformée
             if response is None or response == {}:
@@ -1571,7 +1579,7 @@ class Twitch(object):
             return []
 
     def __get_inventory(self):
-        response = self.post_gql_request(GQLOperations.Inventory)
+        response = self.post_gql_request(GQLTemplates.Inventory.build())
         try:
             return (
                 response["data"]["currentUser"]["inventory"] if response != {} else {}
@@ -1580,7 +1588,7 @@ class Twitch(object):
             return {}
 
     def __get_drops_dashboard(self, status=None):
-        response = self.post_gql_request(GQLOperations.ViewerDropsDashboard)
+        response = self.post_gql_request(GQLTemplates.ViewerDropsDashboard.build())
         campaigns = (
             response.get("data", {})
             .get("currentUser", {})
@@ -1601,12 +1609,10 @@ class Twitch(object):
         for chunk in chunks:
             json_data = []
             for campaign in chunk:
-                json_data.append(copy.deepcopy(
-                    GQLOperations.DropCampaignDetails))
-                json_data[-1]["variables"] = {
+                json_data.append(GQLTemplates.DropCampaignDetails.build({
                     "dropID": campaign["id"],
                     "channelLogin": f"{self.twitch_login.get_user_id()}",
-                }
+                }))
 
             response = self.post_gql_request(json_data)
             if not isinstance(response, list):
@@ -1649,9 +1655,8 @@ class Twitch(object):
             f"Claim {drop}", extra={"emoji": ":package:", "event": Events.DROP_CLAIM}
         )
 
-        json_data = copy.deepcopy(GQLOperations.DropsPage_ClaimDropRewards)
-        json_data["variables"] = {
-            "input": {"dropInstanceID": drop.drop_instance_id}}
+        json_data = GQLTemplates.DropsPage_ClaimDropRewards.build({
+            "input": {"dropInstanceID": drop.drop_instance_id}})
         response = self.post_gql_request(json_data)
         try:
             # response["data"]["claimDropRewards"] can be null and respose["data"]["errors"] != []
@@ -1706,40 +1711,15 @@ class Twitch(object):
 
                     # Get full details from current ACTIVE campaigns
                     # Use dashboard so we can explore new drops not currently active in our Inventory
-                    campaigns_details = self.__get_campaigns_details(
-                        self.__get_drops_dashboard(status="ACTIVE")
+                    campaigns = self._build_campaigns(
+                        self.__get_campaigns_details(
+                            self.__get_drops_dashboard(status="ACTIVE")
+                        )
                     )
-                    campaigns = []
-
-                    # Going to clear array and structure. Remove all the timeBasedDrops expired or not started yet
-                    for index in range(0, len(campaigns_details)):
-                        if campaigns_details[index] is not None:
-                            campaign = Campaign(campaigns_details[index])
-                            if campaign.dt_match is True:
-                                # Remove all the drops already claimed or with dt not matching
-                                campaign.clear_drops()
-                                if campaign.drops != []:
-                                    campaigns.append(campaign)
-                        else:
-                            continue
 
                 # Divide et impera :)
                 campaigns = self.__sync_campaigns(campaigns)
-
-                # Check if user It's currently streaming the same game present in campaigns_details
-                for i in range(0, len(streamers)):
-                    if streamers[i].drops_condition() is True:
-                        # yes! The streamer[i] have the drops_tags enabled and we It's currently stream a game with campaign active!
-                        # With 'campaigns_ids' we are also sure that this streamer have the campaign active.
-                        # yes! The streamer[index] have the drops_tags enabled and we It's currently stream a game with campaign active!
-                        streamers[i].stream.campaigns = list(
-                            filter(
-                                lambda x: x.drops != []
-                                and x.game == streamers[i].stream.game
-                                and x.id in streamers[i].stream.campaigns_ids,
-                                campaigns,
-                            )
-                        )
+                self._assign_campaigns(streamers, campaigns)
 
             except (ValueError, KeyError, requests.exceptions.ConnectionError) as e:
                 logger.error(f"Error while syncing inventory: {e}")
@@ -1748,14 +1728,47 @@ class Twitch(object):
 
             self.__chuncked_sleep(60, chunk_size=chunk_size)
 
+    @staticmethod
+    def _build_campaigns(campaigns_details):
+        campaigns = []
+        # Going to clear array and structure. Remove all the timeBasedDrops expired or not started yet
+        for index in range(0, len(campaigns_details)):
+            if campaigns_details[index] is not None:
+                campaign = Campaign(campaigns_details[index])
+                if campaign.dt_match is True:
+                    # Remove all the drops already claimed or with dt not matching
+                    campaign.clear_drops()
+                    if campaign.drops != []:
+                        campaigns.append(campaign)
+        return campaigns
+
+    @staticmethod
+    def _assign_campaigns(streamers, campaigns):
+        # Check if user It's currently streaming the same game present in campaigns_details
+        for i in range(0, len(streamers)):
+            if streamers[i].drops_condition() is True:
+                # yes! The streamer[i] have the drops_tags enabled and we It's currently stream a game with campaign active!
+                # With 'campaigns_ids' we are also sure that this streamer have the campaign active.
+                streamers[i].stream.campaigns = list(
+                    filter(
+                        lambda x: x.drops != []
+                        and x.game == streamers[i].stream.game
+                        and x.id in streamers[i].stream.campaigns_ids,
+                        campaigns,
+                    )
+                )
+                # Les campagnes font partie de la priorité du minute watcher
+                streamers[i].update_watch_priority()
+
     def contribute_to_community_goals(self, streamer):
         # Don't bother doing the request if no goal is currently started or in stock
         if any(
             goal.status == "STARTED" and goal.is_in_stock
             for goal in streamer.community_goals.values()
         ):
-            json_data = copy.deepcopy(GQLOperations.UserPointsContribution)
-            json_data["variables"] = {"channelLogin": streamer.username}
+            json_data = GQLTemplates.UserPointsContribution.build(
+                {"channelLogin": streamer.username}
+            )
             response = self.post_gql_request(json_data)
             user_goal_contributions = response["data"]["user"]["channel"]["self"][
                 "communityPoints"
@@ -1796,16 +1809,14 @@ class Twitch(object):
                         )
 
     def contribute_to_community_goal(self, streamer, goal_id, title, amount):
-        json_data = copy.deepcopy(
-            GQLOperations.ContributeCommunityPointsCommunityGoal)
-        json_data["variables"] = {
+        json_data = GQLTemplates.ContributeCommunityPointsCommunityGoal.build({
             "input": {
                 "amount": amount,
                 "channelID": streamer.channel_id,
                 "goalID": goal_id,
                 "transactionID": token_hex(16),
             }
-        }
+        })
 
         response = self.post_gql_request(json_data)
 
@@ -1819,3 +1830,4 @@ class Twitch(object):
                 f"Contributed {amount} channel points to community goal '{title}'"
             )
             streamer.channel_points -= amount
+            streamer.update_watch_priority()
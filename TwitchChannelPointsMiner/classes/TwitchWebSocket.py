@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 import time
 
 from websocket import WebSocketApp, WebSocketConnectionClosedException
@@ -46,6 +47,13 @@ class TwitchWebSocket(WebSocketApp):
         nonce = create_nonce()
         self.send({"type": "LISTEN", "nonce": nonce, "data": data})
 
+    def unlisten(self, topic, auth_token=None):
+        data = {"topics": [str(topic)]}
+        if topic.is_user_topic() and auth_token is not None:
+            data["auth_token"] = auth_token
+        nonce = create_nonce()
+        self.send({"type": "UNLISTEN", "nonce": nonce, "data": data})
+
     def ping(self):
         self.send({"type": "PING"})
         self.last_ping = time.time()
@@ -63,3 +71,44 @@ class TwitchWebSocket(WebSocketApp):
 
     def elapsed_last_ping(self):
         return (time.time() - self.last_ping) // 60
+
+
+class ReplayTwitchWebSocket(TwitchWebSocket):
+    """
+    WebSocket PubSub sans réseau : rejoue les messages d'une cassette avec leur
+    rythme d'origine (divisé par cassette.speed). Seule la connexion #0 rejoue,
+    les messages sont de toute façon routés par channel_id.
+    """
+
+    def __init__(self, index, parent_pool, cassette, *args, **kw):
+        super().__init__(index, parent_pool, *args, **kw)
+        self.cassette = cassette
+        self.__closed = threading.Event()
+
+    def run_forever(self, *args, **kwargs):
+        self.on_open(self)
+        messages = self.cassette.pubsub_messages() if self.index == 0 else []
+        started_at = time.time()
+        offset = messages[0]["t"] if messages else 0
+        for entry in messages:
+            if self.cassette.speed > 0:
+                delay = (
+                    started_at
+                    + (entry["t"] - offset) / self.cassette.speed
+                    - time.time()
+                )
+                if delay > 0 and self.__closed.wait(delay) is True:
+                    break
+            if self.__closed.is_set():
+                break
+            self.on_message(self, entry["message"])
+        self.__closed.wait()
+
+    def send(self, request):
+        logger.debug(f"#{self.index} - Send (replay): {request}")
+        if request.get("type") == "PING":
+            self.last_pong = time.time()
+
+    def close(self, **kwargs):
+        self.is_closed = True
+        self.__closed.set()
@@ -0,0 +1,181 @@
+"""
+WatchPriorityIndex - Streamers regardables indexés par priorité, mis à jour par événement
+Chaque changement d'état (online/offline, points, multiplicateurs, drops, watch
+streak) repositionne le streamer dans des listes triées : choisir les 2 streams
+à regarder ne parcourt plus ni ne trie toute la liste des chaînes suivies.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from TwitchChannelPointsMiner.classes.Settings import Priority
+
+logger = logging.getLogger(__name__)
+
+# Délai après le passage en ligne avant d'envoyer des minutes regardées
+ONLINE_GRACE = 30
+# Twitch ne crédite que 2 streams regardés à la fois
+MAX_WATCHING = 2
+
+# Priority -> liste triée parcourue pour cette priorité
+PRIORITY_LISTS = {
+    Priority.ORDER: "online",
+    Priority.POINTS_ASCENDING: "points_asc",
+    Priority.POINTS_DESCENDING: "points_desc",
+    Priority.STREAK: "streak",
+    Priority.DROPS: "drops",
+    Priority.SUBSCRIBED: "multipliers",
+}
+
+
+class WatchPriorityIndex(object):
+    """
+    Listes triées (bisect) des streamers en ligne, une par priorité. Les clés
+    se terminent par (rang, username) : à égalité, l'ordre d'origine prime,
+    comme avec les tris stables du parcours complet.
+    """
+
+    def __init__(self, reconcile_interval: float = 600):
+        """
+        Args:
+            reconcile_interval: Intervalle de la réindexation complète de
+                sécurité (rattrape une mise à jour manquée)
+        """
+        self.reconcile_interval = reconcile_interval
+        self.reconciled_at = time.time()
+
+        self.updates = 0
+        self.rebuilds = 0
+
+        self.__lock = threading.Lock()
+        self.__streamers: Dict[str, object] = {}
+        self.__ranks: Dict[str, int] = {}
+        self.__keys: Dict[str, dict] = {}
+        self.__lists: Dict[str, list] = {name: [] for name in PRIORITY_LISTS.values()}
+
+    def __len__(self) -> int:
+        return len(self.__streamers)
+
+    def add(self, streamer, rank: int) -> None:
+        with self.__lock:
+            self.__streamers[streamer.username] = streamer
+            self.__ranks[streamer.username] = rank
+            self.__reindex(streamer)
+        streamer.watch_index = self
+
+    def update(self, streamer) -> None:
+        """À appeler après tout changement d'état qui influe sur la priorité."""
+        with self.__lock:
+            if streamer.username not in self.__streamers:
+                return
+            self.__reindex(streamer)
+            self.updates += 1
+
+    def rebuild(self) -> None:
+        with self.__lock:
+            for streamer in self.__streamers.values():
+                self.__reindex(streamer)
+            self.rebuilds += 1
+            self.reconciled_at = time.time()
+
+    def reconcile(self) -> None:
+        if time.time() - self.reconciled_at >= self.reconcile_interval:
+            self.rebuild()
+
+    def watchable(self) -> List:
+        """Streamers en ligne depuis plus de ONLINE_GRACE secondes, dans l'ordre d'origine."""
+        now = time.time()
+        with self.__lock:
+            return [
+                self.__streamers[key[-1]]
+                for key in self.__lists["online"]
+                if self.__is_watchable(self.__streamers[key[-1]], now)
+            ]
+
+    def select(self, priority: List[Priority], limit: int = MAX_WATCHING) -> List:
+        """Les `limit` streamers à regarder, priorités appliquées dans l'ordre."""
+        now = time.time()
+        selected, usernames = [], set()
+        with self.__lock:
+            for prior in priority:
+                if len(selected) >= limit:
+                    break
+                name = PRIORITY_LISTS.get(prior)
+                if name is None:
+                    continue
+                for key in self.__lists[name]:
+                    streamer = self.__streamers[key[-1]]
+                    if streamer.username in usernames:
+                        continue
+                    if not self.__is_watchable(streamer, now):
+                        continue
+                    if prior == Priority.STREAK and not self.__streak_window(
+                        streamer, now
+                    ):
+                        continue
+                    selected.append(streamer)
+                    usernames.add(streamer.username)
+                    if len(selected) >= limit:
+                        break
+        return selected
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "streamers": len(self.__streamers),
+            "online": len(self.__lists["online"]),
+            "updates": self.updates,
+            "rebuilds": self.rebuilds,
+        }
+
+    @staticmethod
+    def __is_watchable(streamer, now: float) -> bool:
+        return streamer.is_online is True and (
+            streamer.online_at == 0 or (now - streamer.online_at) > ONLINE_GRACE
+        )
+
+    @staticmethod
+    def __streak_window(streamer, now: float) -> bool:
+        """
+        Viewers receive points for returning for x consecutive streams.
+        Each stream must be at least 10 minutes long and it must have been at least 30 minutes since the last stream ended.
+        """
+        return streamer.offline_at == 0 or ((now - streamer.offline_at) // 60) > 30
+
+    def __index_keys(self, streamer) -> dict:
+        if streamer.is_online is not True:
+            return {}
+        ident = (self.__ranks[streamer.username], streamer.username)
+        keys = {
+            "online": ident,
+            "points_asc": (streamer.channel_points,) + ident,
+            "points_desc": (-streamer.channel_points,) + ident,
+        }
+        if (
+            streamer.settings.watch_streak is True
+            and streamer.stream.watch_streak_missing is True
+            # fix #425
+            and streamer.stream.minute_watched < 7
+        ):
+            keys["streak"] = ident
+        if streamer.drops_condition() is True:
+            keys["drops"] = ident
+        if streamer.viewer_has_points_multiplier():
+            keys["multipliers"] = (-streamer.total_points_multiplier(),) + ident
+        return keys
+
+    def __reindex(self, streamer) -> None:
+        old = self.__keys.get(streamer.username, {})
+        new = self.__index_keys(streamer)
+        for name, key in old.items():
+            if new.get(name) != key:
+                entries = self.__lists[name]
+                position = bisect.bisect_left(entries, key)
+                if position < len(entries) and entries[position] == key:
+                    del entries[position]
+        for name, key in new.items():
+            if old.get(name) != key:
+                bisect.insort(self.__lists[name], key)
+        self.__keys[streamer.username] = new
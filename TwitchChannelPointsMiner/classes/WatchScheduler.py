@@ -0,0 +1,94 @@
+"""
+WatchScheduler - Échéance indépendante par stream regardé pour les minute-watched
+Chaque stream a sa propre cadence : un CDN lent ne retarde plus l'autre stream.
+L'écart entre l'échéance prévue et l'envoi réel (drift) est mesuré.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WatchScheduler(object):
+    """Échéances {username: deadline}, thread-safe. Un stream n'a jamais deux envois en vol."""
+
+    def __init__(self, interval: float = 20, late_after: float = 5):
+        """
+        Args:
+            interval: Intervalle entre deux minute-watched d'un même stream
+            late_after: Drift au-delà duquel un envoi est compté en retard
+        """
+        self.interval = interval
+        self.late_after = late_after
+
+        self.sends = 0
+        self.late = 0
+        self.total_drift = 0.0
+        self.max_drift = 0.0
+
+        self.__deadlines: Dict[str, float] = {}
+        self.__in_flight = set()
+        self.__wanted = set()
+        self.__lock = threading.Lock()
+
+    def sync(self, usernames: Iterable[str]) -> None:
+        """Aligne les échéances sur les streams sélectionnés (nouveau = dû immédiatement)."""
+        now = time.time()
+        with self.__lock:
+            self.__wanted = set(usernames)
+            for username in list(self.__deadlines):
+                if username not in self.__wanted:
+                    del self.__deadlines[username]
+            for username in self.__wanted:
+                if (
+                    username not in self.__deadlines
+                    and username not in self.__in_flight
+                ):
+                    self.__deadlines[username] = now
+
+    def pop_due(self) -> List[Tuple[str, float]]:
+        """Retourne [(username, échéance)] à envoyer maintenant et les marque en vol."""
+        now = time.time()
+        with self.__lock:
+            due = [
+                (username, deadline)
+                for username, deadline in self.__deadlines.items()
+                if deadline <= now
+            ]
+            for username, _ in due:
+                del self.__deadlines[username]
+                self.__in_flight.add(username)
+        return due
+
+    def done(self, username: str, deadline: float, started_at: float) -> None:
+        """Enregistre le drift de l'envoi et programme la prochaine échéance."""
+        drift = max(started_at - deadline, 0.0)
+        with self.__lock:
+            self.__in_flight.discard(username)
+            self.sends += 1
+            self.total_drift += drift
+            self.max_drift = max(self.max_drift, drift)
+            if drift > self.late_after:
+                self.late += 1
+            if username in self.__wanted:
+                # Cadence calée sur l'échéance prévue, sans rattraper les créneaux manqués
+                self.__deadlines[username] = max(deadline + self.interval, time.time())
+        if drift > self.late_after:
+            logger.debug(f"Minute watched for {username} sent {drift:.1f}s late")
+
+    def next_deadline(self) -> Optional[float]:
+        with self.__lock:
+            return min(self.__deadlines.values()) if self.__deadlines else None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "sends": self.sends,
+            "late": self.late,
+            "avg_drift": round(self.total_drift / self.sends, 3)
+            if self.sends > 0
+            else 0.0,
+            "max_drift": round(self.max_drift, 3),
+        }
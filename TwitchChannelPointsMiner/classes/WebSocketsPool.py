@@ -3,34 +3,55 @@ import logging
 import random
 import time
 # import os
-from threading import Thread, Timer
+from threading import RLock, Thread, Timer
 # from pathlib import Path
 
-from dateutil import parser
-
 from TwitchChannelPointsMiner.classes.entities.CommunityGoal import CommunityGoal
 from TwitchChannelPointsMiner.classes.entities.EventPrediction import EventPrediction
 from TwitchChannelPointsMiner.classes.entities.Message import Message
+from TwitchChannelPointsMiner.classes.entities.PubsubTopic import PubsubTopic
 from TwitchChannelPointsMiner.classes.entities.Raid import Raid
 from TwitchChannelPointsMiner.classes.Settings import Events, Settings
-from TwitchChannelPointsMiner.classes.TwitchWebSocket import TwitchWebSocket
-from TwitchChannelPointsMiner.constants import WEBSOCKET
-from TwitchChannelPointsMiner.utils import (
-    get_streamer_index,
-    internet_connection_available,
+from TwitchChannelPointsMiner.classes.TwitchWebSocket import (
+    ReplayTwitchWebSocket,
+    TwitchWebSocket,
 )
+from TwitchChannelPointsMiner.constants import WEBSOCKET
+from TwitchChannelPointsMiner.utils import internet_connection_available
 
 logger = logging.getLogger(__name__)
 
+TOPICS_PER_CONNECTION = 50
+
 
 class WebSocketsPool:
-    __slots__ = ["ws", "twitch", "streamers", "events_predictions", "optimal_timing_system", "smart_bet_timing"]
+    __slots__ = [
+        "ws",
+        "twitch",
+        "streamers",
+        "events_predictions",
+        "optimal_timing_system",
+        "smart_bet_timing",
+        "lock",
+        "channels",
+        "listens",
+        "unlistens",
+        "repacks",
+    ]
 
     def __init__(self, twitch, streamers, events_predictions):
+        # Une connexion retirée par le regroupement laisse None à son index
         self.ws = []
         self.twitch = twitch
         self.streamers = streamers
         self.events_predictions = events_predictions
+        self.lock = RLock()
+        # channel_id -> Streamer : résolution des messages PubSub, indépendante de
+        # l'ordre de self.streamers (rempli en parallèle pendant le démarrage)
+        self.channels = {}
+        self.listens = 0
+        self.unlistens = 0
+        self.repacks = 0
         
         # Initialise le système de timing optimal (optionnel)
         self.optimal_timing_system = None
@@ -64,12 +85,122 @@ class WebSocketsPool:
     """
 
     def submit(self, topic):
-        # Check if we need to create a new WebSocket instance
-        if self.ws == [] or len(self.ws[-1].topics) >= 50:
-            self.ws.append(self.__new(len(self.ws)))
-            self.__start(-1)
+        with self.lock:
+            if any(topic in ws.topics for ws in self.ws if ws is not None):
+                return
+            self.__submit(self.__available(), topic)
+            self.listens += 1
+
+    def remove(self, topic):
+        with self.lock:
+            for ws in self.ws:
+                if ws is None or topic not in ws.topics:
+                    continue
+                ws.topics.remove(topic)
+                if topic in ws.pending_topics:
+                    ws.pending_topics.remove(topic)
+                if ws.is_opened is True:
+                    ws.unlisten(topic, self.twitch.twitch_login.get_auth_token())
+                self.unlistens += 1
+                return
 
-        self.__submit(-1, topic)
+    # === TOPICS PAR STREAMER === #
+    # Hors ligne, un streamer ne garde que video-playback-by-id (stream-up / stream-down) :
+    # le nombre de connexions suit les chaînes en live, pas les chaînes suivies.
+    def admit(self, streamer):
+        """Rend le streamer joignable par on_message (avant tout abonnement)."""
+        with self.lock:
+            self.channels[str(streamer.channel_id)] = streamer
+
+    def get_streamer(self, channel_id):
+        with self.lock:
+            return self.channels.get(str(channel_id))
+
+    def track(self, streamer):
+        """Abonne le topic de présence ; les topics du live suivent set_online / set_offline."""
+        self.admit(streamer)
+        streamer.pubsub = self
+        self.submit(PubsubTopic("video-playback-by-id", streamer=streamer))
+        if streamer.is_online is True:
+            self.activate(streamer)
+
+    def activate(self, streamer):
+        with self.lock:
+            for topic in self.__stream_topics(streamer):
+                self.submit(topic)
+
+    def deactivate(self, streamer):
+        with self.lock:
+            for topic in self.__stream_topics(streamer):
+                self.remove(topic)
+            self.__repack()
+
+    def stats(self):
+        with self.lock:
+            connections = [ws for ws in self.ws if ws is not None]
+            return {
+                "connections": len(connections),
+                "topics": sum(len(ws.topics) for ws in connections),
+                "listens": self.listens,
+                "unlistens": self.unlistens,
+                "repacks": self.repacks,
+            }
+
+    @staticmethod
+    def __stream_topics(streamer):
+        topics = []
+        if streamer.settings.follow_raid is True:
+            topics.append(PubsubTopic("raid", streamer=streamer))
+        if streamer.settings.make_predictions is True:
+            topics.append(PubsubTopic("predictions-channel-v1", streamer=streamer))
+        if streamer.settings.claim_moments is True:
+            topics.append(PubsubTopic("community-moments-channel-v1", streamer=streamer))
+        if streamer.settings.community_goals is True:
+            topics.append(PubsubTopic("community-points-channel-v1", streamer=streamer))
+        return topics
+
+    def __available(self):
+        """Index d'une connexion avec de la place, créée (dans un index libre) si besoin."""
+        for index, ws in enumerate(self.ws):
+            if ws is not None and len(ws.topics) < TOPICS_PER_CONNECTION:
+                return index
+
+        index = self.ws.index(None) if None in self.ws else len(self.ws)
+        if index == len(self.ws):
+            self.ws.append(None)
+        self.ws[index] = self.__new(index)
+        self.__start(index)
+        return index
+
+    def __repack(self):
+        """
+        Ferme la connexion la moins remplie tant que ses topics tiennent dans
+        les autres. La #0 (topics utilisateur, rejeu de cassette) reste ouverte.
+        """
+        while True:
+            connections = [ws for ws in self.ws if ws is not None]
+            candidates = [ws for ws in connections if ws.index != 0]
+            if candidates == []:
+                return
+            sparsest = min(candidates, key=lambda ws: len(ws.topics))
+            room = sum(
+                TOPICS_PER_CONNECTION - len(ws.topics)
+                for ws in connections
+                if ws is not sparsest
+            )
+            if len(sparsest.topics) > room:
+                return
+
+            # Abonnés ailleurs avant la fermeture : pas de trou dans les événements
+            self.ws[sparsest.index] = None
+            for topic in sparsest.topics:
+                self.__submit(self.__available(), topic)
+            sparsest.forced_close = True
+            sparsest.close()
+            self.repacks += 1
+            logger.debug(
+                f"#{sparsest.index} - PubSub connection closed, {len(sparsest.topics)} topic(s) moved"
+            )
 
     def __submit(self, index, topic):
         # Topic in topics should never happen. Anyway prevent any types of duplicates
@@ -82,6 +213,16 @@ class WebSocketsPool:
             self.ws[index].listen(topic, self.twitch.twitch_login.get_auth_token())
 
     def __new(self, index):
+        cassette = self.twitch.transport.cassette
+        if cassette is not None and cassette.is_replaying:
+            return ReplayTwitchWebSocket(
+                index=index,
+                parent_pool=self,
+                cassette=cassette,
+                url=WEBSOCKET,
+                on_message=WebSocketsPool.on_message,
+                on_open=WebSocketsPool.on_open,
+            )
         return TwitchWebSocket(
             index=index,
             parent_pool=self,
@@ -110,17 +251,20 @@ class WebSocketsPool:
         thread_ws.start()
 
     def end(self):
-        for index in range(0, len(self.ws)):
-            self.ws[index].forced_close = True
-            self.ws[index].close()
+        for ws in list(self.ws):
+            if ws is not None:
+                ws.forced_close = True
+                ws.close()
 
     @staticmethod
     def on_open(ws):
         def run():
-            ws.is_opened = True
+            with ws.parent_pool.lock:
+                ws.is_opened = True
+                pending_topics, ws.pending_topics = ws.pending_topics, []
             ws.ping()
 
-            for topic in ws.pending_topics:
+            for topic in pending_topics:
                 ws.listen(topic, ws.twitch.twitch_login.get_auth_token())
 
             while ws.is_closed is False:
@@ -167,7 +311,7 @@ class WebSocketsPool:
 
             if ws.forced_close is False:
                 logger.info(
-                    f"#{ws.index} - Reconnecting to Twitch PubSub server in ~60 seconds"
+                    f"#{ws.index} - Reconnecting to Twitch PubSub server in ~30 seconds"
                 )
                 time.sleep(30)
 
@@ -180,18 +324,25 @@ class WebSocketsPool:
 
                 # Why not create a new ws on the same array index? Let's try.
                 self = ws.parent_pool
-                # Create a new connection.
-                self.ws[ws.index] = self.__new(ws.index)
-
-                self.__start(ws.index)  # Start a new thread.
-                time.sleep(30)
-
-                for topic in ws.topics:
-                    self.__submit(ws.index, topic)
+                with self.lock:
+                    # Connexion retirée par le regroupement pendant l'attente
+                    if self.ws[ws.index] is not ws:
+                        return
+                    # Create a new connection.
+                    new_ws = self.__new(ws.index)
+                    # Les topics suivent le slot : écoutés par on_open, sans second rejeu
+                    new_ws.topics = list(ws.topics)
+                    new_ws.pending_topics = list(ws.topics)
+                    self.ws[ws.index] = new_ws
+
+                    self.__start(ws.index)  # Start a new thread.
 
     @staticmethod
     def on_message(ws, message):
         logger.debug(f"#{ws.index} - Received: {message.strip()}")
+        cassette = ws.twitch.transport.cassette
+        if cassette is not None and cassette.is_recording:
+            cassette.record_pubsub(ws.index, message)
         response = json.loads(message)
 
         if response["type"] == "MESSAGE":
@@ -211,16 +362,18 @@ class WebSocketsPool:
             ws.last_message_timestamp = message.timestamp
             ws.last_message_type_channel = message.identifier
 
-            streamer_index = get_streamer_index(ws.streamers, message.channel_id)
-            if streamer_index != -1:
+            # Résolu une seule fois : l'objet reste le bon même si la liste bouge
+            streamer = ws.parent_pool.get_streamer(message.channel_id)
+            if streamer is not None:
                 try:
                     if message.topic == "community-points-user-v1":
                         if message.type in ["points-earned", "points-spent"]:
                             balance = message.data["balance"]["balance"]
-                            ws.streamers[streamer_index].channel_points = balance
+                            streamer.channel_points = balance
+                            streamer.update_watch_priority()
                             # Analytics switch
                             if Settings.enable_analytics is True:
-                                ws.streamers[streamer_index].persistent_series(
+                                streamer.persistent_series(
                                     event_type=message.data["point_gain"]["reason_code"]
                                     if message.type == "points-earned"
                                     else "Spent"
@@ -231,38 +384,34 @@ class WebSocketsPool:
                             reason_code = message.data["point_gain"]["reason_code"]
 
                             logger.info(
-                                f"+{earned} → {ws.streamers[streamer_index]} - Reason: {reason_code}.",
+                                f"+{earned} → {streamer} - Reason: {reason_code}.",
                                 extra={
                                     "emoji": ":rocket:",
                                     "event": Events.get(f"GAIN_FOR_{reason_code}"),
                                 },
                             )
-                            ws.streamers[streamer_index].update_history(
+                            streamer.update_history(
                                 reason_code, earned
                             )
                             # Analytics switch
                             if Settings.enable_analytics is True:
-                                ws.streamers[streamer_index].persistent_annotations(
+                                streamer.persistent_annotations(
                                     reason_code, f"+{earned} - {reason_code}"
                                 )
                         elif message.type == "claim-available":
                             ws.twitch.claim_bonus(
-                                ws.streamers[streamer_index],
+                                streamer,
                                 message.data["claim"]["id"],
                             )
 
                     elif message.topic == "video-playback-by-id":
                         # There is stream-up message type, but it's sent earlier than the API updates
                         if message.type == "stream-up":
-                            ws.streamers[streamer_index].stream_up = time.time()
+                            ws.twitch.presence.on_stream_up(streamer)
                         elif message.type == "stream-down":
-                            if ws.streamers[streamer_index].is_online is True:
-                                ws.streamers[streamer_index].set_offline()
+                            ws.twitch.presence.on_stream_down(streamer)
                         elif message.type == "viewcount":
-                            if ws.streamers[streamer_index].stream_up_elapsed():
-                                ws.twitch.check_streamer_online(
-                                    ws.streamers[streamer_index]
-                                )
+                            ws.twitch.presence.on_viewcount(streamer)
 
                     elif message.topic == "raid":
                         if message.type == "raid_update_v2":
@@ -270,15 +419,16 @@ class WebSocketsPool:
                                 message.message["raid"]["id"],
                                 message.message["raid"]["target_login"],
                             )
-                            ws.twitch.update_raid(ws.streamers[streamer_index], raid)
+                            ws.twitch.update_raid(streamer, raid)
 
                     elif message.topic == "community-moments-channel-v1":
                         if message.type == "active":
                             ws.twitch.claim_moment(
-                                ws.streamers[streamer_index], message.data["moment_id"]
+                                streamer, message.data["moment_id"]
                             )
 
                     elif message.topic == "predictions-channel-v1":
+                        from dateutil import parser
 
                         event_dict = message.data["event"]
                         event_id = event_dict["id"]
@@ -295,11 +445,11 @@ class WebSocketsPool:
                                     event_dict["prediction_window_seconds"]
                                 )
                                 # Reduce prediction window by 3/6s - Collect more accurate data for decision
-                                prediction_window_seconds = ws.streamers[
-                                    streamer_index
-                                ].get_prediction_window(prediction_window_seconds)
+                                prediction_window_seconds = streamer.get_prediction_window(
+                                    prediction_window_seconds
+                                )
                                 event = EventPrediction(
-                                    ws.streamers[streamer_index],
+                                    streamer,
                                     event_id,
                                     event_dict["title"],
                                     parser.parse(event_dict["created_at"]),
@@ -312,10 +462,9 @@ class WebSocketsPool:
                                 if ws.parent_pool.optimal_timing_system is not None:
                                     event.optimal_timing_system = ws.parent_pool.optimal_timing_system
                                 if (
-                                    ws.streamers[streamer_index].is_online
+                                    streamer.is_online
                                     and event.closing_bet_after(current_tmsp) > 0
                                 ):
-                                    streamer = ws.streamers[streamer_index]
                                     bet_settings = streamer.settings.bet
                                     if (
                                         bet_settings.minimum_points is None
@@ -505,7 +654,7 @@ class WebSocketsPool:
                                     },
                                 )
 
-                                ws.streamers[streamer_index].update_history(
+                                streamer.update_history(
                                     "PREDICTION", points["gained"]
                                 )
                                 
@@ -560,13 +709,13 @@ class WebSocketsPool:
 
                                 # Remove duplicate history records from previous message sent in community-points-user-v1
                                 if event_prediction.result["type"] == "REFUND":
-                                    ws.streamers[streamer_index].update_history(
+                                    streamer.update_history(
                                         "REFUND",
                                         -points["placed"],
                                         counter=-1,
                                     )
                                 elif event_prediction.result["type"] == "WIN":
-                                    ws.streamers[streamer_index].update_history(
+                                    streamer.update_history(
                                         "PREDICTION",
                                         -points["won"],
                                         counter=-1,
@@ -575,9 +724,7 @@ class WebSocketsPool:
                                 if event_prediction.result["type"]:
                                     # Analytics switch
                                     if Settings.enable_analytics is True:
-                                        ws.streamers[
-                                            streamer_index
-                                        ].persistent_annotations(
+                                        streamer.persistent_annotations(
                                             event_prediction.result["type"],
                                             f"{ws.events_predictions[event_id].title}",
                                         )
@@ -590,28 +737,28 @@ class WebSocketsPool:
                                     ws.parent_pool.smart_bet_timing.stop_monitoring(event_prediction.event_id)
                                 # Analytics switch
                                 if Settings.enable_analytics is True:
-                                    ws.streamers[streamer_index].persistent_annotations(
+                                    streamer.persistent_annotations(
                                         "PREDICTION_MADE",
                                         f"Decision: {event_prediction.bet.decision['choice']} - {event_prediction.title}",
                                     )
                     elif message.topic == "community-points-channel-v1":
                         if message.type == "community-goal-created":
                             # TODO Untested, hard to find this happening live
-                            ws.streamers[streamer_index].add_community_goal(
+                            streamer.add_community_goal(
                                 CommunityGoal.from_pubsub(message.data["community_goal"])
                             )
                         elif message.type == "community-goal-updated":
-                            ws.streamers[streamer_index].update_community_goal(
+                            streamer.update_community_goal(
                                 CommunityGoal.from_pubsub(message.data["community_goal"])
                             )
                         elif message.type == "community-goal-deleted":
                             # TODO Untested, not sure what the message format for this is,
                             #      https://github.com/sammwyy/twitch-ps/blob/master/main.js#L417
                             #      suggests that it should be just the entire, now deleted, goal model
-                            ws.streamers[streamer_index].delete_community_goal(message.data["community_goal"]["id"])
+                            streamer.delete_community_goal(message.data["community_goal"]["id"])
 
                         if message.type in ["community-goal-updated", "community-goal-created"]:
-                            ws.twitch.contribute_to_community_goals(ws.streamers[streamer_index])
+                            ws.twitch.contribute_to_community_goals(streamer)
 
                 except Exception:
                     logger.error(
@@ -9,6 +9,12 @@ class PubsubTopic(object):
     def is_user_topic(self):
         return self.streamer is None
 
+    def __eq__(self, other):
+        return isinstance(other, PubsubTopic) and str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
     def __str__(self):
         if self.is_user_topic():
             return f"{self.topic}.{self.user_id}"
@@ -2,6 +2,7 @@ import json
 import logging
 import time
 from base64 import b64encode
+from urllib.parse import quote
 
 from TwitchChannelPointsMiner.classes.Settings import Settings
 from TwitchChannelPointsMiner.constants import DROP_ID
@@ -20,7 +21,8 @@ class Stream(object):
         "campaigns_ids",
         "viewers_count",
         "spade_url",
-        "payload",
+        "__payload",
+        "__encoded_payload",
         "watch_streak_missing",
         "minute_watched",
         "__last_update",
@@ -46,9 +48,23 @@ class Stream(object):
 
         self.init_watch_streak()
 
-    def encode_payload(self) -> dict:
-        json_event = json.dumps(self.payload, separators=(",", ":"))
-        return {"data": (b64encode(json_event.encode("utf-8"))).decode("utf-8")}
+    @property
+    def payload(self):
+        return self.__payload
+
+    @payload.setter
+    def payload(self, payload):
+        # Le payload est toujours remplacé, jamais modifié en place
+        self.__payload = payload
+        self.__encoded_payload = None
+
+    def encode_payload(self) -> bytes:
+        """Corps urlencodé du POST spade (data=<base64>), calculé une fois par payload."""
+        if self.__encoded_payload is None:
+            json_event = json.dumps(self.__payload, separators=(",", ":"))
+            data = b64encode(json_event.encode("utf-8")).decode("ascii")
+            self.__encoded_payload = ("data=" + quote(data, safe="")).encode("ascii")
+        return self.__encoded_payload
 
     def update(self, broadcast_id, title, game, tags, viewers_count):
         self.broadcast_id = broadcast_id
@@ -99,6 +115,38 @@ class Stream(object):
         self.minute_watched = 0
         self.__minute_watched_timestamp = 0
 
+    def snapshot(self) -> dict:
+        """État sérialisable (JSON) pour un redémarrage à chaud."""
+        return {
+            "broadcast_id": self.broadcast_id,
+            "title": self.title,
+            "game": self.game,
+            "tags": self.tags,
+            "drops_tags": self.drops_tags,
+            "campaigns_ids": self.campaigns_ids,
+            "viewers_count": self.viewers_count,
+            "spade_url": self.spade_url,
+            "payload": self.payload,
+            "watch_streak_missing": self.watch_streak_missing,
+            "minute_watched": self.minute_watched,
+            "last_update": self.__last_update,
+        }
+
+    def restore(self, data: dict):
+        # last_update est conservé : une entrée trop ancienne sera revalidée par update_stream
+        self.broadcast_id = data.get("broadcast_id")
+        self.title = data.get("title")
+        self.game = data.get("game") or {}
+        self.tags = data.get("tags") or []
+        self.drops_tags = data.get("drops_tags", False)
+        self.campaigns_ids = data.get("campaigns_ids") or []
+        self.viewers_count = data.get("viewers_count", 0)
+        self.spade_url = data.get("spade_url")
+        self.payload = data.get("payload")
+        self.watch_streak_missing = data.get("watch_streak_missing", True)
+        self.minute_watched = data.get("minute_watched", 0)
+        self.__last_update = data.get("last_update", 0)
+
     def update_minute_watched(self):
         if self.__minute_watched_timestamp != 0:
             self.minute_watched += round(
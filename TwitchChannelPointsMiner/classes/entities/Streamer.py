@@ -5,7 +5,7 @@ import time
 from datetime import datetime
 from threading import Lock
 
-from TwitchChannelPointsMiner.classes.Chat import ChatPresence, ThreadChat
+from TwitchChannelPointsMiner.classes.Chat import ChatPresence
 from TwitchChannelPointsMiner.classes.entities.Bet import BetSettings, DelayMode
 from TwitchChannelPointsMiner.classes.entities.Stream import Stream
 from TwitchChannelPointsMiner.classes.Settings import Events, Settings
@@ -83,6 +83,9 @@ class Streamer(object):
         "viewer_is_mod",
         "activeMultipliers",
         "irc_chat",
+        "watch_index",
+        "schedule",
+        "pubsub",
         "stream",
         "raid",
         "history",
@@ -104,6 +107,9 @@ class Streamer(object):
         self.viewer_is_mod = False
         self.activeMultipliers = None
         self.irc_chat = None
+        self.watch_index = None
+        self.schedule = None
+        self.pubsub = None
 
         self.stream = Stream()
 
@@ -128,8 +134,15 @@ class Streamer(object):
         if self.is_online is True:
             self.offline_at = time.time()
             self.is_online = False
+            if self.schedule is not None:
+                self.schedule.observe_session(
+                    self.username, self.online_at, self.offline_at
+                )
+            if self.pubsub is not None:
+                self.pubsub.deactivate(self)
 
         self.toggle_chat()
+        self.update_watch_priority()
 
         logger.info(
             f"{self} is Offline!",
@@ -144,8 +157,13 @@ class Streamer(object):
             self.online_at = time.time()
             self.is_online = True
             self.stream.init_watch_streak()
+            if self.schedule is not None:
+                self.schedule.observe_online(self.username, self.online_at)
+            if self.pubsub is not None:
+                self.pubsub.activate(self)
 
         self.toggle_chat()
+        self.update_watch_priority()
 
         logger.info(
             f"{self} is Online!",
@@ -172,6 +190,36 @@ class Streamer(object):
 
         if reason_code == "WATCH_STREAK":
             self.stream.watch_streak_missing = False
+            self.update_watch_priority()
+
+    def update_watch_priority(self):
+        """Repositionne le streamer dans l'index du minute watcher (points, streak, drops...)."""
+        if self.watch_index is not None:
+            self.watch_index.update(self)
+
+    def snapshot(self) -> dict:
+        """État sérialisable (JSON) pour un redémarrage à chaud."""
+        return {
+            "channel_id": self.channel_id,
+            "channel_points": self.channel_points,
+            "is_online": self.is_online,
+            "online_at": self.online_at,
+            "offline_at": self.offline_at,
+            "stream_up": self.stream_up,
+            "stream": self.stream.snapshot(),
+        }
+
+    def restore(self, data: dict):
+        """Réhydrate depuis snapshot(), sans toggle_chat ni événement online/offline."""
+        self.channel_id = data.get("channel_id", "")
+        self.channel_points = data.get("channel_points", 0)
+        self.is_online = data.get("is_online", False)
+        self.online_at = data.get("online_at", 0)
+        self.offline_at = data.get("offline_at", 0)
+        self.stream_up = data.get("stream_up", 0)
+        # history reste propre à la session : le rapport de fin ne compte que ses gains
+        self.history = {}
+        self.stream.restore(data.get("stream") or {})
 
     def stream_up_elapsed(self):
         return self.stream_up == 0 or ((time.time() - self.stream_up) > 120)
@@ -263,20 +311,14 @@ class Streamer(object):
 
     def leave_chat(self):
         if self.irc_chat is not None:
-            self.irc_chat.stop()
-
-            # Recreate a new thread to start again
-            # raise RuntimeError("threads can only be started once")
-            self.irc_chat = ThreadChat(
-                self.irc_chat.username,
-                self.irc_chat.token,
-                self.username,
-            )
+            self.irc_chat.leave_chat(self.username)
+            self.irc_chat = None
 
     def __join_chat(self):
-        if self.irc_chat is not None:
-            if self.irc_chat.is_alive() is False:
-                self.irc_chat.start()
+        # Shared connection for every channel: joining is a cheap JOIN request
+        if self.irc_chat is None and Settings.irc_chat is not None:
+            self.irc_chat = Settings.irc_chat
+            self.irc_chat.join_chat(self.username)
 
     def toggle_chat(self):
         if self.settings.chat == ChatPresence.ALWAYS:
@@ -1,10 +1,16 @@
+import os
+
 # Twitch endpoints
-URL = "https://www.twitch.tv"               # Browser, Apps
+# Each one can be overridden with an environment variable (e.g. to point the miner
+# at a local mock backend, see benchmarks/mock_twitch.py)
+URL = os.getenv("TWITCH_URL", "https://www.twitch.tv")  # Browser, Apps
 # URL = "https://m.twitch.tv"               # Mobile Browser
 # URL = "https://android.tv.twitch.tv"      # TV
 IRC = "irc.chat.twitch.tv"
 IRC_PORT = 6667
-WEBSOCKET = "wss://pubsub-edge.twitch.tv/v1"
+WEBSOCKET = os.getenv("TWITCH_PUBSUB_URL", "wss://pubsub-edge.twitch.tv/v1")
+HELIX_URL = os.getenv("TWITCH_HELIX_URL", "https://api.twitch.tv/helix")
+USHER_URL = os.getenv("TWITCH_USHER_URL", "https://usher.ttvnw.net")
 CLIENT_ID = "ue6666qo983tsx6so1t0vnawi233wa"        # TV
 # CLIENT_ID = "kimne78kx3ncx6brgo4mv6wki5h1ko"      # Browser
 # CLIENT_ID = "r8s4dac0uhzifbpu9sjdiwzctle17ff"     # Mobile Browser
@@ -38,8 +44,8 @@ GITHUB_url = (
 
 
 class GQLOperations:
-    url = "https://gql.twitch.tv/gql"
-    integrity_url = "https://gql.twitch.tv/integrity"
+    url = os.getenv("TWITCH_GQL_URL", "https://gql.twitch.tv/gql")
+    integrity_url = os.getenv("TWITCH_GQL_INTEGRITY_URL", "https://gql.twitch.tv/integrity")
     WithIsStreamLiveQuery = {
         "operationName": "WithIsStreamLiveQuery",
         "extensions": {
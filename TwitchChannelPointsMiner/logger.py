@@ -2,24 +2,26 @@ import logging
 import os
 import platform
 import queue
-import pytz
 import sys
 from datetime import datetime
 from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-import emoji
 from colorama import Fore, init
 
-from TwitchChannelPointsMiner.classes.Discord import Discord
-from TwitchChannelPointsMiner.classes.Webhook import Webhook
-from TwitchChannelPointsMiner.classes.Matrix import Matrix
 from TwitchChannelPointsMiner.classes.Settings import Events
-from TwitchChannelPointsMiner.classes.Telegram import Telegram
-from TwitchChannelPointsMiner.classes.Pushover import Pushover
-from TwitchChannelPointsMiner.classes.Gotify import Gotify
 from TwitchChannelPointsMiner.utils import remove_emoji
 
+# Les notifiers ne sont importés que par le runner qui les instancie
+if TYPE_CHECKING:
+    from TwitchChannelPointsMiner.classes.Discord import Discord
+    from TwitchChannelPointsMiner.classes.Gotify import Gotify
+    from TwitchChannelPointsMiner.classes.Matrix import Matrix
+    from TwitchChannelPointsMiner.classes.Pushover import Pushover
+    from TwitchChannelPointsMiner.classes.Telegram import Telegram
+    from TwitchChannelPointsMiner.classes.Webhook import Webhook
+
 
 # Fore: BLACK, RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN, WHITE, RESET.
 class ColorPalette(object):
@@ -96,12 +98,12 @@ class LoggerSettings:
         colored: bool = False,
         color_palette: ColorPalette = ColorPalette(),
         auto_clear: bool = True,
-        telegram: Telegram or None = None,
-        discord: Discord or None = None,
-        webhook: Webhook or None = None,
-        matrix: Matrix or None = None,
-        pushover: Pushover or None = None,
-        gotify: Gotify or None = None,
+        telegram: Optional["Telegram"] = None,
+        discord: Optional["Discord"] = None,
+        webhook: Optional["Webhook"] = None,
+        matrix: Optional["Matrix"] = None,
+        pushover: Optional["Pushover"] = None,
+        gotify: Optional["Gotify"] = None,
         username: str or None = None
     ):
         self.save = save
@@ -128,6 +130,8 @@ class FileFormatter(logging.Formatter):
         self.settings = settings
         self.timezone = None
         if settings.time_zone:
+            import pytz
+
             try:
                 self.timezone = pytz.timezone(settings.time_zone)
                 logging.info(f"File logger time zone set to: {self.timezone}")
@@ -149,6 +153,8 @@ class GlobalFormatter(logging.Formatter):
         self.settings = settings
         self.timezone = None
         if settings.time_zone:
+            import pytz
+
             try:
                 self.timezone = pytz.timezone(settings.time_zone)
                 logging.info(
@@ -175,6 +181,8 @@ class GlobalFormatter(logging.Formatter):
             and self.settings.emoji is True
             and record.emoji_is_present is False
         ):
+            import emoji
+
             record.msg = emoji.emojize(
                 f"{record.emoji}  {record.msg.strip()}", language="alias"
             )
@@ -186,14 +186,16 @@ def init2dict(content):
     return dict(re.findall(r"""__([a-z]+)__ = "([^"]+)""", content))
 
 
-def check_versions():
+def get_current_version():
     try:
         current_version = init2dict(read("__init__.py"))
-        current_version = (
-            current_version["version"] if "version" in current_version else "0.0.0"
-        )
+        return current_version["version"] if "version" in current_version else "0.0.0"
     except Exception:
-        current_version = "0.0.0"
+        return "0.0.0"
+
+
+def fetch_github_version(timeout=5):
+    # None en cas d'échec : la valeur en cache (ou "0.0.0") est alors conservée
     try:
         r = requests.get(
             "/".join(
@@ -201,12 +203,10 @@ def check_versions():
                     s.strip("/")
                     for s in [GITHUB_url, "TwitchChannelPointsMiner", "__init__.py"]
                 ]
-            )
+            ),
+            timeout=timeout,
         )
         github_version = init2dict(r.text)
-        github_version = (
-            github_version["version"] if "version" in github_version else "0.0.0"
-        )
+        return github_version["version"] if "version" in github_version else None
     except Exception:
-        github_version = "0.0.0"
-    return current_version, github_version
+        return None
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark : construction + sérialisation d'une opération GQL
+Avant : copy.deepcopy(GQLOperations.X) + json.dumps  /  Après : GQLTemplates.X.build() + encode()
+
+Usage : python benchmarks/gql_templates.py [iterations]
+"""
+
+import copy
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TwitchChannelPointsMiner.classes.GQLTemplate import GQLTemplates, encode_gql  # noqa: E402
+from TwitchChannelPointsMiner.constants import GQLOperations  # noqa: E402
+
+
+def before(login):
+    json_data = copy.deepcopy(GQLOperations.ChannelPointsContext)
+    json_data["variables"] = {"channelLogin": login}
+    return json.dumps(json_data).encode()
+
+
+def after(login):
+    return encode_gql(GQLTemplates.ChannelPointsContext.build({"channelLogin": login}))
+
+
+def measure(func, iterations):
+    for i in range(1000):
+        func(f"streamer{i}")
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(f"streamer{i}")
+    elapsed = time.perf_counter() - start
+
+    # Mémoire transitoire allouée par appel (pic - base)
+    tracemalloc.start()
+    peak_total = 0
+    for i in range(1000):
+        login = f"streamer{i}"
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func(login)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - base
+    tracemalloc.stop()
+    return elapsed / iterations * 1e6, peak_total / 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    assert json.loads(before("x")) == json.loads(after("x"))
+
+    results = {}
+    for name, func in (("deepcopy + json.dumps", before), ("template.build + encode", after)):
+        results[name] = measure(func, iterations)
+        per_call, peak = results[name]
+        print(f"{name:<26} {per_call:8.2f} µs/appel  {peak:8.0f} octets alloués (pic)/appel")
+
+    (old, _), (new, _) = results.values()
+    print(f"Gain: x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Budget de temps d'import : python -X importtime sur "import TwitchChannelPointsMiner"
+Échoue (code 1) si l'import dépasse le budget ou charge un module optionnel
+(Flask, pandas, irc, emoji...) qui ne doit l'être qu'à l'usage.
+
+Usage : python benchmarks/import_time.py [budget_ms] [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGET = "TwitchChannelPointsMiner"
+
+# Budget par défaut (cumulé, meilleur des runs), surchargeable par argument
+DEFAULT_BUDGET_MS = 400
+
+# Modules importés à la demande uniquement (analytics, chat IRC, fuseau horaire...)
+LAZY_MODULES = (
+    "pandas",
+    "flask",
+    "irc",
+    "emoji",
+    "pytz",
+    "dateutil",
+    "validators",
+    "aiohttp",
+    "TwitchChannelPointsMiner.classes.AnalyticsServer",
+    "TwitchChannelPointsMiner.classes.AsyncTwitch",
+    "TwitchChannelPointsMiner.classes.ClientIRC",
+    "TwitchChannelPointsMiner.classes.Discord",
+    "TwitchChannelPointsMiner.classes.Gotify",
+    "TwitchChannelPointsMiner.classes.Matrix",
+    "TwitchChannelPointsMiner.classes.Pushover",
+    "TwitchChannelPointsMiner.classes.Telegram",
+    "TwitchChannelPointsMiner.classes.Webhook",
+)
+
+
+def importtime():
+    """Retourne {module: (self_us, cumulative_us)} pour un import à froid."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {TARGET} a échoué :\n{result.stderr}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # Meilleur des runs : le premier paie aussi la compilation des .pyc
+    best = None
+    for _ in range(runs):
+        modules = importtime()
+        if best is None or modules[TARGET][1] < best[TARGET][1]:
+            best = modules
+
+    total_ms = best[TARGET][1] / 1000
+    print(f"import {TARGET}: {total_ms:.1f} ms (meilleur de {runs}), budget {budget_ms:.0f} ms")
+
+    packages = {}
+    for name, (self_us, _) in best.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("\nPaquets les plus coûteux (self, ms) :")
+    for package, self_us in sorted(packages.items(), key=lambda x: -x[1])[:15]:
+        print(f"  {package:<32} {self_us / 1000:>8.1f}")
+
+    errors = []
+    eager = [
+        name
+        for name in best
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    ]
+    if eager:
+        roots = sorted({
+            lazy for lazy in LAZY_MODULES for name in eager
+            if name == lazy or name.startswith(lazy + ".")
+        })
+        errors.append(f"modules optionnels importés au chargement : {', '.join(roots)}")
+    if total_ms > budget_ms:
+        errors.append(f"{total_ms:.1f} ms > budget de {budget_ms:.0f} ms")
+
+    if errors:
+        print("\nÉCHEC : " + "; ".join(errors))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,568 @@
+"""
+Mock Twitch - Backend local (stdlib uniquement) pour mesurer le miner sans réseau
+Un seul port sert GQL (lots compris), Helix (avec en-têtes Ratelimit-* et 429),
+les pages de chaîne + settings spade, usher / HLS et un PubSub WebSocket qui
+émet des messages synthétiques (points gagnés, viewcount, prédictions).
+
+Usage : python benchmarks/mock_twitch.py [--streamers 5000] [--online 0.1]
+                                         [--pubsub-rate 50] [--port 8765]
+Puis exporter les variables affichées avant de lancer le miner (avec un
+token OAuth factice d'au moins 30 caractères).
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import socketserver
+import struct
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+FIRST_ID = 100000
+USER_ID = "1"
+USER_LOGIN = "mockviewer"
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class MockState(object):
+    """Streamers simulés (streamer0..N) et compteurs partagés par tous les handlers."""
+
+    def __init__(self, streamers, online, pubsub_rate, helix_limit, port):
+        self.base = f"http://127.0.0.1:{port}"
+        self.count = streamers
+        self.pubsub_rate = pubsub_rate
+        self.helix_limit = helix_limit
+        self.build_id = str(uuid.uuid4())
+
+        rng = random.Random(42)
+        self.online = {
+            str(FIRST_ID + index)
+            for index in range(streamers)
+            if rng.random() < online
+        }
+        self.balances = {}
+
+        self.lock = threading.Lock()
+        self.helix_window = int(time.time()) // 60
+        self.helix_used = 0
+        self.requests = 0
+        self.gql_operations = 0
+        self.pubsub_sent = 0
+
+    @staticmethod
+    def login(channel_id):
+        return f"streamer{int(channel_id) - FIRST_ID}"
+
+    @staticmethod
+    def channel_id(login):
+        login = (login or "").lower()
+        if login == USER_LOGIN:
+            return USER_ID
+        if login.startswith("streamer") and login[8:].isdigit():
+            return str(FIRST_ID + int(login[8:]))
+        return None
+
+    def helix_quota(self):
+        """(autorisé, restant, reset) sur une fenêtre fixe d'une minute."""
+        with self.lock:
+            window = int(time.time()) // 60
+            if window != self.helix_window:
+                self.helix_window, self.helix_used = window, 0
+            self.helix_used += 1
+            remaining = self.helix_limit - self.helix_used
+        return remaining >= 0, max(remaining, 0), (window + 1) * 60
+
+    def earn(self, channel_id, points):
+        with self.lock:
+            balance = self.balances.get(channel_id, 1000) + points
+            self.balances[channel_id] = balance
+        return balance
+
+
+# === GQL === #
+def gql_response(state, operation):
+    name = operation.get("operationName")
+    variables = operation.get("variables") or {}
+    login = variables.get("channelLogin") or variables.get("login") or variables.get("name")
+    channel_id = (
+        variables.get("channelID")
+        or variables.get("channelId")
+        or variables.get("id")
+        or state.channel_id(login)
+    )
+    if login is None and channel_id is not None:
+        login = state.login(channel_id) if channel_id != USER_ID else USER_LOGIN
+    online = channel_id in state.online
+
+    if name == "GetIDFromLogin":
+        user = None if channel_id is None else {"id": channel_id, "login": login}
+        return {"data": {"user": user}}
+    if name == "ChannelPointsContext":
+        return {
+            "data": {
+                "community": {
+                    "id": channel_id,
+                    "channel": {
+                        "id": channel_id,
+                        "self": {
+                            "communityPoints": {
+                                "balance": state.balances.get(channel_id, 1000),
+                                "availableClaim": None,
+                                "activeMultipliers": [],
+                            }
+                        },
+                        "communityPointsSettings": {"goals": []},
+                    },
+                }
+            }
+        }
+    if name == "VideoPlayerStreamInfoOverlayChannel":
+        stream = None if not online else {
+            "id": f"9{channel_id}",
+            "viewersCount": random.randint(10, 50000),
+            "tags": [],
+        }
+        return {
+            "data": {
+                "user": {
+                    "id": channel_id,
+                    "profileURL": f"{state.base}/{login}",
+                    "displayName": login,
+                    "login": login,
+                    "profileImageURL": "",
+                    "broadcastSettings": {
+                        "id": channel_id,
+                        "title": f"Mock stream {login}",
+                        "game": {"id": "509658", "name": "Just Chatting", "displayName": "Just Chatting"},
+                    },
+                    "stream": stream,
+                }
+            }
+        }
+    if name == "WithIsStreamLiveQuery":
+        stream = {"id": f"9{channel_id}"} if online else None
+        return {"data": {"user": {"id": channel_id, "stream": stream}}}
+    if name == "PlaybackAccessToken":
+        return {
+            "data": {
+                "streamPlaybackAccessToken": {
+                    "value": json.dumps({"channel": login}, separators=(",", ":")),
+                    "signature": hashlib.sha1(str(login).encode()).hexdigest(),
+                }
+            }
+        }
+    if name == "ModViewChannelQuery":
+        return {"data": {"user": {"channel": {"self": {"isModerator": False}}}}}
+    if name == "AvailableDrops":
+        return {"data": {"channel": {"id": channel_id, "viewerDropCampaigns": None}}}
+    if name == "Inventory":
+        return {
+            "data": {
+                "currentUser": {
+                    "id": USER_ID,
+                    "inventory": {"dropCampaignsInProgress": [], "gameEventDrops": []},
+                }
+            }
+        }
+    if name == "ViewerDropsDashboard":
+        return {"data": {"currentUser": {"id": USER_ID, "dropCampaigns": []}}}
+    return {"data": {}}
+
+
+# === HELIX === #
+def helix_response(state, path, query):
+    if path == "/helix/users":
+        users = []
+        for login in query.get("login", []):
+            channel_id = state.channel_id(login)
+            if channel_id is not None:
+                users.append({"id": channel_id, "login": login.lower(), "display_name": login})
+        for channel_id in query.get("id", []):
+            users.append({"id": channel_id, "login": state.login(channel_id), "display_name": state.login(channel_id)})
+        if not query.get("login") and not query.get("id"):
+            users.append({"id": USER_ID, "login": USER_LOGIN, "display_name": USER_LOGIN})
+        return {"data": users}
+
+    if path == "/helix/streams":
+        ids = list(query.get("user_id", []))
+        ids += [state.channel_id(login) for login in query.get("user_login", [])]
+        return {
+            "data": [
+                {
+                    "id": f"9{channel_id}",
+                    "user_id": channel_id,
+                    "user_login": state.login(channel_id),
+                    "game_name": "Just Chatting",
+                    "title": f"Mock stream {state.login(channel_id)}",
+                    "viewer_count": random.randint(10, 50000),
+                    "started_at": now_iso(),
+                }
+                for channel_id in ids
+                if channel_id in state.online
+            ],
+            "pagination": {},
+        }
+
+    if path == "/helix/channels/followed":
+        first = min(int(query.get("first", ["100"])[0]), 100)
+        after = int(query.get("after", ["0"])[0])
+        end = min(after + first, state.count)
+        return {
+            "total": state.count,
+            "data": [
+                {
+                    "broadcaster_id": str(FIRST_ID + index),
+                    "broadcaster_login": f"streamer{index}",
+                    "broadcaster_name": f"streamer{index}",
+                    "followed_at": "2020-01-01T00:00:00Z",
+                }
+                for index in range(after, end)
+            ],
+            "pagination": {"cursor": str(end)} if end < state.count else {},
+        }
+
+    if path == "/helix/predictions":
+        return {"data": []}
+    return None
+
+
+# === PUBSUB === #
+def pubsub_message(state, topic):
+    name, channel_id = topic.split(".", 1)
+    if name == "community-points-user-v1":
+        # Le topic utilisateur porte l'id du viewer : on choisit une chaîne en ligne
+        target = random.choice(sorted(state.online)) if state.online else str(FIRST_ID)
+        points = random.choice((10, 12, 50))
+        message = {
+            "type": "points-earned",
+            "data": {
+                "timestamp": now_iso(),
+                "channel_id": target,
+                "point_gain": {
+                    "user_id": USER_ID,
+                    "channel_id": target,
+                    "total_points": points,
+                    "reason_code": "WATCH",
+                },
+                "balance": {"user_id": USER_ID, "channel_id": target, "balance": state.earn(target, points)},
+            },
+        }
+    elif name == "video-playback-by-id":
+        message = {
+            "type": "viewcount",
+            "server_time": time.time(),
+            "viewers": random.randint(10, 50000),
+        }
+    elif name == "predictions-channel-v1":
+        event_id = str(uuid.uuid4())
+        message = {
+            "type": "event-created",
+            "data": {
+                "timestamp": now_iso(),
+                "event": {
+                    "id": event_id,
+                    "channel_id": channel_id,
+                    "created_at": now_iso(),
+                    "prediction_window_seconds": 120,
+                    "status": "ACTIVE",
+                    "title": "Mock prediction",
+                    "outcomes": [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "color": color,
+                            "title": color.lower(),
+                            "total_points": random.randint(0, 100000),
+                            "total_users": random.randint(0, 1000),
+                            "top_predictors": [],
+                        }
+                        for color in ("BLUE", "PINK")
+                    ],
+                },
+            },
+        }
+    else:
+        return None
+    return {
+        "type": "MESSAGE",
+        "data": {"topic": topic, "message": json.dumps(message, separators=(",", ":"))},
+    }
+
+
+class PubSubConnection(object):
+    """Connexion WebSocket côté serveur (framing RFC 6455 minimal, trames texte)."""
+
+    def __init__(self, state, rfile, wfile):
+        self.state = state
+        self.rfile = rfile
+        self.wfile = wfile
+        self.topics = []
+        self.closed = threading.Event()
+        self.lock = threading.Lock()
+
+    def send(self, payload, opcode=0x1):
+        if isinstance(payload, dict):
+            payload = json.dumps(payload, separators=(",", ":"))
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        with self.lock:
+            try:
+                self.wfile.write(header + payload)
+                self.wfile.flush()
+            except OSError:
+                self.closed.set()
+
+    def read_frame(self):
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None, None
+        opcode = header[0] & 0x0F
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self.rfile.read(8))[0]
+        mask = self.rfile.read(4) if header[1] & 0x80 else b"\x00" * 4
+        payload = bytearray(self.rfile.read(length))
+        for index in range(len(payload)):
+            payload[index] ^= mask[index % 4]
+        return opcode, bytes(payload)
+
+    def emit(self):
+        delay = 1 / self.state.pubsub_rate if self.state.pubsub_rate > 0 else None
+        while delay is not None and self.closed.wait(delay) is False:
+            if self.topics:
+                message = pubsub_message(self.state, random.choice(self.topics))
+                if message is not None:
+                    self.send(message)
+                    with self.state.lock:
+                        self.state.pubsub_sent += 1
+
+    def serve(self):
+        threading.Thread(target=self.emit, daemon=True).start()
+        try:
+            while not self.closed.is_set():
+                opcode, payload = self.read_frame()
+                if opcode is None or opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    self.send(payload, opcode=0xA)
+                    continue
+                if opcode != 0x1:
+                    continue
+                request = json.loads(payload)
+                if request.get("type") == "PING":
+                    self.send({"type": "PONG"})
+                elif request.get("type") == "LISTEN":
+                    self.topics.extend(request.get("data", {}).get("topics", []))
+                    self.send({"type": "RESPONSE", "nonce": request.get("nonce"), "error": ""})
+                elif request.get("type") == "UNLISTEN":
+                    for topic in request.get("data", {}).get("topics", []):
+                        if topic in self.topics:
+                            self.topics.remove(topic)
+                    self.send({"type": "RESPONSE", "nonce": request.get("nonce"), "error": ""})
+        except (OSError, ValueError, struct.error):
+            pass
+        finally:
+            self.closed.set()
+
+
+# === HTTP === #
+class MockTwitchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockTwitch/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, body=b"", content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, separators=(",", ":"))
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length > 0 else b""
+
+    def count(self):
+        with self.state.lock:
+            self.state.requests += 1
+
+    def do_POST(self):
+        self.count()
+        path = urlsplit(self.path).path
+        body = self.read_body()
+        if path == "/gql" or path == "/integrity":
+            if path == "/integrity":
+                return self.reply(200, {"token": "mock-integrity", "expiration": int(time.time() * 1000) + 3600000})
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return self.reply(400, {"error": "Bad Request"})
+            operations = payload if isinstance(payload, list) else [payload]
+            with self.state.lock:
+                self.state.gql_operations += len(operations)
+            responses = [gql_response(self.state, operation) for operation in operations]
+            return self.reply(200, responses if isinstance(payload, list) else responses[0])
+        if path == "/spade":
+            return self.reply(204, content_type="text/plain")
+        return self.reply(404, {"error": "Not Found"})
+
+    def do_HEAD(self):
+        self.count()
+        path = urlsplit(self.path).path
+        if path.startswith("/hls/") and path.endswith(".ts"):
+            return self.reply(200, content_type="video/mp2t")
+        return self.reply(404, content_type="text/plain")
+
+    def do_GET(self):
+        self.count()
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+        base = self.state.base
+
+        if path == "/v1" and self.headers.get("Upgrade", "").lower() == "websocket":
+            return self.upgrade()
+
+        if path.startswith("/helix/"):
+            allowed, remaining, reset = self.state.helix_quota()
+            headers = {
+                "Ratelimit-Limit": str(self.state.helix_limit),
+                "Ratelimit-Remaining": str(remaining),
+                "Ratelimit-Reset": str(reset),
+            }
+            if not allowed:
+                return self.reply(429, {"error": "Too Many Requests", "status": 429}, headers=headers)
+            body = helix_response(self.state, path, query)
+            if body is None:
+                return self.reply(404, {"error": "Not Found"}, headers=headers)
+            return self.reply(200, body, headers=headers)
+
+        if path.startswith("/api/channel/hls/") and path.endswith(".m3u8"):
+            login = path.rsplit("/", 1)[-1][: -len(".m3u8")]
+            if self.state.channel_id(login) not in self.state.online:
+                return self.reply(404, "offline", content_type="text/plain")
+            playlist = (
+                "#EXTM3U\n"
+                '#EXT-X-STREAM-INF:BANDWIDTH=160000,RESOLUTION=284x160,VIDEO="160p30"\n'
+                f"{base}/hls/{login}/low.m3u8"
+            )
+            return self.reply(200, playlist, content_type="application/vnd.apple.mpegurl")
+        if path.startswith("/hls/") and path.endswith(".m3u8"):
+            login = path.split("/")[2]
+            sequence = int(time.time()) // 2
+            playlist = (
+                f"#EXTM3U\n#EXT-X-TARGETDURATION:2\n#EXT-X-MEDIA-SEQUENCE:{sequence}\n"
+                f"#EXTINF:2.000,live\n{base}/hls/{login}/{sequence}.ts\n"
+            )
+            return self.reply(200, playlist, content_type="application/vnd.apple.mpegurl")
+        if path.startswith("/hls/") and path.endswith(".ts"):
+            return self.reply(200, b"\x47" * 188, content_type="video/mp2t")
+
+        if path.startswith("/config/settings") and path.endswith(".js"):
+            return self.reply(
+                200,
+                f'window.__twilightSettings = {{"spade_url":"{base}/spade"}};',
+                content_type="application/javascript",
+            )
+
+        if "/" not in path.strip("/"):
+            page = (
+                "<!DOCTYPE html><html><head>"
+                f'<script>window.__twilightBuildID="{self.state.build_id}";</script>'
+                f'<script src="{base}/config/settings.mock.js"></script>'
+                "</head><body></body></html>"
+            )
+            return self.reply(200, page, content_type="text/html; charset=utf-8")
+
+        return self.reply(404, {"error": "Not Found"})
+
+    def upgrade(self):
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()
+        ).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        PubSubConnection(self.state, self.rfile, self.wfile).serve()
+        self.close_connection = True
+
+
+class MockTwitchServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = socketserver.TCPServer.request_queue_size * 16
+
+    def __init__(self, state, port):
+        self.state = state
+        super().__init__(("127.0.0.1", port), MockTwitchHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend Twitch local pour benchmarks")
+    parser.add_argument("--streamers", type=int, default=5000, help="Nombre de chaînes suivies")
+    parser.add_argument("--online", type=float, default=0.1, help="Fraction de chaînes en ligne")
+    parser.add_argument("--pubsub-rate", type=float, default=50, help="Messages PubSub par seconde et par connexion")
+    parser.add_argument("--helix-limit", type=int, default=800, help="Points Helix par minute")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    state = MockState(args.streamers, args.online, args.pubsub_rate, args.helix_limit, args.port)
+    server = MockTwitchServer(state, args.port)
+
+    print(f"Mock Twitch : {state.count} chaînes, {len(state.online)} en ligne, sur {state.base}")
+    print("Variables à exporter avant de lancer le miner :")
+    print(f"  export TWITCH_URL={state.base}")
+    print(f"  export TWITCH_GQL_URL={state.base}/gql")
+    print(f"  export TWITCH_GQL_INTEGRITY_URL={state.base}/integrity")
+    print(f"  export TWITCH_HELIX_URL={state.base}/helix")
+    print(f"  export TWITCH_USHER_URL={state.base}")
+    print(f"  export TWITCH_PUBSUB_URL=ws://127.0.0.1:{args.port}/v1")
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        while True:
+            time.sleep(10)
+            print(
+                f"{state.requests} requêtes HTTP, {state.gql_operations} opérations GQL, "
+                f"{state.pubsub_sent} messages PubSub"
+            )
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
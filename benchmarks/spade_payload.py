@@ -0,0 +1,96 @@
+"""
+Micro-benchmark : corps du POST spade d'un minute-watched
+Avant : json.dumps + base64 + dict, urlencodé par requests à chaque envoi
+Après : Stream.encode_payload() mémorisé jusqu'au prochain payload
+
+Suit l'objectif d'une boucle minute-watched sans allocation en régime établi :
+échoue (code 1) si l'encodage en cache alloue encore de la mémoire.
+
+Usage : python benchmarks/spade_payload.py [iterations]
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from base64 import b64encode
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TwitchChannelPointsMiner.classes.entities.Stream import Stream  # noqa: E402
+
+PAYLOAD = [
+    {
+        "event": "minute-watched",
+        "properties": {
+            "channel_id": "123456789",
+            "broadcast_id": "41234567890",
+            "player": "site",
+            "user_id": "987654321",
+            "live": True,
+            "channel": "streamer",
+            "game": "Just Chatting",
+            "game_id": "509658",
+        },
+    }
+]
+
+
+def before(stream):
+    json_event = json.dumps(stream.payload, separators=(",", ":"))
+    data = {"data": (b64encode(json_event.encode("utf-8"))).decode("utf-8")}
+    # Ce que fait requests pour data=dict
+    return urlencode(data).encode("ascii")
+
+
+def after(stream):
+    return stream.encode_payload()
+
+
+def measure(func, stream, iterations):
+    for _ in range(1000):
+        func(stream)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(stream)
+    elapsed = time.perf_counter() - start
+
+    # Mémoire transitoire allouée par appel (pic - base)
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(1000):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func(stream)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - base
+    tracemalloc.stop()
+    return elapsed / iterations * 1e6, peak_total / 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    stream = Stream()
+    stream.payload = PAYLOAD
+    assert before(stream) == after(stream)
+
+    results = {}
+    for name, func in (("json + base64 + urlencode", before), ("encode_payload (cache)", after)):
+        results[name] = measure(func, stream, iterations)
+        per_call, peak = results[name]
+        print(f"{name:<26} {per_call:8.2f} µs/appel  {peak:8.0f} octets alloués (pic)/appel")
+
+    (old, _), (new, allocated) = results.values()
+    print(f"Gain: x{old / new:.1f}")
+
+    if allocated > 0:
+        print("ÉCHEC : l'encodage en régime établi alloue encore de la mémoire")
+        sys.exit(1)
+    print("OK : aucune allocation en régime établi")
+
+
+if __name__ == "__main__":
+    main()
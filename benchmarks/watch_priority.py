@@ -0,0 +1,128 @@
+"""
+Micro-benchmark : choix des 2 streams à regarder sur 10k streamers suivis
+Avant : parcours complet + tri par priorité à chaque passe  /  Après : WatchPriorityIndex.select()
+
+Usage : python benchmarks/watch_priority.py [streamers] [online] [iterations]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TwitchChannelPointsMiner.classes.entities.Streamer import Streamer, StreamerSettings  # noqa: E402
+from TwitchChannelPointsMiner.classes.Settings import Priority  # noqa: E402
+from TwitchChannelPointsMiner.classes.WatchPriorityIndex import WatchPriorityIndex  # noqa: E402
+
+PRIORITIES = (
+    [Priority.STREAK, Priority.DROPS, Priority.ORDER],
+    [Priority.SUBSCRIBED, Priority.POINTS_DESCENDING],
+    [Priority.POINTS_ASCENDING],
+)
+
+
+def make_streamers(count, online):
+    random.seed(42)
+    streamers = []
+    for i in range(count):
+        streamer = Streamer(f"streamer{i}", settings=StreamerSettings())
+        streamer.settings.default()
+        streamer.channel_points = random.randint(0, 100000)
+        if random.random() < 0.05:
+            streamer.activeMultipliers = [{"factor": random.choice([0.2, 0.4, 1.0])}]
+        if random.random() < 0.3:
+            streamer.stream.watch_streak_missing = False
+        streamers.append(streamer)
+    for streamer in random.sample(streamers, online):
+        streamer.is_online = True
+        streamer.online_at = time.time() - 3600
+    return streamers
+
+
+def scan(streamers, priority):
+    """Référence : l'ancien parcours de toute la liste à chaque passe."""
+    now = time.time()
+    index = [
+        s for s in streamers
+        if s.is_online is True and (s.online_at == 0 or now - s.online_at > 30)
+    ]
+    selected = []
+    for prior in priority:
+        if prior == Priority.ORDER:
+            candidates = index
+        elif prior in (Priority.POINTS_ASCENDING, Priority.POINTS_DESCENDING):
+            candidates = sorted(
+                index,
+                key=lambda s: s.channel_points,
+                reverse=prior == Priority.POINTS_DESCENDING,
+            )
+        elif prior == Priority.STREAK:
+            candidates = [
+                s for s in index
+                if s.settings.watch_streak is True
+                and s.stream.watch_streak_missing is True
+                and (s.offline_at == 0 or ((now - s.offline_at) // 60) > 30)
+                and s.stream.minute_watched < 7
+            ]
+        elif prior == Priority.DROPS:
+            candidates = [s for s in index if s.drops_condition() is True]
+        else:
+            candidates = sorted(
+                [s for s in index if s.viewer_has_points_multiplier()],
+                key=lambda s: s.total_points_multiplier(),
+                reverse=True,
+            )
+        for s in candidates:
+            if len(selected) < 2 and s not in selected:
+                selected.append(s)
+    return selected
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    online = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    streamers = make_streamers(count, online)
+    start = time.perf_counter()
+    watch_index = WatchPriorityIndex()
+    for rank, streamer in enumerate(streamers):
+        watch_index.add(streamer, rank)
+    build = time.perf_counter() - start
+    print(f"{count} streamers ({online} en ligne), index construit en {build * 1000:.1f} ms")
+
+    for priority in PRIORITIES:
+        expected = [s.username for s in scan(streamers, priority)]
+        assert [s.username for s in watch_index.select(priority)] == expected, priority
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            scan(streamers, priority)
+        before = (time.perf_counter() - start) / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            watch_index.select(priority)
+        after = (time.perf_counter() - start) / iterations
+
+        label = ", ".join(prior.name for prior in priority)
+        print(
+            f"{label:<34} parcours {before * 1e6:9.1f} µs  index {after * 1e6:7.1f} µs"
+            f"  x{before / after:.0f}"
+        )
+
+    # Coût d'une mise à jour incrémentale (points gagnés sur un stream en ligne)
+    online_streamers = [s for s in streamers if s.is_online]
+    start = time.perf_counter()
+    for i in range(iterations * 10):
+        streamer = online_streamers[i % len(online_streamers)]
+        streamer.channel_points += 10
+        streamer.update_watch_priority()
+    update = (time.perf_counter() - start) / (iterations * 10)
+    print(f"Mise à jour incrémentale : {update * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from TwitchChannelPointsMiner.classes.AsyncTwitch import AsyncTwitch  # noqa: E402
+from TwitchChannelPointsMiner.classes.WatchScheduler import WatchScheduler  # noqa: E402
+
+
+class FakeStreamer(object):
+    def __init__(self, username):
+        self.username = username
+
+
+class FakeWatchIndex(object):
+    def __init__(self, streamers):
+        self.streamers = streamers
+
+    def reconcile(self):
+        pass
+
+    def select(self, priority):
+        return self.streamers
+
+
+class FakeTwitch(object):
+    def __init__(self, streamers, interval):
+        self.running = True
+        self.watch_index = FakeWatchIndex(streamers)
+        self.watch_scheduler = WatchScheduler(interval=interval)
+
+
+def test_slow_stream_does_not_delay_the_other(monkeypatch):
+    fast, slow = FakeStreamer("fast"), FakeStreamer("slow")
+    twitch = FakeTwitch([fast, slow], interval=0.1)
+    sent = []
+
+    async def send_minute_watched(self, streamer):
+        sent.append(streamer.username)
+        if streamer is slow:
+            await asyncio.sleep(0.5)
+        if sent.count("fast") >= 3:
+            twitch.running = False
+        return True
+
+    monkeypatch.setattr(AsyncTwitch, "send_minute_watched", send_minute_watched)
+
+    asyncio.run(AsyncTwitch(twitch).send_minute_watched_events(priority=[]))
+
+    assert sent.count("fast") == 3
+    assert sent.count("slow") == 1
+    # L'envoi lent, annulé à l'arrêt, est tout de même clos dans le scheduler
+    assert twitch.watch_scheduler.stats()["sends"] == 3 + 1
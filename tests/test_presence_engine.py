@@ -0,0 +1,123 @@
+from TwitchChannelPointsMiner.classes.PresenceEngine import PresenceEngine
+
+
+class FakeStreamer(object):
+    def __init__(self, username, channel_id, is_online=False):
+        self.username = username
+        self.channel_id = channel_id
+        self.is_online = is_online
+
+    def set_online(self):
+        self.is_online = True
+
+    def set_offline(self):
+        self.is_online = False
+
+
+class FakeSchedule(object):
+    """Tous les streamers inactifs depuis des semaines : une passe sur dormant_every."""
+
+    def dormant(self, username, at=None):
+        return True
+
+    def likely_live(self, username, at=None, horizon=3600):
+        return False
+
+
+class FakeTwitch(object):
+    def __init__(self, online_streams, update_failures=0):
+        self.schedule = FakeSchedule()
+        self.online_streams = online_streams
+        self.update_failures = update_failures
+        self.requested = []
+
+    def get_streams_by_ids(self, channel_ids, strict=False):
+        self.requested.append(list(channel_ids))
+        return self.online_streams
+
+    def get_spade_url(self, streamer):
+        pass
+
+    def update_stream(self, streamer):
+        if self.update_failures > 0:
+            self.update_failures -= 1
+            raise RuntimeError("playback token unavailable")
+
+
+def test_failed_update_is_retried_on_next_pass():
+    streamer = FakeStreamer("dormant", "1")
+    twitch = FakeTwitch({"dormant": {"user_id": "1"}}, update_failures=1)
+    presence = PresenceEngine(twitch)
+
+    presence.reconcile([streamer])
+    assert streamer.is_online is False
+    assert presence.reconcile_due() is True
+
+    presence.reconcile([streamer])
+    assert streamer.is_online is True
+    assert twitch.requested == [["1"], ["1"]]
+    assert presence.stats()["retries"] == 1
+
+
+def test_dormant_streamer_waits_for_its_next_check():
+    streamer = FakeStreamer("dormant", "1")
+    twitch = FakeTwitch({})
+    presence = PresenceEngine(twitch)
+
+    presence.reconcile([streamer])
+    presence.reconcile([streamer])
+
+    assert twitch.requested == [["1"]]
+    assert presence.stats()["skipped"] == 1
+
+
+def test_failed_helix_pass_does_not_push_back_next_check():
+    streamer = FakeStreamer("dormant", "1")
+    twitch = FakeTwitch(None)
+    presence = PresenceEngine(twitch)
+
+    presence.reconcile([streamer])
+    twitch.online_streams = {}
+    presence.reconcile([streamer])
+
+    assert twitch.requested == [["1"], ["1"]]
+
+
+def test_diff_only_reports_state_changes():
+    went_live = FakeStreamer("went_live", "1")
+    still_live = FakeStreamer("still_live", "2", is_online=True)
+    went_off = FakeStreamer("went_off", "3", is_online=True)
+    still_off = FakeStreamer("still_off", "4")
+    presence = PresenceEngine(FakeTwitch({}))
+
+    went_online, went_offline = presence.diff(
+        [went_live, still_live, went_off, still_off],
+        {"went_live": {"user_id": "1"}, "still_live": {"user_id": "2"}},
+    )
+
+    assert went_online == [went_live]
+    assert went_offline == [went_off]
+    stats = presence.stats()
+    assert stats["reconciliations"] == 1
+    assert stats["went_online"] == 1
+    assert stats["went_offline"] == 1
+    # diff ne fait que comparer : les transitions restent à l'appelant
+    assert went_live.is_online is False and went_off.is_online is True
+
+
+def test_diff_ignores_streamers_without_channel_id():
+    unresolved = FakeStreamer("unresolved", "", is_online=True)
+    presence = PresenceEngine(FakeTwitch({}))
+
+    assert presence.diff([unresolved], {}) == ([], [])
+
+
+def test_reconcile_applies_diff():
+    went_live = FakeStreamer("went_live", "1")
+    went_off = FakeStreamer("went_off", "2", is_online=True)
+    presence = PresenceEngine(FakeTwitch({"went_live": {"user_id": "1"}}))
+
+    presence.reconcile([went_live, went_off])
+
+    assert went_live.is_online is True
+    assert went_off.is_online is False
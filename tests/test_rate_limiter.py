@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.RateLimiter import (
+    RateLimiter,
+    TokenBucket,
+    should_retry,
+)
+from TwitchChannelPointsMiner.constants import HELIX_URL
+
+
+def test_headers_align_capacity_rate_and_tokens():
+    bucket = TokenBucket("helix", 10, 20)
+    bucket.update_from_headers({"Ratelimit-Limit": "120", "Ratelimit-Remaining": "7"})
+
+    assert bucket.capacity == 120
+    assert bucket.rate == bucket.max_rate == 2
+    assert bucket.tokens == pytest.approx(7, abs=0.1)
+
+
+def test_exhausted_bucket_blocks_until_reset():
+    bucket = TokenBucket("helix", 10, 20)
+    bucket.update_from_headers(
+        {
+            "Ratelimit-Limit": "800",
+            "Ratelimit-Remaining": "0",
+            "Ratelimit-Reset": str(int(time.time()) + 30),
+        }
+    )
+
+    assert bucket.try_acquire() is False
+    assert 25 < bucket.reserve() <= 30
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"Ratelimit-Limit": "800"},
+        {"Ratelimit-Remaining": "not a number"},
+        {"Ratelimit-Remaining": "3", "Ratelimit-Limit": "?"},
+    ],
+)
+def test_missing_or_invalid_headers_are_ignored(headers):
+    bucket = TokenBucket("helix", 10, 20)
+    bucket.update_from_headers(headers)
+
+    assert bucket.capacity == 20
+    assert bucket.rate == 10
+
+
+def test_penalize_halves_rate_and_recover_restores_it():
+    bucket = TokenBucket("gql", 20, 40)
+    bucket.penalize(retry_after=5)
+
+    assert bucket.rate == 10
+    assert bucket.tokens <= 0
+    assert bucket.throttled == 1
+    assert bucket.reserve() >= 4.9
+
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 20
+
+
+def test_retry_after_prefers_header_then_reset():
+    assert RateLimiter.retry_after({"Retry-After": "3"}) == 3
+    assert RateLimiter.retry_after({"Retry-After": "soon"}) is None
+    reset = RateLimiter.retry_after({"Ratelimit-Reset": str(int(time.time()) + 10)})
+    assert 8 < reset <= 10
+    assert RateLimiter.retry_after({}) is None
+
+
+def test_on_response_picks_bucket_by_url_prefix():
+    limiter = RateLimiter()
+    retry_after = limiter.on_response(
+        f"{HELIX_URL}/streams", 429, {"Retry-After": "2"}
+    )
+
+    assert retry_after == 2
+    assert limiter.buckets["helix"].throttled == 1
+    assert limiter.buckets["gql"].throttled == 0
+
+
+@pytest.mark.parametrize(
+    "method, status, idempotent, expected",
+    [
+        ("GET", 503, None, True),
+        ("HEAD", 500, None, True),
+        ("GET", 429, None, True),
+        ("POST", 429, None, True),
+        ("POST", 502, None, False),
+        ("POST", 502, True, True),
+        ("GET", 503, False, False),
+        ("GET", 404, None, False),
+        ("POST", 200, True, False),
+    ],
+)
+def test_should_retry(method, status, idempotent, expected):
+    assert should_retry(method, status, idempotent) is expected
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.ScheduleModel import (
+    DORMANT_AFTER,
+    HOURS_PER_WEEK,
+    ScheduleModel,
+    hour_of_week,
+)
+
+DAY = 24 * 3600
+WEEK = 7 * DAY
+
+
+@pytest.fixture(autouse=True)
+def utc(monkeypatch):
+    # Pas de changement d'heure entre les semaines simulées
+    monkeypatch.setattr(time, "localtime", time.gmtime)
+
+
+class FakeStreamer(object):
+    def __init__(self, username):
+        self.username = username
+        self.schedule = None
+
+
+def tracked_model(*usernames, cache_file=None):
+    model = ScheduleModel(cache_file)
+    for username in usernames:
+        model.track(FakeStreamer(username))
+    return model
+
+
+def start_of_hour(timestamp):
+    return timestamp - timestamp % 3600
+
+
+def test_hour_of_week_range():
+    now = time.time()
+    buckets = {hour_of_week(now + hour * 3600) for hour in range(HOURS_PER_WEEK)}
+    assert buckets == set(range(HOURS_PER_WEEK))
+
+
+def test_unknown_or_new_streamer_is_likely_live():
+    model = tracked_model("new")
+    assert model.likely_live("unknown") is True
+    assert model.likely_live("new") is True
+    model.observe_session("new", time.time() - 7200, time.time() - 3600)
+    assert model.likely_live("new", at=time.time() + 12 * 3600) is True
+
+
+def test_weekly_slot_is_learned():
+    now = start_of_hour(time.time())
+    model = tracked_model("weekly")
+    for week in range(1, 5):
+        online_at = now - week * WEEK + 600
+        model.observe_session("weekly", online_at, online_at + 1800)
+
+    assert model.likely_live("weekly", at=now + 60, horizon=0) is True
+    assert model.likely_live("weekly", at=now + 2 * DAY + 60, horizon=0) is False
+    # L'horizon regarde les heures suivantes
+    assert model.likely_live("weekly", at=now - 2 * 3600 + 60, horizon=2 * 3600) is True
+
+
+def test_daily_streamer_expected_on_unseen_weekdays():
+    now = start_of_hour(time.time())
+    model = tracked_model("daily")
+    for day in range(1, 6):
+        online_at = now - day * DAY + 600
+        model.observe_session("daily", online_at, online_at + 1800)
+
+    assert model.likely_live("daily", at=now + 2 * DAY + 60, horizon=0) is True
+    assert model.likely_live("daily", at=now + 12 * 3600 + 60, horizon=0) is False
+
+
+def test_dormant_after_weeks_without_live():
+    now = time.time()
+    model = tracked_model("quiet")
+    assert model.dormant("quiet", at=now) is False
+    assert model.dormant("quiet", at=now + DORMANT_AFTER + 60) is True
+
+    model.observe_online("quiet", at=now + DORMANT_AFTER)
+    assert model.dormant("quiet", at=now + DORMANT_AFTER + 60) is False
+
+
+def test_invalid_sessions_are_ignored():
+    now = time.time()
+    model = tracked_model("a")
+    model.observe_session("a", 0, now)
+    model.observe_session("a", now, now - 60)
+    model.observe_session("untracked", now - 60, now)
+    assert model.stats()["observed"] == 0
+
+
+def test_schedule_is_persisted(tmp_path):
+    cache_file = str(tmp_path / "schedule.json")
+    now = start_of_hour(time.time())
+    model = tracked_model("weekly", cache_file=cache_file)
+    for week in range(1, 5):
+        online_at = now - week * WEEK + 600
+        model.observe_session("weekly", online_at, online_at + 1800)
+
+    reloaded = ScheduleModel(cache_file)
+    assert len(reloaded) == 1
+    assert reloaded.likely_live("weekly", at=now + 2 * DAY + 60, horizon=0) is False
+    assert reloaded.likely_live("weekly", at=now + 60, horizon=0) is True
@@ -0,0 +1,57 @@
+from TwitchChannelPointsMiner.classes.StartupPipeline import PipelineStage, StartupPipeline
+
+
+def run_pipeline(stages, items):
+    pipeline = StartupPipeline(stages)
+    pipeline.start(items)
+    assert pipeline.join(timeout=5) is True
+    return pipeline
+
+
+def test_failing_item_does_not_drop_its_siblings():
+    reached = []
+
+    def first(item):
+        if item == 3:
+            raise KeyError("boom")
+        return [item]
+
+    def second(item):
+        reached.append(item)
+        return []
+
+    pipeline = run_pipeline(
+        [PipelineStage("first", first, max_workers=2), PipelineStage("second", second)],
+        range(6),
+    )
+
+    assert sorted(reached) == [0, 1, 2, 4, 5]
+    stats = pipeline.stats()
+    assert stats["first"]["processed"] == 6
+    assert stats["first"]["failed"] == 1
+    assert stats["first"]["emitted"] == 5
+    assert stats["second"]["processed"] == 5
+
+
+def test_chunk_fans_out_to_next_stage():
+    reached = []
+
+    def split(chunk):
+        return list(chunk)
+
+    def collect(item):
+        reached.append(item)
+        return []
+
+    run_pipeline(
+        [PipelineStage("split", split), PipelineStage("collect", collect, max_workers=4)],
+        [[1, 2, 3], [4, 5]],
+    )
+
+    assert sorted(reached) == [1, 2, 3, 4, 5]
+
+
+def test_empty_input_finishes():
+    pipeline = run_pipeline([PipelineStage("only", lambda item: [item])], [])
+    assert pipeline.finished_at is not None
+    assert pipeline.stats()["only"]["processed"] == 0
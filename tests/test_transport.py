@@ -0,0 +1,110 @@
+import pytest
+import requests
+
+from TwitchChannelPointsMiner.classes import Transport as transport_module
+from TwitchChannelPointsMiner.classes.Transport import Transport
+
+
+class FakeResponse(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = b""
+        self.request = requests.Request("POST", "https://example.invalid").prepare()
+
+    def close(self):
+        pass
+
+
+class FakeSession(object):
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(transport_module.time, "sleep", lambda seconds: None)
+
+
+def make_transport(outcomes, max_retries=3):
+    transport = Transport(max_retries=max_retries)
+    transport.session = FakeSession(outcomes)
+    return transport
+
+
+def test_get_is_retried_on_5xx():
+    transport = make_transport([503, 502, 200])
+
+    assert transport.get("https://example.invalid/a").status_code == 200
+    assert transport.session.calls == 3
+    assert transport.retries == 2
+
+
+def test_post_is_not_replayed_on_5xx():
+    transport = make_transport([502, 200])
+
+    assert transport.post("https://example.invalid/gql").status_code == 502
+    assert transport.session.calls == 1
+
+
+def test_post_is_retried_on_429():
+    transport = make_transport([429, 200])
+
+    assert transport.post("https://example.invalid/gql").status_code == 200
+    assert transport.session.calls == 2
+
+
+def test_explicitly_idempotent_post_is_retried_on_5xx():
+    transport = make_transport([500, 200])
+
+    response = transport.post("https://example.invalid/gql", idempotent=True)
+    assert response.status_code == 200
+    assert transport.session.calls == 2
+
+
+def test_connectivity_wait_before_first_success_ignores_retry_budget():
+    error = requests.exceptions.ConnectionError("offline")
+    transport = make_transport([error] * 5 + [200], max_retries=2)
+
+    assert transport.get("https://example.invalid/a").status_code == 200
+    assert transport.session.calls == 6
+    assert transport.connected.is_set()
+
+
+def test_connectivity_wait_is_bounded_by_its_own_timeout():
+    error = requests.exceptions.ConnectionError("offline")
+    transport = make_transport([error] * 5)
+    transport.connectivity_timeout = 0
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.get("https://example.invalid/a")
+    assert transport.session.calls == 1
+
+
+def test_wait_until_connected_blocks_until_first_response():
+    error = requests.exceptions.ConnectionError("offline")
+    transport = make_transport([error, error, 200])
+
+    transport.wait_until_connected("https://example.invalid")
+    assert transport.connected.is_set()
+    # Déjà connecté : plus aucune requête
+    transport.wait_until_connected("https://example.invalid")
+    assert transport.session.calls == 3
+
+
+def test_connection_error_after_first_success_is_raised():
+    error = requests.exceptions.ConnectionError("reset")
+    transport = make_transport([200, error, 200])
+
+    transport.get("https://example.invalid/a")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.get("https://example.invalid/a")
+    assert transport.session.calls == 2
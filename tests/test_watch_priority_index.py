@@ -0,0 +1,90 @@
+import time
+
+from TwitchChannelPointsMiner.classes.entities.Streamer import Streamer, StreamerSettings
+from TwitchChannelPointsMiner.classes.Settings import Priority
+from TwitchChannelPointsMiner.classes.WatchPriorityIndex import (
+    ONLINE_GRACE,
+    WatchPriorityIndex,
+)
+
+
+def make_index(*specs):
+    """specs : (username, channel_points, en ligne)"""
+    index = WatchPriorityIndex()
+    streamers = {}
+    for rank, (username, points, online) in enumerate(specs):
+        streamer = Streamer(username, settings=StreamerSettings())
+        streamer.settings.default()
+        streamer.channel_points = points
+        if online:
+            streamer.is_online = True
+            streamer.online_at = time.time() - 3600
+        # Streak déjà obtenu : seules les priorités testées départagent
+        streamer.stream.watch_streak_missing = False
+        index.add(streamer, rank)
+        streamers[username] = streamer
+    return index, streamers
+
+
+def usernames(streamers):
+    return [streamer.username for streamer in streamers]
+
+
+def test_order_keeps_original_rank_and_skips_offline():
+    index, _ = make_index(("a", 10, True), ("b", 20, False), ("c", 30, True), ("d", 0, True))
+
+    assert usernames(index.select([Priority.ORDER])) == ["a", "c"]
+    assert usernames(index.watchable()) == ["a", "c", "d"]
+
+
+def test_points_priorities():
+    index, _ = make_index(("a", 10, True), ("b", 50, True), ("c", 30, True))
+
+    assert usernames(index.select([Priority.POINTS_DESCENDING])) == ["b", "c"]
+    assert usernames(index.select([Priority.POINTS_ASCENDING])) == ["a", "c"]
+
+
+def test_ties_are_broken_by_original_rank():
+    index, _ = make_index(("a", 10, True), ("b", 10, True), ("c", 10, True))
+
+    assert usernames(index.select([Priority.POINTS_ASCENDING], limit=3)) == ["a", "b", "c"]
+    assert usernames(index.select([Priority.POINTS_DESCENDING], limit=3)) == ["a", "b", "c"]
+
+
+def test_priorities_fill_in_order_without_duplicates():
+    index, streamers = make_index(("a", 10, True), ("b", 50, True), ("c", 30, True))
+    streamers["c"].stream.watch_streak_missing = True
+    streamers["c"].update_watch_priority()
+
+    selected = index.select([Priority.STREAK, Priority.POINTS_DESCENDING])
+    assert usernames(selected) == ["c", "b"]
+
+
+def test_update_moves_streamer_and_offline_removes_it():
+    index, streamers = make_index(("a", 10, True), ("b", 50, True))
+
+    streamers["a"].channel_points = 100
+    streamers["a"].update_watch_priority()
+    assert usernames(index.select([Priority.POINTS_DESCENDING], limit=1)) == ["a"]
+
+    streamers["a"].is_online = False
+    streamers["a"].update_watch_priority()
+    assert usernames(index.select([Priority.POINTS_DESCENDING])) == ["b"]
+    assert index.stats()["online"] == 1
+
+
+def test_recently_online_streamer_waits_for_grace_period():
+    index, streamers = make_index(("a", 10, True), ("b", 50, True))
+    streamers["b"].online_at = time.time() - ONLINE_GRACE / 2
+
+    assert usernames(index.select([Priority.POINTS_DESCENDING])) == ["a"]
+
+
+def test_multipliers_sorted_by_total_factor():
+    index, streamers = make_index(("a", 10, True), ("b", 10, True), ("c", 10, True))
+    streamers["a"].activeMultipliers = [{"factor": 0.2}]
+    streamers["b"].activeMultipliers = [{"factor": 1.0}]
+    for streamer in streamers.values():
+        streamer.update_watch_priority()
+
+    assert usernames(index.select([Priority.SUBSCRIBED])) == ["b", "a"]
@@ -0,0 +1,80 @@
+import pytest
+
+from TwitchChannelPointsMiner.classes import WatchScheduler as scheduler_module
+from TwitchChannelPointsMiner.classes.WatchScheduler import WatchScheduler
+
+
+class Clock(object):
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler_module.time, "time", clock)
+    return clock
+
+
+def test_new_stream_is_due_immediately(clock):
+    scheduler = WatchScheduler(interval=20)
+    scheduler.sync(["a", "b"])
+
+    assert sorted(scheduler.pop_due()) == [("a", 1000.0), ("b", 1000.0)]
+    # En vol : ni redû ni reprogrammé par un nouveau sync
+    scheduler.sync(["a", "b"])
+    assert scheduler.pop_due() == []
+    assert scheduler.next_deadline() is None
+
+
+def test_next_deadline_keeps_cadence_of_scheduled_deadline(clock):
+    scheduler = WatchScheduler(interval=20)
+    scheduler.sync(["a"])
+    [(username, deadline)] = scheduler.pop_due()
+
+    clock.now = 1003.0
+    scheduler.done(username, deadline, started_at=1001.0)
+
+    assert scheduler.next_deadline() == 1020.0
+    stats = scheduler.stats()
+    assert stats["sends"] == 1
+    assert stats["avg_drift"] == 1.0
+    assert stats["late"] == 0
+
+
+def test_late_send_does_not_catch_up_missed_slots(clock):
+    scheduler = WatchScheduler(interval=20, late_after=5)
+    scheduler.sync(["a"])
+    [(username, deadline)] = scheduler.pop_due()
+
+    clock.now = 1050.0
+    scheduler.done(username, deadline, started_at=1045.0)
+
+    assert scheduler.next_deadline() == 1050.0
+    stats = scheduler.stats()
+    assert stats["late"] == 1
+    assert stats["max_drift"] == 45.0
+
+
+def test_streams_have_independent_deadlines(clock):
+    scheduler = WatchScheduler(interval=20)
+    scheduler.sync(["fast", "slow"])
+    due = dict(scheduler.pop_due())
+
+    scheduler.done("fast", due["fast"], started_at=1000.0)
+    clock.now = 1020.0
+    assert scheduler.pop_due() == [("fast", 1020.0)]
+
+
+def test_unselected_stream_is_not_rescheduled(clock):
+    scheduler = WatchScheduler(interval=20)
+    scheduler.sync(["a"])
+    [(username, deadline)] = scheduler.pop_due()
+
+    scheduler.sync([])
+    scheduler.done(username, deadline, started_at=1000.0)
+
+    assert scheduler.next_deadline() is None
@@ -0,0 +1,168 @@
+import pytest
+
+from TwitchChannelPointsMiner.classes import WebSocketsPool as pool_module
+from TwitchChannelPointsMiner.classes.entities.Streamer import (
+    Streamer,
+    StreamerSettings,
+)
+from TwitchChannelPointsMiner.classes.WebSocketsPool import (
+    TOPICS_PER_CONNECTION,
+    WebSocketsPool,
+)
+
+
+class FakeSocket(object):
+    def __init__(self, index, parent_pool):
+        self.index = index
+        self.parent_pool = parent_pool
+        self.topics = []
+        self.pending_topics = []
+        self.is_opened = True
+        self.is_closed = False
+        self.is_reconnecting = False
+        self.keep_running = True
+        self.forced_close = False
+        self.closed = False
+        self.sent = []
+
+    def listen(self, topic, auth_token=None):
+        self.sent.append(("LISTEN", str(topic)))
+
+    def unlisten(self, topic, auth_token=None):
+        self.sent.append(("UNLISTEN", str(topic)))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeLogin(object):
+    def get_auth_token(self):
+        return "token"
+
+
+class FakeTwitch(object):
+    twitch_login = FakeLogin()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(
+        WebSocketsPool,
+        "_WebSocketsPool__new",
+        lambda self, index: FakeSocket(index, self),
+    )
+    monkeypatch.setattr(
+        WebSocketsPool, "_WebSocketsPool__start", lambda self, index: None
+    )
+    return WebSocketsPool(FakeTwitch(), [], {})
+
+
+def make_streamer(index, online=False):
+    streamer = Streamer(
+        f"streamer{index}",
+        settings=StreamerSettings(
+            make_predictions=True,
+            follow_raid=True,
+            claim_moments=True,
+            community_goals=True,
+        ),
+    )
+    streamer.channel_id = str(1000 + index)
+    streamer.is_online = online
+    return streamer
+
+
+def topics_of(pool):
+    return sorted(str(topic) for ws in pool.ws if ws is not None for topic in ws.topics)
+
+
+def test_tracked_streamer_is_resolvable_before_joining_the_list(pool):
+    streamer = make_streamer(1)
+    pool.track(streamer)
+
+    assert pool.streamers == []
+    assert pool.get_streamer("1001") is streamer
+    assert pool.get_streamer(1001) is streamer
+    assert pool.get_streamer("9999") is None
+
+
+def test_offline_streamer_only_listens_to_playback(pool):
+    pool.track(make_streamer(1))
+
+    assert topics_of(pool) == ["video-playback-by-id.1001"]
+
+
+def test_activate_and_deactivate_follow_the_live(pool):
+    streamer = make_streamer(1)
+    pool.track(streamer)
+
+    pool.activate(streamer)
+    assert len(topics_of(pool)) == 5
+
+    pool.deactivate(streamer)
+    assert topics_of(pool) == ["video-playback-by-id.1001"]
+    unlistened = [topic for verb, topic in pool.ws[0].sent if verb == "UNLISTEN"]
+    assert len(unlistened) == 4
+    assert pool.stats()["unlistens"] == 4
+
+
+def test_online_streamer_is_activated_on_track(pool):
+    pool.track(make_streamer(1, online=True))
+
+    assert len(topics_of(pool)) == 5
+    # Pas de double abonnement
+    listened = [topic for verb, topic in pool.ws[0].sent if verb == "LISTEN"]
+    assert sorted(listened) == topics_of(pool)
+
+
+def test_repack_closes_sparse_connections_but_never_the_first(pool):
+    streamers = [make_streamer(index, online=True) for index in range(12)]
+    for streamer in streamers:
+        pool.track(streamer)
+    assert len(topics_of(pool)) == 60
+    assert pool.stats()["connections"] == 2
+    first, second = pool.ws
+
+    for streamer in streamers[:10]:
+        pool.deactivate(streamer)
+
+    assert pool.ws[0] is first and first.closed is False
+    assert pool.ws[1] is None
+    assert second.closed is True and second.forced_close is True
+    assert len(first.topics) <= TOPICS_PER_CONNECTION
+    assert len(topics_of(pool)) == 12 + 2 * 4
+    assert pool.stats()["repacks"] == 1
+
+
+@pytest.fixture
+def no_wait(monkeypatch):
+    monkeypatch.setattr(pool_module.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(pool_module, "internet_connection_available", lambda: True)
+
+
+def test_reconnection_carries_topics_onto_new_socket(pool, no_wait):
+    pool.track(make_streamer(1, online=True))
+    old = pool.ws[0]
+
+    WebSocketsPool.handle_reconnection(old)
+
+    new = pool.ws[0]
+    assert new is not old
+    assert new.topics == old.topics
+    assert new.pending_topics == old.topics
+    # Rien n'est rejoué sur la nouvelle connexion : on_open s'en charge
+    assert new.sent == []
+
+
+def test_reconnection_of_repacked_slot_is_dropped(pool, no_wait):
+    streamers = [make_streamer(index, online=True) for index in range(12)]
+    for streamer in streamers:
+        pool.track(streamer)
+    second = pool.ws[1]
+    for streamer in streamers[:10]:
+        pool.deactivate(streamer)
+
+    second.forced_close = False
+    WebSocketsPool.handle_reconnection(second)
+
+    assert pool.ws[1] is None